@@ -1,41 +1,26 @@
-from core.condition_nodes import Action
+from core.clock import SimClock
+from core.condition_nodes import Action, RUNNING, blackboard_of
+from core.pathservice import PathService
 import random
 import math
-import heapq
 
-# Dicionário para armazenar estados de aggro
-_aggro_states = {}
-
-_move_states = {}
+# Estado das ações por entidade: entity.blackboard (core/condition_nodes.Blackboard)
 
 def _check_forbidden_columns(entity, new_posx, new_posy, game_map):
     """
     Verifica se a nova posição da entidade resultaria em col=2 ou col=3.
-    Checa toda a largura e altura da entidade pixel por pixel.
+    Checa toda a largura e altura da entidade (consulta por região na grade de colisão).
     
     Returns:
         True se a posição é PROIBIDA (col=2 ou col=3)
         False se a posição é permitida
     """
-    # Verifica toda a área da entidade (não apenas o pé)
-    for dy in range(entity.sizey):
-        for dx in range(entity.sizex):
-            # Checa layer 0
-            col_type = game_map.check_col(new_posx + dx, new_posy + dy, 0)
-            if col_type == 2 or col_type == 3:
-                return True
-            
-            # Checa layer 1
-            col_type = game_map.check_col(new_posx + dx, new_posy + dy, 1)
-            if col_type == 2 or col_type == 3:
-                return True
-    
-    return False
+    return game_map.has_col_in_rect(new_posx, new_posy, entity.sizex, entity.sizey, (2, 3))
 
 def _is_walkable(entity, tile_x, tile_y, game_map):
     """
     Verifica se um tile é caminhável para a entidade.
-    Considera col=1 (paredes), col=2 e col=3 como bloqueados.
+    Considera col=1 (paredes), col=2, col=3 e breakables como bloqueados.
     
     Args:
         entity: A entidade que vai andar
@@ -45,127 +30,78 @@ def _is_walkable(entity, tile_x, tile_y, game_map):
     Returns:
         True se o tile é caminhável, False caso contrário
     """
-    tile_size = 32
-    pixel_x = tile_x * tile_size
-    pixel_y = tile_y * tile_size
-    
-    # Verifica se está dentro dos limites do mapa
-    if tile_x < 0 or tile_y < 0:
-        return False
-    if tile_x >= game_map.map_width or tile_y >= game_map.map_height:
-        return False
-    
-    # Verifica toda a área que a entidade ocuparia neste tile
-    for dy in range(entity.sizey):
-        for dx in range(entity.sizex):
-            # Checa layer 0
-            col_type = game_map.check_col(pixel_x + dx, pixel_y + dy, 0)
-            if col_type == 1 or col_type == 2 or col_type == 3:
-                return False
-            
-            # Checa layer 1
-            col_type = game_map.check_col(pixel_x + dx, pixel_y + dy, 1)
-            if col_type == 1 or col_type == 2 or col_type == 3:
-                return False
-    
-    return True
+    # Toda a área que a entidade ocuparia a partir deste tile: leitura da grade de clearance
+    nav = game_map.nav
+    return nav.is_walkable(tile_x, tile_y, nav.size_class(entity.sizex, entity.sizey))
 
-def _astar_pathfinding(entity, start_pos, goal_pos, game_map):
-    """
-    Implementa o algoritmo A* para encontrar caminho entre dois pontos.
-    
-    Args:
-        entity: A entidade que precisa do caminho
-        start_pos: Tupla (x, y) em pixels da posição inicial
-        goal_pos: Tupla (x, y) em pixels da posição final
-        game_map: O mapa do jogo
-    
-    Returns:
-        Lista de tuplas [(x, y), ...] em pixels, ou None se não houver caminho
+def _tiles_to_pixels(entity, tiles, game_map):
+    """Converte um caminho em tiles para pixels (hitbox centralizada em cada tile)."""
+    if tiles is None:
+        return None
+    tile_w, tile_h = game_map.tilewidth, game_map.tileheight
+    return [(tx * tile_w + tile_w // 2 - entity.sizex // 2, ty * tile_h + tile_h // 2 - entity.sizey // 2)
+            for tx, ty in tiles]
+
+def _flow_waypoint(entity, target, game_map):
+    """Próximo ponto (pixels, canto da hitbox) rumo a `target` pelo campo de fluxo, ou None.
+
+    O passo sai do tile onde está o centro da entidade. No eixo em que o
+    passo não anda, a entidade é alinhada ao centro do tile atual, para
+    não raspar a quina das paredes ao dobrar.
     """
-    tile_size = 32
-    
-    # Converte posições de pixels para tiles
-    start_tile = (start_pos[0] // tile_size, start_pos[1] // tile_size)
-    goal_tile = (goal_pos[0] // tile_size, goal_pos[1] // tile_size)
-    
-    # Se o objetivo não é caminhável, retorna None
-    if not _is_walkable(entity, goal_tile[0], goal_tile[1], game_map):
+    flow = game_map.flow
+    size = game_map.nav.size_class(entity.sizex, entity.sizey)
+    field = flow.field_to(target, size)
+    tx, ty = flow.goal_tile(entity)
+    step = field.step(tx, ty)
+    if step is None:
         return None
-    
-    # Função heurística (distância Manhattan)
-    def heuristic(a, b):
-        return abs(a[0] - b[0]) + abs(a[1] - b[1])
-    
-    # Conjunto de tiles já visitados
-    closed_set = set()
-    
-    # Heap de prioridade: (f_score, counter, tile, path)
-    # counter é usado para desempate quando f_scores são iguais
-    counter = 0
-    open_heap = []
-    heapq.heappush(open_heap, (0, counter, start_tile, [start_tile]))
-    
-    # Dicionário de melhores scores conhecidos
-    g_score = {start_tile: 0}
-    
-    # Direções: direita, esquerda, baixo, cima
-    directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-    
-    # Limite de iterações para evitar loops infinitos
-    max_iterations = 500
-    iterations = 0
-    
-    while open_heap and iterations < max_iterations:
-        iterations += 1
-        
-        # Pega o tile com menor f_score
-        current_f, _, current_tile, path = heapq.heappop(open_heap)
-        
-        # Se chegou ao objetivo, retorna o caminho em pixels
-        if current_tile == goal_tile:
-            # Converte tiles de volta para pixels (centro do tile)
-            pixel_path = []
-            for tile in path:
-                pixel_x = tile[0] * tile_size + tile_size // 2 - entity.sizex // 2
-                pixel_y = tile[1] * tile_size + tile_size // 2 - entity.sizey // 2
-                pixel_path.append((pixel_x, pixel_y))
-            return pixel_path
-        
-        # Marca como visitado
-        if current_tile in closed_set:
-            continue
-        closed_set.add(current_tile)
-        
-        # Explora vizinhos
-        for dx, dy in directions:
-            neighbor = (current_tile[0] + dx, current_tile[1] + dy)
-            
-            # Verifica se o vizinho é caminhável
-            if not _is_walkable(entity, neighbor[0], neighbor[1], game_map):
-                continue
-            
-            # Calcula novo g_score
-            tentative_g = g_score[current_tile] + 1
-            
-            # Se encontrou um caminho melhor para este vizinho
-            if neighbor not in g_score or tentative_g < g_score[neighbor]:
-                g_score[neighbor] = tentative_g
-                f_score = tentative_g + heuristic(neighbor, goal_tile)
-                counter += 1
-                new_path = path + [neighbor]
-                heapq.heappush(open_heap, (f_score, counter, neighbor, new_path))
-    
-    # Não encontrou caminho
+    tile_w, tile_h = game_map.tilewidth, game_map.tileheight
+    wx = (tx + step[0]) * tile_w + tile_w // 2 - entity.sizex // 2
+    wy = (ty + step[1]) * tile_h + tile_h // 2 - entity.sizey // 2
+    if not step[0]:
+        wx = tx * tile_w + tile_w // 2 - entity.sizex // 2
+    if not step[1]:
+        wy = ty * tile_h + tile_h // 2 - entity.sizey // 2
+    return wx, wy
+
+def _path_waypoint(entity, target, state, game_map):
+    """Próximo ponto do caminho pedido ao PathService, ou None se não houver caminho.
+
+    O resultado só chega num tick seguinte ao pedido; enquanto isso a
+    entidade segue direto para o alvo.
+    """
+    request = state.get('path_request')
+    if request is None:
+        state['path_request'] = PathService.request(game_map, (entity.posx, entity.posy),
+                                                    (target.posx, target.posy),
+                                                    entity.sizex, entity.sizey)
+        state['path'] = None
+        state['path_index'] = 0
+        return target.posx, target.posy
+    if not request.done:
+        return target.posx, target.posy
+    path = state.get('path')
+    if path is None:
+        path = state['path'] = _tiles_to_pixels(entity, request.path, game_map) or []
+    # Pula os waypoints já alcançados
+    while path and state['path_index'] < len(path):
+        wx, wy = path[state['path_index']]
+        if abs(wx - entity.posx) < 8 and abs(wy - entity.posy) < 8:
+            state['path_index'] += 1
+        else:
+            return wx, wy
+    # Sem caminho ou caminho completo
+    state['path_request'] = None
     return None
 
 def a1fun(entity, map_ref=None):
     if entity.stats.hp <= 0:
         entity.kill()
 
-    global _move_states
-    eid = id(entity)
-    if eid not in _move_states or (_move_states[eid]['dx'] == 0 and _move_states[eid]['dy'] == 0):
+    board = blackboard_of(entity)
+    state = board.get('move')
+    if state is None or (state['dx'] == 0 and state['dy'] == 0):
         direcoes = [
             (32, 0),   # direita
             (-32, 0),  # esquerda
@@ -173,9 +109,7 @@ def a1fun(entity, map_ref=None):
             (0, -32),  # cima
         ]
         dx, dy = random.choice(direcoes)
-        _move_states[eid] = {'dx': dx, 'dy': dy}
-
-    state = _move_states[eid]
+        state = board['move'] = {'dx': dx, 'dy': dy}
 
     if state['dx'] != 0:
         passo_x = 1 if state['dx'] > 0 else -1
@@ -213,50 +147,52 @@ def move_bombastic(entity, game_map):
     """
     import math
     
+    board = blackboard_of(entity)
+    circle = board.get('circle')
     # Inicializa estado do movimento circular na primeira execução
-    if not hasattr(entity, 'bombastic_initialized'):
-        entity.bombastic_initialized = True
+    if circle is None:
+        circle = board['circle'] = {}
         # Centro fixo do círculo (posição inicial do boss)
-        entity.circle_center_x = entity.posx
-        entity.circle_center_y = entity.posy
+        circle['center_x'] = entity.posx
+        circle['center_y'] = entity.posy
         # Raio do círculo
-        entity.circle_radius = 80.0
+        circle['radius'] = 80.0
         # Ângulo atual (em radianos)
-        entity.circle_angle = 0.0
+        circle['angle'] = 0.0
         # Velocidade angular (radianos por frame)
-        entity.angular_speed = 0.04  # ~2.3 graus por frame
+        circle['angular_speed'] = 0.04  # ~2.3 graus por frame
         # Direção da rotação (1 = horário, -1 = anti-horário)
-        entity.rotation_direction = 1
+        circle['rotation_direction'] = 1
         # Contador de rotações completas
-        entity.rotation_count = 0
+        circle['rotation_count'] = 0
         # Ângulo da última rotação (para detectar quando completa 360°)
-        entity.last_rotation_checkpoint = 0.0
+        circle['last_rotation_checkpoint'] = 0.0
     
     # Atualiza o ângulo
-    entity.circle_angle += entity.angular_speed * entity.rotation_direction
+    circle['angle'] += circle['angular_speed'] * circle['rotation_direction']
     
     # Normaliza o ângulo para ficar entre 0 e 2π
-    if entity.circle_angle >= 2 * math.pi:
-        entity.circle_angle -= 2 * math.pi
-        entity.rotation_count += 1
+    if circle['angle'] >= 2 * math.pi:
+        circle['angle'] -= 2 * math.pi
+        circle['rotation_count'] += 1
         
         # A cada 2 rotações completas, inverte a direção
-        if entity.rotation_count >= 2:
-            entity.rotation_direction *= -1  # Inverte direção
-            entity.rotation_count = 0
+        if circle['rotation_count'] >= 2:
+            circle['rotation_direction'] *= -1  # Inverte direção
+            circle['rotation_count'] = 0
             
-    elif entity.circle_angle < 0:
-        entity.circle_angle += 2 * math.pi
-        entity.rotation_count += 1
+    elif circle['angle'] < 0:
+        circle['angle'] += 2 * math.pi
+        circle['rotation_count'] += 1
         
         # A cada 2 rotações completas, inverte a direção
-        if entity.rotation_count >= 2:
-            entity.rotation_direction *= -1  # Inverte direção
-            entity.rotation_count = 0
+        if circle['rotation_count'] >= 2:
+            circle['rotation_direction'] *= -1  # Inverte direção
+            circle['rotation_count'] = 0
     
     # Calcula nova posição no círculo
-    target_x = entity.circle_center_x + math.cos(entity.circle_angle) * entity.circle_radius
-    target_y = entity.circle_center_y + math.sin(entity.circle_angle) * entity.circle_radius
+    target_x = circle['center_x'] + math.cos(circle['angle']) * circle['radius']
+    target_y = circle['center_y'] + math.sin(circle['angle']) * circle['radius']
     
     # Movimento suave em direção ao ponto no círculo
     dx = target_x - entity.posx
@@ -302,13 +238,11 @@ def animBombastic(entity,map):
     if entity.is_in_special_atk:
         entity.anim = 3
 def moveRat(entity, game_map):
-    global _move_states
-    eid = id(entity)
+    board = blackboard_of(entity)
+    state = board.get('move')
 
     # Se terminou o movimento, define nova direção
-    if eid not in _move_states or (
-        abs(_move_states[eid]['dx']) < 0.5 and abs(_move_states[eid]['dy']) < 0.5
-    ):
+    if state is None or (abs(state['dx']) < 0.5 and abs(state['dy']) < 0.5):
         # Filtra direções que não levam para col=2 ou col=3
         direcoes = [(32, 0), (-32, 0), (0, 32), (0, -32)]
         direcoes_validas = []
@@ -329,13 +263,11 @@ def moveRat(entity, game_map):
             return
         
         dx, dy = random.choice(direcoes_validas)
-        _move_states[eid] = {'dx': float(dx), 'dy': float(dy)}
+        board['move'] = {'dx': float(dx), 'dy': float(dy)}
         entity.velx = 0.0
         entity.vely = 0.0
         return
 
-    state = _move_states[eid]
-
     # Atributos de movimento
     v_max = getattr(entity.stats, 'speed', 1.0)  # velocidade máxima
     a = getattr(entity.stats, 'ace', 0.0)        # aceleração
@@ -431,11 +363,12 @@ def moveRat(entity, game_map):
 def animRat(entity, map):
     # Verifica se está atacando e se o tempo de ataque ainda não passou
     if hasattr(entity, 'attacking') and entity.attacking:
-        import time
-        current_time = time.time()
+        current_time = SimClock.time
         
+        board = blackboard_of(entity)
+
         # Se ainda está dentro do tempo de animação de ataque
-        if hasattr(entity, '_attack_end_time') and current_time < entity._attack_end_time:
+        if current_time < board.get('attack_end_time', 0.0):
             # Animação de ataque baseada na direção
             if entity.facing == "left":
                 entity.anim = 5  # animação de ataque para esquerda
@@ -449,8 +382,7 @@ def animRat(entity, map):
         else:
             # Tempo de ataque acabou, volta ao normal
             entity.attacking = False
-            if hasattr(entity, '_attack_end_time'):
-                delattr(entity, '_attack_end_time')
+            board.pop('attack_end_time', None)
     
     # Animação normal de movimento/idle
     if entity.facing == "left":
@@ -463,9 +395,7 @@ def animRat(entity, map):
         entity.anim = 2
 
 def aggroPlayer(entity, game_map):
-    """Salva aggro no player mais próximo e persegue-o com pathfinding A*"""
-    global _aggro_states
-    
+    """Salva aggro no player mais próximo e persegue-o (campo de fluxo quando travado)"""
     # Importa PControl aqui para evitar import circular
     try:
         from core.entity import PControl
@@ -477,25 +407,24 @@ def aggroPlayer(entity, game_map):
         except:
             return  # Se não conseguir importar, sai da função
     
-    eid = id(entity)
-    
     # Verifica se entity tem os atributos necessários
     if not hasattr(entity, 'posx') or not hasattr(entity, 'posy'):
         return
     
+    board = blackboard_of(entity)
+    state = board.get('aggro')
     # Inicializa estado se não existir
-    if eid not in _aggro_states:
-        _aggro_states[eid] = {
+    if state is None:
+        state = board['aggro'] = {
             'target': None, 
-            'last_target_pos': None,
-            'path': None,  # Caminho calculado pelo A*
+            'following': False,  # Seguindo o campo de fluxo até o player
+            'path_request': None,  # Caminho pedido ao PathService quando o campo não cobre
+            'path': None,  # Caminho recebido, em pixels
             'path_index': 0,  # Índice atual no caminho
             'stuck_counter': 0,  # Contador de frames travado
             'last_pos': (entity.posx, entity.posy)  # Última posição conhecida
         }
     
-    state = _aggro_states[eid]
-    
     # Verifica se PControl.Players existe e tem players
     if not hasattr(PControl, 'Players') or not PControl.Players:
         return
@@ -523,8 +452,7 @@ def aggroPlayer(entity, game_map):
     
     # Se não há player ou está muito longe (mais de 300 pixels), perde o aggro
     if not closest_player or min_distance > 300:
-        if eid in _aggro_states:
-            del _aggro_states[eid]
+        board.pop('aggro', None)
         return
     
     # Salva o target
@@ -538,14 +466,6 @@ def aggroPlayer(entity, game_map):
         state['stuck_counter'] = 0
         state['last_pos'] = current_pos
     
-    # Se player mudou de posição significativamente, recalcula caminho
-    if state['last_target_pos'] is None or \
-       abs(closest_player.posx - state['last_target_pos'][0]) > 64 or \
-       abs(closest_player.posy - state['last_target_pos'][1]) > 64:
-        state['path'] = None  # Força recálculo
-    
-    state['last_target_pos'] = (closest_player.posx, closest_player.posy)
-    
     # Calcula direção para o player
     target_x = closest_player.posx + getattr(closest_player, 'sizex', 32) / 2
     target_y = closest_player.posy + getattr(closest_player, 'sizey', 32) / 2
@@ -561,48 +481,28 @@ def aggroPlayer(entity, game_map):
             entity.velx = 0.0
         if hasattr(entity, 'vely'):
             entity.vely = 0.0
-        state['path'] = None
+        state['following'] = False
+        state['path_request'] = None
         state['stuck_counter'] = 0
         return
     
-    # SE TRAVADO POR MAIS DE 15 FRAMES, USA A* PARA ENCONTRAR CAMINHO
+    # SE TRAVADO POR MAIS DE 15 FRAMES, PASSA A SEGUIR O CAMPO DE FLUXO
+    # (compartilhado por todos os mobs que perseguem o mesmo player)
     if state['stuck_counter'] > 15:
-        # Calcula caminho usando A* se não tiver um caminho válido
-        if state['path'] is None or state['path_index'] >= len(state['path']):
-            start_pos = (entity.posx, entity.posy)
-            goal_pos = (closest_player.posx, closest_player.posy)
-            state['path'] = _astar_pathfinding(entity, start_pos, goal_pos, game_map)
-            state['path_index'] = 0
-            state['stuck_counter'] = 0  # Reseta contador ao calcular novo caminho
-            
-            # Se não encontrou caminho, tenta movimento direto novamente
-            if state['path'] is None:
-                state['stuck_counter'] = 0  # Reseta para tentar novamente depois
+        state['following'] = True
+        state['stuck_counter'] = 0
     
-    # SE TEM UM CAMINHO VÁLIDO, SEGUE O CAMINHO
-    if state['path'] is not None and state['path_index'] < len(state['path']):
-        # Pega próximo waypoint do caminho
-        next_waypoint = state['path'][state['path_index']]
-        
-        # Calcula direção para o waypoint
-        waypoint_dx = next_waypoint[0] - entity.posx
-        waypoint_dy = next_waypoint[1] - entity.posy
-        
-        # Se chegou perto do waypoint, vai para o próximo
-        if abs(waypoint_dx) < 8 and abs(waypoint_dy) < 8:
-            state['path_index'] += 1
-            if state['path_index'] >= len(state['path']):
-                # Chegou ao fim do caminho, limpa e volta para movimento direto
-                state['path'] = None
-                state['path_index'] = 0
-            return
-        
-        # Usa a direção do waypoint ao invés da direção direta do player
-        dx = waypoint_dx
-        dy = waypoint_dy
-    else:
-        # Sem caminho ou caminho completo, usa movimento direto
-        state['path'] = None
+    if state['following']:
+        waypoint = _flow_waypoint(entity, closest_player, game_map)
+        if waypoint is None and game_map.flow.goal_tile(entity) != game_map.flow.goal_tile(closest_player):
+            # Fora do campo ou inalcançável por ele: caminho A* assíncrono
+            waypoint = _path_waypoint(entity, closest_player, state, game_map)
+        if waypoint is None:
+            # Chegou ao tile do player ou não há caminho: volta ao movimento direto
+            state['following'] = False
+        else:
+            dx = waypoint[0] - entity.posx
+            dy = waypoint[1] - entity.posy
     
     # Sistema de movimento com controle de velocidade
     # Atributos de movimento mais controlados
@@ -825,10 +725,8 @@ def biteAttack(entity, game_map):
     
     # Cria o projétil de id 3
     try:
-        # Gera um ID único para o projétil
-        import time
         # Cria o projétil
-        projectile = Projectile(
+        projectile = Projectile.pool.acquire(
             id=0,
             x=entity_center_x,
             y=entity_center_y,
@@ -850,7 +748,7 @@ def biteAttack(entity, game_map):
         entity.texture.numFrame = 0
         # Define duração da animação de ataque (tempo de um ciclo)
         animation_duration = 0.5  # 500ms para um ciclo de animação de ataque
-        entity._attack_end_time = time.time() + animation_duration
+        blackboard_of(entity)['attack_end_time'] = SimClock.time + animation_duration
         # Atualiza facing do mob baseado na direção do ataque
         if abs(dx) > abs(dy):
             entity.facing = "right" if dx > 0 else "left"
@@ -866,7 +764,6 @@ def musicAttack(entity, game_map):
     Lança um projétil musical (id 4) em direção ao player mais próximo.
     Este ataque usa o comportamento wave_motion (movimento ondulatório).
     """
-    import time
     
     # Importa classes necessárias
     try:
@@ -942,7 +839,7 @@ def musicAttack(entity, game_map):
         spawn_offset = 12
         spawn_x = entity_center_x + dir_x * spawn_offset
         spawn_y = entity_center_y + dir_y * spawn_offset
-        projectile = Projectile(
+        projectile = Projectile.pool.acquire(
             id=0,
             x=spawn_x,
             y=spawn_y,
@@ -969,7 +866,7 @@ def musicAttack(entity, game_map):
         
         # Define duração da animação de ataque
         animation_duration = 0.6  # 600ms para animação de ataque musical
-        entity._attack_end_time = time.time() + animation_duration
+        blackboard_of(entity)['attack_end_time'] = SimClock.time + animation_duration
         
         # Atualiza facing do boss baseado na direção do ataque
         if abs(dx) > abs(dy):
@@ -982,63 +879,73 @@ def musicAttack(entity, game_map):
         return
 def laserAttack(entity, game_map):
     """
-    Ataque de laser em rajada canalizada por 2s.
-    - Dispara exatamente 60 projéteis ao longo de 2s (30/s) com espaçamento uniforme
-    - Mira no player mais próximo, mesma lógica do musicAttack
+    Ataque de laser canalizado por 2s, como um feixe (core/area.Beam).
+    - Feixe com a largura, o alcance (velocidade x duração) e o dano do
+      projétil 4, cortado na primeira parede
+    - Projétil com movimento em onda: o feixe ondula como a fila de
+      disparos ondulava (amplitude WAVE_AMPLITUDE, um período a cada
+      2π x velocidade / WAVE_FREQUENCY px)
+    - Acerta cada alvo dentro dele 30x/s, a cadência dos antigos 60
+      disparos em 2s
+    - Mira no player mais próximo, mesma lógica do musicAttack, girando no
+      máximo TURN_RATE por segundo (o atraso que a viagem dos projéteis dava)
     - 20s de cooldown interno entre rajadas
+    - Devolve RUNNING enquanto a rajada está ativa. A árvore continua
+      rodando desde a raiz (movimento e animação seguem); o andamento fica
+      no blackboard (seção 'laser') e no Beam
     """
-    import time
 
     # Importa classes necessárias
     try:
-        from core.entity import PControl, PrjControl
-        from assets.classes.entities import Projectile
+        from core.entity import AreaControl, PControl
+        from core.area import Beam
+        from core.prototypes import Prototypes
+        from assets.behaviors.prj import WAVE_AMPLITUDE, WAVE_FREQUENCY
     except ImportError:
-        try:
-            import main
-            PControl = main.PControl
-            PrjControl = main.PrjControl
-            from assets.classes.entities import Projectile
-        except Exception:
-            return
+        return
 
     # Parâmetros do ataque
     BURST_DURATION = 2.0
-    TOTAL_SHOTS = 60
-    FIRE_INTERVAL = BURST_DURATION / TOTAL_SHOTS  # ~0.0333s entre disparos (30/s)
+    HITS_PER_SECOND = 30
+    TURN_RATE = math.radians(60)
     COOLDOWN_BETWEEN_BURSTS = 20.0
-    LASER_PROJECTILE_ID = 4  # ID do projétil (reutiliza o musical por segurança)
+    LASER_PROJECTILE_ID = 4  # protótipo de onde vêm largura, alcance e dano
+    SPAWN_OFFSET = 12
 
-    now = time.time()
+    now = SimClock.time
+    board = blackboard_of(entity)
+    laser = board.section('laser')
 
     # Se a rajada não está ativa, verifica cooldown e inicia
-    if not getattr(entity, '_laser_active', False):
-        next_ok = getattr(entity, '_laser_cooldown_until', 0.0)
+    if not laser.get('active', False):
+        next_ok = laser.get('cooldown_until', 0.0)
         if now < next_ok:
             return  # ainda em cooldown entre rajadas
 
         # Inicia nova rajada
-        entity._laser_active = True
-        entity._laser_burst_end_at = now + BURST_DURATION
-        entity._laser_shots_fired = 0
-        entity._laser_next_time = 0.0  # permite disparar imediatamente no primeiro tick
+        laser['active'] = True
+        laser['burst_end_at'] = now + BURST_DURATION
+        laser['beam'] = None
 
         # Feedback de animação durante a canalização
         try:
             entity.attacking = True
             if hasattr(entity, 'texture'):
                 entity.texture.numFrame = 0
-            entity._attack_end_time = now + BURST_DURATION
+            board['attack_end_time'] = now + BURST_DURATION
         except Exception:
             pass
 
-    # Se a rajada está ativa, gerencia disparos periódicos até o fim
-    if getattr(entity, '_laser_active', False):
-        # Se terminou a janela de 2s OU já disparou todos os 60, encerra e agenda cooldown
-        if now >= getattr(entity, '_laser_burst_end_at', 0.0) or \
-           getattr(entity, '_laser_shots_fired', 0) >= TOTAL_SHOTS:
-            entity._laser_active = False
-            entity._laser_cooldown_until = now + COOLDOWN_BETWEEN_BURSTS
+    # Se a rajada está ativa, mantém o feixe até o fim
+    if laser.get('active', False):
+        beam = laser.get('beam')
+        # Se terminou a janela de 2s, encerra e agenda cooldown
+        if now >= laser.get('burst_end_at', 0.0):
+            if beam is not None:
+                AreaControl.rem(beam.id)
+            laser['active'] = False
+            laser['beam'] = None
+            laser['cooldown_until'] = now + COOLDOWN_BETWEEN_BURSTS
             return
 
         # ----- Cálculo de alvo/direção (igual musicAttack) -----
@@ -1094,43 +1001,25 @@ def laserAttack(entity, game_map):
             dir_x = 1
             dir_y = 0
 
-        # Gating por "próximo tempo" e contador (mesma lógica do ring):
-        # dispara quantos necessários para alcançar o tempo atual, respeitando TOTAL_SHOTS
-        shots_fired = getattr(entity, '_laser_shots_fired', 0)
-        next_time = getattr(entity, '_laser_next_time', 0.0)
-        if now + 1e-6 < next_time:
-            return  # ainda não é hora do próximo disparo
-
-        # Enquanto estivermos atrasados e houver tiros a disparar, crie projéteis
-        while shots_fired < TOTAL_SHOTS and now + 1e-6 >= next_time:
-            try:
-                spawn_offset = 12
-                spawn_x = entity_center_x + dir_x * spawn_offset
-                spawn_y = entity_center_y + dir_y * spawn_offset
-                p = Projectile(
-                    id=0,
-                    x=spawn_x,
-                    y=spawn_y,
-                    idProjectile=LASER_PROJECTILE_ID,
-                    dirx=dir_x,
-                    diry=dir_y,
-                    id_owner=entity.id,
-                    type_owner=entity.type
-                )
-                # Dano escalado
-                mob_attack = getattr(entity.stats, 'damage', 1) if hasattr(entity, 'stats') else 1
-                p.damage = getattr(p, 'damage', 1) * mob_attack
-                PrjControl.add(p)
-                # Avança agendamento e contador
-                shots_fired += 1
-                next_time = (next_time if next_time > 0 else now) + FIRE_INTERVAL
-            except Exception:
-                # Se falhar um disparo, tenta continuar com os demais
-                continue
-
-        # Persiste novo estado de agenda/contador
-        entity._laser_shots_fired = shots_fired
-        entity._laser_next_time = next_time
+        origin_x = entity_center_x + dir_x * SPAWN_OFFSET
+        origin_y = entity_center_y + dir_y * SPAWN_OFFSET
+        if beam is None:
+            proto = Prototypes.get('Projectile', LASER_PROJECTILE_ID)
+            if not proto:
+                return
+            # Dano escalado
+            mob_attack = getattr(entity.stats, 'damage', 1) if hasattr(entity, 'stats') else 1
+            wave = proto['behavior'] == 'wave'
+            beam = Beam(entity, origin_x, origin_y, dir_x, dir_y,
+                        max_length=proto['speed'] * proto['time'], width=proto['sizex'],
+                        damage=proto['damage'] * mob_attack, hit_interval=1.0 / HITS_PER_SECOND,
+                        duration=BURST_DURATION,
+                        wave_amplitude=WAVE_AMPLITUDE if wave else 0.0,
+                        wave_length=2 * math.pi * proto['speed'] / WAVE_FREQUENCY if wave else None)
+            AreaControl.add(beam)
+            laser['beam'] = beam
+        else:
+            beam.aim(origin_x, origin_y, dir_x, dir_y, TURN_RATE * SimClock.dt)
 
         # Atualiza facing conforme direção do último cálculo
         try:
@@ -1140,44 +1029,51 @@ def laserAttack(entity, game_map):
                 entity.facing = "down" if dy > 0 else "up"
         except Exception:
             pass
+        return RUNNING
 def expanding_ring_attack(entity, game_map):
     """
-    Dispara um ataque em anel em 3 pulsos (12 projéteis por pulso, total 36 direções),
+    Dispara um ataque em anel em 3 pulsos (12 raios por pulso, total 36 direções),
     com 2s entre cada pulso. O conjunto de 3 pulsos (trio) só pode iniciar novamente
     após 30s do início anterior, controlado internamente (sem depender dos timers
     condicionais globais).
+
+    Devolve RUNNING durante o trio, com o andamento no blackboard (seção
+    'ring'). Não dorme entre os pulsos: a árvore continua movendo e
+    animando o boss a cada tick.
     """
-    import math, time
+    import math
     try:
-        from core.entity import PrjControl
-        from assets.classes.entities import Projectile
+        from core.entity import AreaControl
+        from core.area import Ring
+        from core.prototypes import Prototypes
     except Exception:
         return
 
-    now = time.time()
+    now = SimClock.time
+    ring = blackboard_of(entity).section('ring')
 
     # Sequencer cooldown (30s) independente dos timers condicionais
     # Permite o primeiro trio imediatamente (default = 0.0)
-    next_seq_time = getattr(entity, '_ring_next_sequence_time', 0.0)
+    next_seq_time = ring.get('next_sequence_time', 0.0)
 
     # Se não há um trio ativo, só inicia se o cooldown de 30s do trio já passou
-    if not getattr(entity, '_ring_attack_active', False):
+    if not ring.get('attack_active', False):
         if now < next_seq_time:
             return  # ainda no cooldown do trio completo
         # inicia novo trio imediatamente
-        entity._ring_attack_active = True
-        entity._ring_attack_count = 0
-        entity._ring_attack_next_time = 0.0  # primeiro pulso agora
-        entity._ring_sequence_started_at = now
+        ring['attack_active'] = True
+        ring['attack_count'] = 0
+        ring['attack_next_time'] = 0.0  # primeiro pulso agora
+        ring['sequence_started_at'] = now
 
     # Se trio ativo, respeita o intervalo entre pulsos
-    if now < getattr(entity, '_ring_attack_next_time', 0.0):
-        return
+    if now < ring.get('attack_next_time', 0.0):
+        return RUNNING
 
     # Se terminou os 3 pulsos, finaliza o trio e agenda próximo trio para +30s (a partir do término)
-    if getattr(entity, '_ring_attack_count', 0) >= 3:
-        entity._ring_attack_active = False
-        entity._ring_next_sequence_time = now + 30.0
+    if ring.get('attack_count', 0) >= 3:
+        ring['attack_active'] = False
+        ring['next_sequence_time'] = now + 30.0
         return
 
     # Centro do spawn
@@ -1186,43 +1082,27 @@ def expanding_ring_attack(entity, game_map):
 
     # Ângulo base para 36 direções com padrão 1 ligado, 2 desligados
     step = (2.0 * math.pi) / 36.0
-    offset = getattr(entity, '_ring_attack_count', 0) % 3  # fase do pulso
+    offset = ring.get('attack_count', 0) % 3  # fase do pulso
 
-    # Marca special atacando apenas no tick de criação dos projéteis
+    # Marca special atacando apenas no tick de criação do anel
     entity.is_in_special_atk = True
 
-    spawn_offset = 16.0  # ligeiro afastamento para evitar colisão com o dono
-    for i in range(36):
-        if (i % 3) != offset:
-            continue
-        angle = step * i
-        dir_x = math.cos(angle)
-        dir_y = math.sin(angle)
-        sx = cx + dir_x * spawn_offset
-        sy = cy + dir_y * spawn_offset
-
-        try:
-            p = Projectile(
-                id=0,
-                x=sx,
-                y=sy,
-                idProjectile=5,
-                dirx=dir_x,
-                diry=dir_y,
-                id_owner=entity.id,
-                type_owner=entity.type
-            )
-            # Dano escalado pelo ataque do dono
-            mob_attack = getattr(entity.stats, 'damage', 1) if hasattr(entity, 'stats') else 1
-            p.damage = getattr(p, 'damage', 1) * mob_attack
-            PrjControl.add(p)
-        except Exception:
-            # se um projétil falhar, continua os demais
-            continue
+    # Cada pulso é um anel (core/area.Ring) cujos raios andam como o projétil 5
+    proto = Prototypes.get('Projectile', 5)
+    if proto:
+        spawn_offset = 16.0  # ligeiro afastamento para evitar colisão com o dono
+        mob_attack = getattr(entity.stats, 'damage', 1) if hasattr(entity, 'stats') else 1
+        speed = proto['speed'] * SimClock.tick_rate  # px/tick -> px/s
+        AreaControl.add(Ring(entity, cx, cy,
+                             angles=[step * i for i in range(36) if (i % 3) == offset],
+                             start_radius=spawn_offset, speed=speed, spoke_size=proto['sizex'],
+                             # Dano escalado pelo ataque do dono
+                             damage=proto['damage'] * mob_attack,
+                             max_radius=spawn_offset + proto['speed'] * proto['time']))
 
     # Próximo pulso em 2s e avança contagem
-    entity._ring_attack_count += 1
-    entity._ring_attack_next_time = now + 1.0
+    ring['attack_count'] += 1
+    ring['attack_next_time'] = now + 1.0
 
     # Feedback de animação de ataque
     try:
@@ -1234,6 +1114,7 @@ def expanding_ring_attack(entity, game_map):
 
     # Libera a flag de special fora do tick de spawn
     entity.is_in_special_atk = False
+    return RUNNING
 
 # Register new action
 
@@ -1,65 +1,45 @@
-from core.condition_nodes import Condition
-import time
+from core.condition_nodes import Condition, blackboard_of, stable_condition, wake_hint
+from core.clock import SimClock
 import math
 
-# Variável de estado para armazenar o tempo da última ativação
-_last_time_timer_2s_map = {}
-_last_time_timer_5s_map = {}
-_last_time_timer_30s_map = {}
-_last_time_timer_4s_map = {}
+def _every(entity, name, seconds):
+    """True a cada `seconds` segundos (tempo simulado) por entidade; o último disparo fica no blackboard.
 
-def timer_2s(entity=None, map_ref=None):
+    Ao falhar, informa à árvore quando volta a disparar (wake_hint), para
+    que ela possa dormir até lá.
+    """
     if entity is None:
         return False
 
-    now = time.time()
-    last_time = _last_time_timer_2s_map.get(entity.id, 0)
-    
-    if now - last_time >= 2:
-        _last_time_timer_2s_map[entity.id] = now
+    timers = blackboard_of(entity).section('timers')
+    now = SimClock.time
+    last = timers.get(name)
+    if last is None or now - last >= seconds:
+        timers[name] = now
         return True
-    
+
+    wake_hint(entity, last + seconds)
     return False
 
+@stable_condition
+def timer_2s(entity=None, map_ref=None):
+    """Timer que retorna True a cada 2 segundos"""
+    return _every(entity, 'timer_2s', 2)
+
+@stable_condition
 def timer_5s(entity=None, map_ref=None):
     """Timer que retorna True a cada 5 segundos"""
-    if entity is None:
-        return False
+    return _every(entity, 'timer_5s', 5)
 
-    now = time.time()
-    last_time = _last_time_timer_5s_map.get(entity.id, 0)
-    
-    if now - last_time >= 5:
-        _last_time_timer_5s_map[entity.id] = now
-        return True
-    
-    return False
+@stable_condition
 def timer_4s(entity=None, map_ref=None):
     """Timer que retorna True a cada 4 segundos"""
-    if entity is None:
-        return False
-
-    now = time.time()
-    last_time = _last_time_timer_4s_map.get(entity.id, 0)
-
-    if now - last_time >= 4:
-        _last_time_timer_4s_map[entity.id] = now
-        return True
+    return _every(entity, 'timer_4s', 4)
 
-    return False
+@stable_condition
 def timer_30s(entity=None, map_ref=None):
     """Timer que retorna True a cada 30 segundos"""
-    if entity is None:
-        return False
-
-    now = time.time()
-    last_time = _last_time_timer_30s_map.get(entity.id, 0)
-    
-    if now - last_time >= 30:
-        _last_time_timer_30s_map[entity.id] = now
-        return True
-    
-    return False
+    return _every(entity, 'timer_30s', 30)
 
 def player_in_range_160(entity=None, map_ref=None):
     """Verifica se há um player em um raio de 160 pixels da entidade"""
@@ -222,6 +202,7 @@ for _th in range(10, 100, 10):
 
 con1 = Condition("timer-andar", timer_2s)
 con5 = Condition("timer-ataque-5s", timer_5s)
+@stable_condition
 def default(entity=None,map_ref=None):
     return True
 con2 = Condition("sem-condicao",default)
@@ -1,6 +1,4 @@
-import sqlite3
 import json
-import copy
 import time
 from assets.classes.itens import *
 from assets.classes.status import * 
@@ -11,18 +9,24 @@ from assets.behaviors.prj import projectiles_behaviors
 from assets.behaviors.conditions import conditions
 from assets.behaviors.actions import actions
 from core.inventory import *
+from core.prototypes import Prototypes
+from core.clock import SimClock
+from core.pool import Pool
 
 def load_behavior_from_db(id, conditions, actions):
-    conn = sqlite3.connect("assets/data/data.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT structure FROM BehaviorTree WHERE id = ?", (id,))
-    row = cursor.fetchone()
-    conn.close()
+    # A árvore é montada e compilada uma vez por id e compartilhada entre as
+    # entidades: só guarda referências às funções, o estado fica no blackboard.
+    return Prototypes.cached('behavior', id, lambda: compile_behavior(build_behavior(id, conditions, actions)))
 
+def compile_behavior(root):
+    return CompiledTree(root) if root is not None else None
+
+def build_behavior(id, conditions, actions):
+    row = Prototypes.get('BehaviorTree', id)
     if not row:
         return None
 
-    structure = json.loads(row[0])  # Converte string JSON para lista de pares
+    structure = json.loads(row['structure'])  # Converte string JSON para lista de pares
     stack = []
     current_children = []
 
@@ -32,6 +36,8 @@ def load_behavior_from_db(id, conditions, actions):
         if key == "structure":
             if value == "Sequence":
                 stack.append(("Sequence", []))
+            elif value == "MemorySequence":
+                stack.append(("MemorySequence", []))
             elif value == "Selector":
                 stack.append(("Selector", []))
 
@@ -60,14 +66,15 @@ def load_behavior_from_db(id, conditions, actions):
 
             if node_type == "Sequence":
                 current_children.append(SequenceNode(children))
+            elif node_type == "MemorySequence":
+                current_children.append(MemorySequenceNode(children))
             elif node_type == "Selector":
                 current_children.append(SelectorNode(children))
 
     if len(current_children) != 1:
         raise ValueError("Árvore mal formada. Esperado exatamente um nó raiz.")
 
-    # Retorna uma cópia profunda da árvore para evitar compartilhamento entre entidades
-    return copy.deepcopy(current_children[0]) 
+    return current_children[0]
 class Mob(Entity):
     def __init__(self, id, x, y, idMob):
         # Consultar o banco de dados para obter as informações do Creature
@@ -95,48 +102,47 @@ class Mob(Entity):
             self.behavior = None
       
     def load(self, creature_id):
-        conn = sqlite3.connect('assets/data/data.db')
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT maxHp, regenHp, maxMana, regenMana, maxStamina, regenStamina, damage, critical, defense, speed,aceleration, name, behaviors, sizex, sizey, idTextura
-            FROM Creature WHERE id = ?
-        """, (creature_id,))
-        creature_data = cursor.fetchone()
-    
-        conn.close()
+        creature_data = Prototypes.get('Creature', creature_id)
 
         if creature_data:
             return {
-                'maxHp':creature_data[0],
-                'regenHp':creature_data[1],
-                'maxMana':creature_data[2],
-                'regenMana':creature_data[3],
-                'maxStamina':creature_data[4],
-                'regenStamina':creature_data[5],
-                'damage':creature_data[6],
-                'critical':creature_data[7],
-                'defense':creature_data[8],
-                'speed':creature_data[9],
-                'ace':creature_data[10],
-                'Name':creature_data[11],
+                'maxHp':creature_data['maxHp'],
+                'regenHp':creature_data['regenHp'],
+                'maxMana':creature_data['maxMana'],
+                'regenMana':creature_data['regenMana'],
+                'maxStamina':creature_data['maxStamina'],
+                'regenStamina':creature_data['regenStamina'],
+                'damage':creature_data['damage'],
+                'critical':creature_data['critical'],
+                'defense':creature_data['defense'],
+                'speed':creature_data['speed'],
+                'ace':creature_data['aceleration'],
+                'Name':creature_data['name'],
                 'id':creature_id,
-                'behaviors':creature_data[12],
-                'sizex':creature_data[13],
-                'sizey':creature_data[14],
-                'idTextura':creature_data[15]
+                'behaviors':creature_data['behaviors'],
+                'sizex':creature_data['sizex'],
+                'sizey':creature_data['sizey'],
+                'idTextura':creature_data['idTextura']
             }
         else:
             return None  # Retorna None caso não encontre o Creature no banco
-    def run(self, map):
-        super().run(map)
-        self.check_projectile()
+    def run(self, map, dt=None):
+        if dt is None:
+            dt = SimClock.dt
+        super().run(map, dt)
         # Atualiza timer de efeito de fumaça
         if hasattr(self, 'smoke_timer') and self.smoke_timer > 0:
-            self.smoke_timer -= 1/60
-       
+            self.smoke_timer -= dt
+
 class Projectile(Entity):
+    __slots__ = ('projectile_data', 'type_owner', 'id_owner', 'speed', 'damage', 'penetration',
+                 'time', 'dirx', 'diry', 'already_hit', 'in_pool')
+
     def __init__(self, id, x, y, idProjectile, dirx, diry, type_owner=None, id_owner=None):
+        self.reset(id, x, y, idProjectile, dirx, diry, type_owner, id_owner)
+
+    def reset(self, id, x, y, idProjectile, dirx, diry, type_owner=None, id_owner=None):
+        """Reinicia todos os campos (construtor e reuso pelo Projectile.pool)."""
         # Inicializa com valores padrão de tamanho e stats
         super().__init__(id, x, y, 0, 0, 0,"projectile")  # sizex, sizey e angle default por enquanto
         self.projectile_data = self.load(idProjectile)
@@ -167,39 +173,29 @@ class Projectile(Entity):
             self.texture = 0
             self.dirx = dirx
             self.diry = diry
+        # Alvos já atingidos por um projétil que atravessa (penetration > 1)
+        already_hit = getattr(self, 'already_hit', None)
+        if already_hit is None:
+            self.already_hit = set()
+        else:
+            already_hit.clear()
 
-    def load(self, projectile_id):
-        conn = sqlite3.connect('assets/data/data.db')
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT speed, damage, penetration, sizex, sizey, time, behavior, idTextura
-            FROM Projectile WHERE id = ?
-        """, (projectile_id,))
-        data = cursor.fetchone()
-        conn.close()
+    def clear(self):
+        """Solta as referências antes de ir para o pool (a textura já foi devolvida)."""
+        self.texture = None
+        self.projectile_data = None
+        self.behavior = None
+        self.already_hit.clear()
 
-        if data:
-            return {
-                'speed': data[0],
-                'damage': data[1],
-                'penetration': data[2],
-                'sizex': data[3],
-                'sizey': data[4],
-                'time': data[5],
-                'behavior': data[6],
-                'idTextura': data[7]
-            }
-        else:
-            return None
-    def run(self, map, entities=None):
-        if self.behavior:
-            from core.entity import PrjControl
-            self.behavior(self, map, self.dirx, self.diry, PrjControl)
+    def load(self, projectile_id):
+        # Linha compartilhada do cache de protótipos (somente leitura)
+        return Prototypes.get('Projectile', projectile_id)
 
     def kill(self):
         from core.entity import PrjControl
         PrjControl.rem(self.id)
+Projectile.pool = Pool(Projectile)
+
 class Player(Entity):
     def __init__(self, id, file, texture): 
         with open(file, "r", encoding="utf-8") as arquivo:
@@ -478,7 +474,7 @@ class Player(Entity):
     def dash(self):
         if self.cooldown_dash() and self.moving and self.stats.stamina >= 20:
             self.stats.stamina -= 20
-            self.stats.add_effect(Effect("speed", self.stats.speed * 2,30))
+            self.stats.add_effect(Effect("speed", self.stats.speed * 2, 0.5))
             self.last_dash_time = time.time()
             
     ####Definição de cooldowns:
@@ -530,24 +526,17 @@ class Player(Entity):
                 "up": 3
             }.get(self.direction, 0)
     
-    def run(self,map):
-        # Detecta transições de ataque para resetar o índice de frame
-        
+    def run(self, map, dt=None):
+        if dt is None:
+            dt = SimClock.dt
 
         self.cooldown_dash()
-        self.stats.update_effects()  
+        self.stats.update_effects(dt)
         
         # Verifica se está sobre abismo (col=2) ou trap (col=3) - toda a parte inferior
-        abyss_detected = True
-        trap_detected = True
-        dy = self.sizey - 1  # Última linha (parte inferior)
-        for dx in range(self.sizex):
-            r = map.check_col(self.posx + dx, self.posy + dy, 0)
-            r_2 = map.check_col(self.posx + dx, self.posy + dy, 1)
-            if r != 2 and r_2 != 2:
-                abyss_detected = False
-            if r != 3 and r_2 != 3:
-                trap_detected = False
+        feet_y = self.posy + self.sizey - 1  # Última linha (parte inferior)
+        abyss_detected = map.all_col_in_rect(self.posx, feet_y, self.sizex, 1, 2)
+        trap_detected = map.all_col_in_rect(self.posx, feet_y, self.sizex, 1, 3)
         # Abismo: perde 10% da vida e volta para última posição válida (apenas se não estiver dashing)
         if abyss_detected and not self.dashing:
             damage = int(self.stats.maxHp * 0.1)
@@ -558,7 +547,7 @@ class Player(Entity):
             self.posy = self.prev_posy
         # Trap: toma 10 de dano por segundo enquanto estiver no tile (apenas se não estiver dashing)
         if trap_detected and not self.dashing:
-            self.take_damage(10/60)  # 10 de dano por segundo (assume 60 FPS)
+            self.take_damage(10 * dt)  # 10 de dano por segundo
         
         # Atualiza posição segura a cada 5 segundos, se não estiver em abismo
         import time
@@ -569,7 +558,7 @@ class Player(Entity):
         
         # Atualiza efeito visual de dano (herdado da classe Entity)
         if hasattr(self, 'damage_effect_timer') and self.damage_effect_timer > 0:
-            self.damage_effect_timer -= 1/60  # Assume 60 FPS
+            self.damage_effect_timer -= dt
             if self.damage_effect_timer <= 0:
                 self.damage_effect_timer = 0
                 
@@ -590,7 +579,7 @@ class Player(Entity):
         
         # Sprint logic
         if self.sprinting and self.stats.stamina > 0:
-            self.stats.stamina -= 0.1
+            self.stats.stamina -= 6.0 * dt  # 6 de stamina por segundo
         if self.stats.stamina <= 0:
             self.sprinting = False
         
@@ -600,11 +589,11 @@ class Player(Entity):
         self.control_animation()
 
         # --- Regeneração (apenas para players) ---
-        # Usa base de 60 ticks por segundo como convensão do projeto
+        # Valores de regen são por segundo; escala pelo dt do tick
         try:
             # Apenas aplicar se este objeto for um Player
             if getattr(self, 'type', None) == 'player' and hasattr(self, 'stats'):
-                tick_dt = 1.0 / 60.0
+                tick_dt = dt
                 # Regeneração de HP
                 if getattr(self.stats, 'regenHp', 0):
                     self.stats.hp += self.stats.regenHp * tick_dt
@@ -635,27 +624,37 @@ class Player(Entity):
                     self.texture.numFrame = 0.0
         except Exception:
             pass
-        self.check_projectile()
 
 def save_player(player, filename="saves/player.json"):
     player_dict = player.to_dict()
     with open(filename, 'w', encoding='utf-8') as f:
         json.dump(player_dict, f, indent=4, ensure_ascii=False)
 class ItemEntity(Entity):
+    __slots__ = ('item', 'in_pool')
+
     def __init__(self, id, x, y, item: Item):
+        self.reset(id, x, y, item)
+
+    def reset(self, id, x, y, item: Item):
+        """Reinicia todos os campos (construtor e reuso pelo ItemEntity.pool)."""
         texture = load_sprite_from_db(item.texture)
         super().__init__(id, x, y, 16, 16, texture,"item")
         
         self.item = item
         self.type = "item"
         self.behavior = None
+
+    def clear(self):
+        """Solta a textura e o item antes de ir para o pool."""
+        self.texture = None
+        self.item = None
     
-    def run(self, map):
+    def run(self, map, dt=None):
         """Verifica colisão com players e adiciona item ao inventário"""
         from core.entity import PControl, ItControl
         
-        # Verifica colisão com todos os players
-        for player in PControl.Players:
+        # Verifica colisão com os players próximos (broadphase pelo índice espacial)
+        for player in PControl.grid.query_rect(self.posx, self.posy, self.sizex, self.sizey):
             if self.check_collision_with(player):
                 # Adiciona o item ao inventário do player
                 if hasattr(player, 'inv'):
@@ -674,6 +673,8 @@ class ItemEntity(Entity):
             self.posy < other.posy + other.sizey and
             self.posy + self.sizey > other.posy
         )  
+ItemEntity.pool = Pool(ItemEntity)
+
 class Breakable(Entity):
     def __init__(self, id, x, y, sizex=None, sizey=None, texture=None, durability=None, drop=None, breakable_id=None):
         """Constructor supports two modes:
@@ -719,22 +720,7 @@ class Breakable(Entity):
 
     def load(self, breakable_id):
         """Load a breakable record from the Breakbles table and return a dict of column->value."""
-        conn = sqlite3.connect('assets/data/data.db')
-        cursor = conn.cursor()
-        try:
-            cursor.execute("SELECT * FROM Breakbles WHERE id = ?", (breakable_id,))
-        except Exception:
-            # Table might not exist or query invalid
-            conn.close()
-            return None
-        row = cursor.fetchone()
-        if not row:
-            conn.close()
-            return None
-        cols = [d[0] for d in cursor.description]
-        data = dict(zip(cols, row))
-        conn.close()
-        return data
+        return Prototypes.get('Breakbles', breakable_id)
 
     def take_damage(self, amount):
         self.durability -= amount
@@ -746,7 +732,7 @@ class Breakable(Entity):
         BrControl.rem(self.id)
         if self.drop:
             from core.entity import ItControl
-            item_entity = ItemEntity(0, self.posx, self.posy, self.drop)
+            item_entity = ItemEntity.pool.acquire(0, self.posx, self.posy, self.drop)
             ItControl.add(item_entity)
 
     def check_collision(self, other):
@@ -798,9 +784,15 @@ class Breakable(Entity):
             # Distância diagonal (usa distância euclidiana)
             return (dist_x * dist_x + dist_y * dist_y) <= 1
 
-    def run(self, map):
+    def run(self, map, dt=None):
         from core.entity import PrjControl, PControl
-        for entity in PControl.Players + PrjControl.Projectiles:
+        # Projéteis sobre o vaso causam dano; players numa margem de 2px (proximidade do dash)
+        nearby = PControl.grid.query_rect(self.posx - 2, self.posy - 2, self.sizex + 4, self.sizey + 4)
+        engine = PrjControl.engine
+        rows, _ = engine.sweep(self.posx, self.posy, self.sizex, self.sizey)
+        for row in rows:
+            self.take_damage(engine.damage[row])
+        for entity in nearby:
             # Primeiro verifica se o player está fazendo dash próximo ao vaso
             if isinstance(entity, Player) and self.check_dash_proximity(entity):
                 self.take_damage(1)
@@ -831,6 +823,4 @@ class Breakable(Entity):
                             entity.posy = self.posy - entity.sizey
                         elif min_overlap == overlap_bottom:
                             entity.posy = self.posy + self.sizey
-                elif hasattr(entity, 'damage'):
-                    # Se for outra entidade que causa dano
-                    self.take_damage(entity.damage)
+                        PControl.grid.update(entity)
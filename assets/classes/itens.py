@@ -233,9 +233,10 @@ class Weapon(Item):
             # type_owner e id_owner do player que está atacando
             from core.entity import PControl
             type_owner = 'player'
-            # Busca o id do player ativo (assume que o último é o ativo)
-            id_owner = PControl.Players[-1].id if PControl.Players else None
-            p1 = Projectile(0, playerPosx, playerPosy, self.projectile, mousex, mousey, type_owner=type_owner, id_owner=id_owner)
+            # Busca o player ativo (assume que o último registrado é o ativo)
+            owner = PControl.Players.last()
+            id_owner = owner.id if owner else None
+            p1 = Projectile.pool.acquire(0, playerPosx, playerPosy, self.projectile, mousex, mousey, type_owner=type_owner, id_owner=id_owner)
             try:
                 # Define a linha de animação do projétil igual ao ataque da arma
                 p1.anim = int(anim_row)
@@ -244,7 +245,7 @@ class Weapon(Item):
             p1.posx += mousex * 16
             p1.posy += mousey * 16
             from core.entity import PrjControl
-            p1.damage += self.damage * PControl.Players[id_owner -1].stats.damage
+            p1.damage += self.damage * owner.stats.damage
             PrjControl.add(p1)
             self.cooldown = self.max_cooldown
 
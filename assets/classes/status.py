@@ -1,4 +1,7 @@
 class Status:
+    __slots__ = ('hp', 'maxHp', 'regenHp', 'mana', 'maxMana', 'regenMana', 'stamina', 'maxStamina',
+                 'regenStamina', 'damage', 'critical', 'defense', 'speed', 'ace', 'active_effects')
+
     def __init__(self, hp, maxHp, regenHp, mana, maxMana, regenMana, stamina, maxStamina, regenStamina, damage, critical, defense, speed, ace):
         self.hp = hp
         self.maxHp = maxHp
@@ -34,19 +37,21 @@ class Status:
         buff.applied = True
         self.active_effects.append(buff)
 
-    def update_effects(self):
+    def update_effects(self, dt):
         for buff in self.active_effects[:]:
-            buff.remaining -= 1
+            buff.remaining -= dt
             if buff.remaining <= 0:
                 # Remove o efeito
                 if buff.applied:
                     setattr(self, buff.stat, getattr(self, buff.stat) - buff.value)
                 self.active_effects.remove(buff)
 class Effect:
+    __slots__ = ('stat', 'value', 'duration', 'remaining', 'applied')
+
     def __init__(self, stat, value, duration):
         self.stat = stat
         self.value = value
-        self.duration = duration  # Em ticks
+        self.duration = duration  # Em segundos
         self.remaining = duration
         self.applied = False
 
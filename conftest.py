@@ -0,0 +1,21 @@
+"""Fixtures compartilhadas dos testes."""
+from types import SimpleNamespace
+
+import pytest
+
+from core.navigation import NavGrid
+
+
+def fake_map(walls, tilewidth=32, tileheight=32):
+    """Mapa mínimo para a navegação: máscara de paredes (y, x) em col_classes[1] e a NavGrid em .nav."""
+    height, width = walls.shape
+    game_map = SimpleNamespace(map_width=width, map_height=height, tilewidth=tilewidth,
+                               tileheight=tileheight, col_classes={1: walls})
+    game_map.nav = NavGrid(game_map)
+    return game_map
+
+
+@pytest.fixture
+def make_map():
+    """Fábrica de mapas de teste: cada teste só declara as paredes."""
+    return fake_map
@@ -0,0 +1,286 @@
+import math
+
+from core.clock import SimClock
+
+# Classe de colisão de tile que bloqueia feixes e anéis (paredes; abismo e armadilha não)
+WALL_CLASS = 1
+# Trechos retos por período da senoide de um feixe ondulado (Beam com wave_amplitude)
+WAVE_SEGMENTS = 8
+
+
+def raycast(walls, tilewidth, tileheight, x, y, dirx, diry, max_dist):
+    """Distância (px) de (x, y) até o primeiro tile de `walls` na direção (dirx, diry), ou max_dist.
+
+    DDA de grade (Amanatides & Woo): visita só os tiles que a reta cruza,
+    em ordem, pulando de borda em borda. `walls` é uma máscara bool (y, x)
+    (ex.: Map.col_classes[WALL_CLASS]); tiles fora do mapa contam como
+    livres. A direção deve estar normalizada.
+    """
+    if walls is None:
+        return max_dist
+    height, width = walls.shape
+    tx, ty = int(x // tilewidth), int(y // tileheight)
+    step_x = 1 if dirx > 0 else -1
+    step_y = 1 if diry > 0 else -1
+    # Distância (ao longo do raio) até a próxima borda vertical/horizontal e entre bordas
+    if dirx:
+        next_x = ((tx + (dirx > 0)) * tilewidth - x) / dirx
+        delta_x = tilewidth / abs(dirx)
+    else:
+        next_x = delta_x = math.inf
+    if diry:
+        next_y = ((ty + (diry > 0)) * tileheight - y) / diry
+        delta_y = tileheight / abs(diry)
+    else:
+        next_y = delta_y = math.inf
+    dist = 0.0
+    while dist < max_dist:
+        if 0 <= tx < width and 0 <= ty < height and walls[ty, tx]:
+            return dist
+        if next_x < next_y:
+            tx += step_x
+            dist = next_x
+            next_x += delta_x
+        else:
+            ty += step_y
+            dist = next_y
+            next_y += delta_y
+    return max_dist
+
+
+def segment_hits_box(x0, y0, x1, y1, bx, by, bw, bh):
+    """Se o segmento (x0, y0)-(x1, y1) cruza o retângulo [bx, bx+bw] x [by, by+bh] (Liang-Barsky)."""
+    t0, t1 = 0.0, 1.0
+    dx, dy = x1 - x0, y1 - y0
+    for p, q in ((-dx, x0 - bx), (dx, bx + bw - x0), (-dy, y0 - by), (dy, by + bh - y0)):
+        if p == 0:
+            if q < 0:
+                return False
+            continue
+        t = q / p
+        if p < 0:
+            if t > t1:
+                return False
+            t0 = max(t0, t)
+        else:
+            if t < t0:
+                return False
+            t1 = min(t1, t)
+    return True
+
+
+def _key(entity):
+    return (getattr(entity, 'type', None), entity.id)
+
+
+class Beam:
+    """Feixe de dano: segmento com largura saindo de (x, y), cortado pela primeira parede.
+
+    Acerta cada alvo no máximo uma vez a cada `hit_interval` segundos
+    enquanto ele estiver dentro do feixe (hitbox do alvo expandida pela
+    meia largura contra o segmento). Quem dispara mira com aim() a cada
+    tick; o feixe some em `duration` segundos se não for removido antes.
+
+    Com `wave_amplitude`, o feixe é uma senoide ao longo do eixo, com um
+    período a cada `wave_length` px, desenhada como uma linha quebrada
+    (WAVE_SEGMENTS trechos por período). É a curva em que ficavam os
+    projéteis com movimento em onda disparados em sequência: a fase de
+    cada um cresce com a distância percorrida.
+    """
+    kind = 'beam'
+
+    def __init__(self, owner, x, y, dirx, diry, max_length, width, damage, hit_interval, duration,
+                 wave_amplitude=0.0, wave_length=None):
+        self.owner_key = _key(owner)
+        self.x, self.y = x, y
+        self.dirx, self.diry = 1.0, 0.0
+        self.aim(x, y, dirx, diry)
+        self.max_length = max_length
+        self.length = max_length
+        self.width = width
+        self.damage = damage
+        self.hit_interval = hit_interval
+        self.expires_at = SimClock.time + duration
+        self.wave_amplitude = wave_amplitude
+        self.wave_length = wave_length
+        self.points = None    # linha quebrada até a parede (update); None = recalcular
+        self._next_hit = {}   # (tipo, id) do alvo -> SimClock.time do próximo acerto
+
+    def aim(self, x, y, dirx, diry, max_turn=None):
+        """Move a origem e gira para (dirx, diry), no máximo `max_turn` radianos."""
+        self.x, self.y = x, y
+        self.points = None
+        magnitude = math.hypot(dirx, diry)
+        if magnitude == 0:
+            return
+        dirx, diry = dirx / magnitude, diry / magnitude
+        if max_turn is not None:
+            current = math.atan2(self.diry, self.dirx)
+            delta = (math.atan2(diry, dirx) - current + math.pi) % (2 * math.pi) - math.pi
+            if abs(delta) > max_turn:
+                angle = current + math.copysign(max_turn, delta)
+                dirx, diry = math.cos(angle), math.sin(angle)
+        self.dirx, self.diry = dirx, diry
+
+    def end(self):
+        return self.x + self.dirx * self.length, self.y + self.diry * self.length
+
+    def _curve(self, distance):
+        """Ponto da senoide a `distance` px da origem, medidos ao longo do eixo."""
+        offset = self.wave_amplitude * math.sin(2 * math.pi * distance / self.wave_length)
+        # Perpendicular de (x, y) é (-y, x), como em wave_motion
+        return (self.x + self.dirx * distance - self.diry * offset,
+                self.y + self.diry * distance + self.dirx * offset)
+
+    def path(self):
+        """Pontos da linha do feixe, da origem até onde ele acaba (a última parede vista em update)."""
+        if self.points is None:
+            if self.wave_amplitude:
+                self.points, _ = self._trace(None, 1, 1, self.length)
+            else:
+                self.points = [(self.x, self.y), self.end()]
+        return self.points
+
+    def _trace(self, walls, tilewidth, tileheight, max_length):
+        """Anda a senoide trecho a trecho e para no primeiro que encosta numa parede: (pontos, comprimento)."""
+        step = self.wave_length / WAVE_SEGMENTS
+        points = [(self.x, self.y)]
+        distance = 0.0
+        while distance < max_length:
+            x0, y0 = points[-1]
+            nxt = min(distance + step, max_length)
+            x1, y1 = self._curve(nxt)
+            size = math.hypot(x1 - x0, y1 - y0)
+            reach = raycast(walls, tilewidth, tileheight, x0, y0, (x1 - x0) / size, (y1 - y0) / size, size)
+            if reach < size:
+                fraction = reach / size
+                points.append((x0 + (x1 - x0) * fraction, y0 + (y1 - y0) * fraction))
+                return points, distance + (nxt - distance) * fraction
+            points.append((x1, y1))
+            distance = nxt
+        return points, distance
+
+    def update(self, walls, tilewidth, tileheight, dt):
+        """Recorta o comprimento na parede. Retorna False quando o feixe acabou."""
+        if SimClock.time >= self.expires_at:
+            return False
+        if self.wave_amplitude:
+            self.points, self.length = self._trace(walls, tilewidth, tileheight, self.max_length)
+        else:
+            self.length = raycast(walls, tilewidth, tileheight, self.x, self.y, self.dirx, self.diry,
+                                  self.max_length)
+            self.points = None
+        return True
+
+    def bounds(self):
+        points = self.path()
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
+        half = self.width * 0.5
+        return min(xs) - half, min(ys) - half, max(xs) + half, max(ys) + half
+
+    def hit(self, target):
+        """Dano a aplicar no alvo neste tick (0 se fora do feixe ou ainda no intervalo)."""
+        half = self.width * 0.5
+        bx, by = target.posx - half, target.posy - half
+        bw, bh = target.sizex + self.width, target.sizey + self.width
+        points = self.path()
+        if not any(segment_hits_box(x0, y0, x1, y1, bx, by, bw, bh)
+                   for (x0, y0), (x1, y1) in zip(points, points[1:])):
+            return 0
+        key = _key(target)
+        now = SimClock.time
+        if now < self._next_hit.get(key, 0.0):
+            return 0
+        self._next_hit[key] = now + self.hit_interval
+        return self.damage
+
+    def polygons(self):
+        """Um quad (4 cantos) por trecho do feixe."""
+        half = self.width * 0.5
+        points = self.path()
+        quads = []
+        for (x0, y0), (x1, y1) in zip(points, points[1:]):
+            size = math.hypot(x1 - x0, y1 - y0)
+            if size == 0:
+                continue
+            px, py = -(y1 - y0) / size * half, (x1 - x0) / size * half
+            quads.append(((x0 + px, y0 + py), (x1 + px, y1 + py), (x1 - px, y1 - py), (x0 - px, y0 - py)))
+        return quads
+
+
+class Ring:
+    """Anel que se expande a partir de (x, y), formado por raios (`angles`).
+
+    Cada raio é um quadrado de lado `spoke_size` a `radius` do centro,
+    andando para fora a `speed` px/s, como um projétil em linha reta; ele
+    some ao acertar um alvo (uma vez, dano `damage`) ou ao chegar na
+    primeira parede da sua direção, calculada por raycast na primeira
+    atualização. O anel acaba em `max_radius` ou sem raios.
+    """
+    kind = 'ring'
+
+    def __init__(self, owner, x, y, angles, start_radius, speed, spoke_size, damage, max_radius):
+        self.owner_key = _key(owner)
+        self.x, self.y = x, y
+        self.spokes = [(math.cos(a), math.sin(a)) for a in angles]
+        self.alive = [True] * len(self.spokes)
+        self.reach = None
+        self.radius = start_radius
+        self.speed = speed
+        self.spoke_size = spoke_size
+        self.damage = damage
+        self.max_radius = max_radius
+
+    def update(self, walls, tilewidth, tileheight, dt):
+        if self.reach is None:
+            self.reach = [raycast(walls, tilewidth, tileheight, self.x, self.y, dx, dy, self.max_radius)
+                          for dx, dy in self.spokes]
+        self.radius += self.speed * dt
+        for i, reach in enumerate(self.reach):
+            if self.radius > reach:
+                self.alive[i] = False
+        return self.radius <= self.max_radius and any(self.alive)
+
+    def bounds(self):
+        r = self.radius + self.spoke_size
+        return self.x - r, self.y - r, self.x + r, self.y + r
+
+    def hit(self, target):
+        half = self.spoke_size * 0.5
+        # Pré-filtro: o alvo precisa cruzar a faixa [radius - half, radius + half] (com folga da diagonal)
+        cx = min(max(self.x, target.posx), target.posx + target.sizex)
+        cy = min(max(self.y, target.posy), target.posy + target.sizey)
+        far_x = max(abs(self.x - target.posx), abs(self.x - target.posx - target.sizex))
+        far_y = max(abs(self.y - target.posy), abs(self.y - target.posy - target.sizey))
+        slack = half * math.sqrt(2)
+        if math.hypot(cx - self.x, cy - self.y) > self.radius + slack or \
+           math.hypot(far_x, far_y) < self.radius - slack:
+            return 0
+        damage = 0
+        for i, (dx, dy) in enumerate(self.spokes):
+            if not self.alive[i]:
+                continue
+            sx = self.x + dx * self.radius - half
+            sy = self.y + dy * self.radius - half
+            if (sx < target.posx + target.sizex and sx + self.spoke_size > target.posx and
+                    sy < target.posy + target.sizey and sy + self.spoke_size > target.posy):
+                self.alive[i] = False
+                damage += self.damage
+        return damage
+
+    def polygons(self):
+        """Um quad por raio vivo: trecho do anel com a largura e a espessura do raio."""
+        half = self.spoke_size * 0.5
+        inner, outer = max(self.radius - half, 0.0), self.radius + half
+        spread = half / max(self.radius, half)
+        quads = []
+        for i, (dx, dy) in enumerate(self.spokes):
+            if not self.alive[i]:
+                continue
+            angle = math.atan2(dy, dx)
+            a0, a1 = angle - spread, angle + spread
+            c0, s0, c1, s1 = math.cos(a0), math.sin(a0), math.cos(a1), math.sin(a1)
+            quads.append(((self.x + c0 * inner, self.y + s0 * inner), (self.x + c0 * outer, self.y + s0 * outer),
+                          (self.x + c1 * outer, self.y + s1 * outer), (self.x + c1 * inner, self.y + s1 * inner)))
+        return quads
@@ -0,0 +1,139 @@
+import numpy as np
+
+# Camadas de desenho do mundo (menor = mais ao fundo). Mantêm a ordem em que
+# os controladores eram desenhados antes do lote.
+LAYER_ENTITIES = 10
+LAYER_PLAYERS = 20
+LAYER_PROJECTILES = 30
+LAYER_BREAKABLES = 40
+LAYER_ITEMS = 50
+# Somado à camada do dono para sobreposições (arma, fumaça, hitbox)
+LAYER_OVERLAY = 5
+
+# Floats por vértice: u, v, r, g, b, a, x, y
+VERTEX_SIZE = 8
+
+
+class SpriteBatch:
+    """Lote de quads texturizados do frame.
+
+    Entre begin() e flush(), Sprite.draw e draw_rect não chamam o OpenGL:
+    os quads vão para um buffer agrupado por (camada, textura). No flush os
+    grupos são ordenados por camada e textura e enviados como um único
+    vertex array, com um glDrawArrays por grupo. Retângulos sem textura
+    usam uma textura branca 1x1, então também entram no lote.
+    """
+    _groups = None    # (camada, textura) -> lista de floats
+    _depth = 0
+    _white = None
+    # Estatísticas do último flush (usadas pelo benchmark)
+    draw_calls = 0
+    quads = 0
+
+    def active():
+        return SpriteBatch._depth > 0
+
+    def begin():
+        if SpriteBatch._depth == 0:
+            SpriteBatch._groups = {}
+        SpriteBatch._depth += 1
+
+    def flush():
+        if SpriteBatch._depth == 0:
+            return
+        SpriteBatch._depth -= 1
+        if SpriteBatch._depth == 0:
+            groups = SpriteBatch._groups
+            SpriteBatch._groups = None
+            SpriteBatch._submit(groups)
+
+    def white_texture():
+        from OpenGL.GL import (
+            glBindTexture, glGenTextures, glTexImage2D, glTexParameteri, GL_NEAREST, GL_RGBA,
+            GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_TEXTURE_MIN_FILTER, GL_UNSIGNED_BYTE
+        )
+        if SpriteBatch._white is None:
+            tex_id = glGenTextures(1)
+            glBindTexture(GL_TEXTURE_2D, tex_id)
+            glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, 1, 1, 0, GL_RGBA, GL_UNSIGNED_BYTE, b'\xff\xff\xff\xff')
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+            SpriteBatch._white = tex_id
+        return SpriteBatch._white
+
+    def quad(texture_id, layer, x1, y1, x2, y2, u1, v1, u2, v2, color=None):
+        """Adiciona um quad ao lote. color: RGBA em 0-1 (None = branco)."""
+        if color is None:
+            r = g = b = a = 1.0
+        else:
+            r, g, b, a = color
+        key = (layer, texture_id)
+        verts = SpriteBatch._groups.get(key)
+        if verts is None:
+            verts = SpriteBatch._groups[key] = []
+        verts.extend((
+            u1, v1, r, g, b, a, x1, y1,
+            u2, v1, r, g, b, a, x2, y1,
+            u2, v2, r, g, b, a, x2, y2,
+            u1, v2, r, g, b, a, x1, y2,
+        ))
+
+    def polygon(layer, points, color):
+        """Quad de cor sólida com 4 cantos quaisquer (feixes e anéis, core/area.py). color: RGBA em 0-255."""
+        r, g, b = color[0] / 255.0, color[1] / 255.0, color[2] / 255.0
+        a = color[3] / 255.0 if len(color) > 3 else 0.5
+        key = (layer, SpriteBatch.white_texture())
+        verts = SpriteBatch._groups.get(key)
+        if verts is None:
+            verts = SpriteBatch._groups[key] = []
+        for (x, y), (u, v) in zip(points, ((0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0))):
+            verts.extend((u, v, r, g, b, a, x, y))
+
+    def rect(x, y, width, height, color, layer):
+        """Retângulo de cor sólida. color: RGBA em 0-255."""
+        a = color[3] / 255.0 if len(color) > 3 else 0.5
+        SpriteBatch.quad(SpriteBatch.white_texture(), layer, x, y, x + width, y + height,
+                         0.0, 0.0, 1.0, 1.0, (color[0] / 255.0, color[1] / 255.0, color[2] / 255.0, a))
+
+    def _submit(groups):
+        from OpenGL.GL import (
+            glBindTexture, glBlendFunc, glColor4f, glColorPointer, glDisableClientState,
+            glDrawArrays, glEnable, glEnableClientState, glTexCoordPointer, glVertexPointer,
+            GL_BLEND, GL_COLOR_ARRAY, GL_FLOAT, GL_ONE_MINUS_SRC_ALPHA, GL_QUADS, GL_SRC_ALPHA,
+            GL_TEXTURE_2D, GL_TEXTURE_COORD_ARRAY, GL_VERTEX_ARRAY
+        )
+        SpriteBatch.draw_calls = 0
+        SpriteBatch.quads = 0
+        if not groups:
+            return
+        keys = sorted(groups)
+        counts = [len(groups[k]) // VERTEX_SIZE for k in keys]
+        data = np.fromiter((f for k in keys for f in groups[k]), dtype=np.float32,
+                           count=sum(counts) * VERTEX_SIZE).reshape(-1, VERTEX_SIZE)
+        tex = np.ascontiguousarray(data[:, 0:2])
+        col = np.ascontiguousarray(data[:, 2:6])
+        pos = np.ascontiguousarray(data[:, 6:8])
+
+        glEnable(GL_TEXTURE_2D)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        try:
+            glTexCoordPointer(2, GL_FLOAT, 0, tex)
+            glColorPointer(4, GL_FLOAT, 0, col)
+            glVertexPointer(2, GL_FLOAT, 0, pos)
+            first = 0
+            for (layer, texture_id), count in zip(keys, counts):
+                glBindTexture(GL_TEXTURE_2D, texture_id)
+                glDrawArrays(GL_QUADS, first, count)
+                first += count
+                SpriteBatch.draw_calls += 1
+            SpriteBatch.quads = first // 4
+        finally:
+            glDisableClientState(GL_COLOR_ARRAY)
+            glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
+            glBindTexture(GL_TEXTURE_2D, 0)
+            glColor4f(1.0, 1.0, 1.0, 1.0)
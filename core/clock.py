@@ -0,0 +1,56 @@
+# Ticks de simulação por segundo (independente do FPS de renderização)
+TICK_RATE = 60
+# Máximo de ticks simulados num único frame; o atraso além disso é descartado
+MAX_CATCH_UP_TICKS = 5
+# Maior intervalo de frame aceito (s), para pausas longas (arrastar janela, breakpoint)
+MAX_FRAME_TIME = 0.25
+
+
+class SimClock:
+    """Relógio da simulação em passo fixo.
+
+    O loop do jogo soma o tempo real de cada frame no acumulador
+    (advance) e executa quantos ticks de `dt` couberem, chamando step()
+    após cada um. O que sobra no acumulador vira `alpha` (0..1), usado
+    para interpolar as posições desenhadas entre o tick anterior e o atual.
+    Quando o frame atrasa mais que MAX_CATCH_UP_TICKS ticks, o excesso é
+    descartado em vez de acumulado (evita a espiral de morte).
+    """
+    tick_rate = TICK_RATE
+    dt = 1.0 / TICK_RATE
+    max_catch_up = MAX_CATCH_UP_TICKS
+    accumulator = 0.0
+    time = 0.0           # tempo simulado (s)
+    ticks = 0            # ticks simulados desde o início
+    dropped_ticks = 0    # ticks descartados pelo limite de catch-up
+
+    def configure(config):
+        """Lê a seção `simulation` do config.yaml."""
+        config = config or {}
+        SimClock.tick_rate = int(config.get('tick_rate', TICK_RATE))
+        SimClock.dt = 1.0 / SimClock.tick_rate
+        SimClock.max_catch_up = int(config.get('max_catch_up_ticks', MAX_CATCH_UP_TICKS))
+
+    def advance(frame_time):
+        """Soma o tempo real do frame e retorna quantos ticks devem ser simulados."""
+        SimClock.accumulator += min(max(frame_time, 0.0), MAX_FRAME_TIME)
+        ticks = int(SimClock.accumulator / SimClock.dt)
+        if ticks > SimClock.max_catch_up:
+            SimClock.dropped_ticks += ticks - SimClock.max_catch_up
+            SimClock.accumulator -= (ticks - SimClock.max_catch_up) * SimClock.dt
+            ticks = SimClock.max_catch_up
+        return ticks
+
+    def step():
+        """Marca um tick simulado."""
+        SimClock.accumulator -= SimClock.dt
+        SimClock.time += SimClock.dt
+        SimClock.ticks += 1
+
+    def alpha():
+        """Fração do próximo tick já decorrida (para interpolar a renderização)."""
+        return min(1.0, max(0.0, SimClock.accumulator / SimClock.dt))
+
+    def pause():
+        """Zera o acumulador (ex.: enquanto o menu está aberto) para não simular em rajada na volta."""
+        SimClock.accumulator = 0.0
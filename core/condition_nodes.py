@@ -1,37 +1,406 @@
+import math
+import time
+from core.clock import SimClock
+from core.profiler import Profiler
+
+# Resultado de um nó. SUCCESS/FAILURE são bool (condições antigas continuam
+# valendo); RUNNING indica uma ação em andamento, tickada de novo no próximo
+# tick se as condições do caminho até ela ainda valerem.
+SUCCESS = True
+FAILURE = False
+RUNNING = 'running'
+
+# Ticks cobertos pela roda de timers (~8.5 s a 60 ticks/s); esperas maiores dão voltas
+WHEEL_SLOTS = 512
+# Marca de "dormindo até um evento ou wake()", sem horário
+ASLEEP_UNTIL_EVENT = -1
+NO_SKIP = frozenset()
+
+class Blackboard(dict):
+    """Memória de uma entidade para as ações e condições do behavior tree.
+
+    A árvore é compartilhada entre as entidades com o mesmo behavior (ver
+    load_behavior_from_db); o estado de cada execução fica aqui, em
+    entity.blackboard, e vai embora com a entidade (Entity.kill).
+    """
+
+    def section(self, name):
+        """Sub-dicionário `name`, criado vazio no primeiro acesso."""
+        section = self.get(name)
+        if section is None:
+            section = self[name] = {}
+        return section
+
+
+def blackboard_of(entity):
+    """Blackboard da entidade, criado no primeiro uso."""
+    board = getattr(entity, 'blackboard', None)
+    if board is None:
+        board = entity.blackboard = Blackboard()
+    return board
+
+
+def stable_condition(function):
+    """Marca uma condição cujo resultado só muda no horário que ela informa via wake_hint()
+    (ou nunca). Um tick que só passou por condições assim põe a árvore para dormir."""
+    function.stable = True
+    return function
+
+
+def wake_hint(entity, at):
+    """Informa que a condição que acabou de falhar só pode mudar em `at` (SimClock.time)."""
+    board = blackboard_of(entity)
+    current = board.get('bt_hint')
+    if current is None or at < current:
+        board['bt_hint'] = at
+
+
+def sleep(entity, seconds):
+    """Pede para a árvore da entidade não rodar pelos próximos `seconds` (tempo simulado).
+
+    Vale ao fim do tick atual. Ao acordar, a árvore roda desde a raiz, como
+    em qualquer tick.
+    """
+    blackboard_of(entity)['bt_sleep'] = SimClock.time + seconds
+
+
+def _status(result):
+    """Status de uma ação: só FAILURE e RUNNING explícitos; qualquer outro retorno é sucesso."""
+    if result is RUNNING or result is FAILURE:
+        return result
+    return SUCCESS
+
+
 class Node:
     def run(self, entity, map_ref):
         raise NotImplementedError()
 class ConditionNode(Node):
     def __init__(self, condition):
         self.condition = condition  # agora pode ser só uma função
+        self.scope = 'bt.' + getattr(condition, '__name__', 'condition')
 
     def run(self, entity, map_ref):
-        return self.condition(entity, map_ref)
+        if not Profiler.enabled:
+            return self.condition(entity, map_ref)
+        start = time.perf_counter()
+        result = self.condition(entity, map_ref)
+        Profiler.record(self.scope, start, time.perf_counter())
+        return result
 class ActionNode(Node):
     def __init__(self, action):
         self.action = action  # função ou método simples
+        self.scope = 'bt.' + getattr(action, '__name__', 'action')
 
     def run(self, entity, map_ref):
-        self.action(entity, map_ref)
-        return True
+        if not Profiler.enabled:
+            return _status(self.action(entity, map_ref))
+        start = time.perf_counter()
+        result = self.action(entity, map_ref)
+        Profiler.record(self.scope, start, time.perf_counter())
+        return _status(result)
 class SequenceNode(Node):
     def __init__(self, children):
         self.children = children
 
     def run(self, entity, map_ref):
         for child in self.children:
-            if not child.run(entity, map_ref):
-                return False
-        return True
+            result = child.run(entity, map_ref)
+            if result is RUNNING:
+                return RUNNING
+            if not result:
+                return FAILURE
+        return SUCCESS
+class MemorySequenceNode(SequenceNode):
+    """Sequence com memória: enquanto um filho está em RUNNING, as ações dos filhos
+    anteriores, que já deram certo, não rodam de novo; as condições sim.
+
+    A memória é do CompiledTree (bt_skip) e dura enquanto o tick termina em
+    RUNNING dentro dela; fora do CompiledTree roda como SequenceNode.
+    """
+
+
 class SelectorNode(Node):
     def __init__(self, children):
         self.children = children
 
     def run(self, entity, map_ref):
         for child in self.children:
-            if child.run(entity, map_ref):
-                return True
-        return False
+            result = child.run(entity, map_ref)
+            if result is RUNNING:
+                return RUNNING
+            if result:
+                return SUCCESS
+        return FAILURE
+
+
+def _collect(node, leaves):
+    """Reserva as folhas de `node` em `leaves`, da esquerda para a direita; retorna o pc da primeira.
+
+    Cada folha é [função, é ação, pc se sucesso, pc se falha]; os destinos
+    são preenchidos por _link.
+    """
+    first = len(leaves)
+    if isinstance(node, (SequenceNode, SelectorNode)):
+        for child in node.children:
+            _collect(child, leaves)
+    elif isinstance(node, ActionNode):
+        leaves.append([node.action, True, None, None])
+    elif isinstance(node, ConditionNode):
+        leaves.append([node.condition, False, None, None])
+    else:
+        # Nó de outro tipo: chamado como está, com semântica de condição
+        leaves.append([node.run, False, None, None])
+    return first
+
+
+def _link(node, first, on_success, on_failure, leaves):
+    """Preenche os destinos das folhas de `node` (reservadas a partir de `first`); retorna o pc de entrada.
+
+    Um filho de Sequence continua no irmão seguinte se der certo; um de
+    Selector, se falhar. Como os destinos sempre ficam à direita da folha
+    (ou são os terminais), o programa só salta para a frente.
+    """
+    if isinstance(node, (SequenceNode, SelectorNode)):
+        starts = []
+        pc = first
+        for child in node.children:
+            starts.append(pc)
+            pc += _count(child)
+        entry = on_success if isinstance(node, SequenceNode) else on_failure
+        for child, start in reversed(list(zip(node.children, starts))):
+            if isinstance(node, SequenceNode):
+                entry = _link(child, start, entry, on_failure, leaves)
+            else:
+                entry = _link(child, start, on_success, entry, leaves)
+        return entry
+    leaves[first][2] = on_success
+    leaves[first][3] = on_failure
+    return first
+
+
+def _skips(node, first, leaves, skip, out):
+    """Preenche out[pc] com as ações a pular (frozenset de pcs) se a folha pc devolver RUNNING.
+
+    São as ações dos filhos anteriores de cada MemorySequenceNode acima da folha.
+    """
+    if isinstance(node, (SequenceNode, SelectorNode)):
+        pc = first
+        for child in node.children:
+            size = _count(child)
+            _skips(child, pc, leaves, skip, out)
+            if isinstance(node, MemorySequenceNode):
+                skip = skip | {i for i in range(pc, pc + size) if leaves[i][1]}
+            pc += size
+    else:
+        out[first] = frozenset(skip)
+
+
+def _count(node):
+    if isinstance(node, (SequenceNode, SelectorNode)):
+        return sum(_count(child) for child in node.children)
+    return 1
+
+
+def _generate(leaves, stable, entry, skippable):
+    """Código de `run(e, m, skip) -> (pc, busy)`: um bloco `if pc == i` por folha, em ordem.
+
+    Começa sempre em `entry` (a raiz). Os blocos seguem a ordem dos pcs e os
+    saltos são só para a frente, então basta atualizar `pc` e cair no bloco
+    seguinte. Para em RUNNING (devolvendo o pc da folha) ou num terminal
+    (len(leaves) = sucesso, len(leaves) + 1 = falha). As ações em
+    `skippable` que estiverem em `skip` contam como sucesso sem rodar.
+    `busy` fica verdadeiro se rodou alguma folha que não é condição estável.
+    """
+    lines = ["def run(e, m, skip):", f"    pc = {entry}", "    busy = False"]
+    for i, (function, is_action, on_success, on_failure) in enumerate(leaves):
+        if i in skippable:
+            lines.append(f"    if pc == {i} and {i} in skip:")
+            lines.append(f"        pc = {on_success}")
+        lines.append(f"    if pc == {i}:")
+        lines.append(f"        r = f{i}(e, m)")
+        lines.append("        if r is RUNNING:")
+        lines.append(f"            return {i}, True")
+        if not stable[i]:
+            lines.append("        busy = True")
+        if is_action:
+            lines.append(f"        pc = {on_failure} if r is False else {on_success}")
+        else:
+            lines.append(f"        pc = {on_success} if r else {on_failure}")
+    lines.append("    return pc, busy")
+    return "\n".join(lines) + "\n"
+
+
+def _profiled_leaf(function):
+    scope = 'bt.' + getattr(function, '__name__', 'leaf')
+
+    def leaf(entity, map_ref):
+        start = time.perf_counter()
+        result = function(entity, map_ref)
+        Profiler.record(scope, start, time.perf_counter())
+        return result
+    return leaf
+
+
+class CompiledTree:
+    """Behavior tree compilado num programa de saltos, executado por uma função gerada.
+
+    As folhas viram blocos `if pc == i` numa única função Python, na mesma
+    ordem e com o mesmo curto-circuito de node.run; um tick é uma chamada
+    só, sem despacho de método por nó. A estrutura é imutável e
+    compartilhada entre todos os mobs com o mesmo behavior.
+
+    Todo tick roda desde a raiz: uma folha em RUNNING só é tickada de novo
+    se as condições do caminho até ela ainda valerem, e os irmãos
+    anteriores (mover, animar) continuam rodando. O andamento da ação fica
+    no blackboard da entidade; se um guarda falhar, ela deixa de ser
+    chamada. Estado da execução, também no blackboard:
+
+    - bt_skip: ações já concluídas dos MemorySequenceNode acima da folha
+      que terminou o último tick em RUNNING; o tick seguinte não as roda.
+    - bt_asleep: a árvore está dormindo (BehaviorScheduler) e o tick sai
+      sem rodar nada. Ela dorme quando uma folha pede (sleep()) ou quando
+      o tick só passou por condições estáveis (stable_condition, ex.: os
+      timers): o resultado não muda antes do horário que elas informaram.
+
+    Com o Profiler ligado, roda a mesma função com as folhas cronometradas.
+    """
+    __slots__ = ('root', 'source', 'entry', 'size', 'skips', '_run', '_profiled')
+
+    def __init__(self, root):
+        self.root = root
+        leaves = []
+        _collect(root, leaves)
+        self.size = len(leaves)
+        self.entry = _link(root, 0, self.size, self.size + 1, leaves)
+        self.skips = [None] * self.size
+        _skips(root, 0, leaves, frozenset(), self.skips)
+        stable = [getattr(leaf[0], 'stable', False) for leaf in leaves]
+        skippable = frozenset().union(*self.skips)
+        self.source = _generate(leaves, stable, self.entry, skippable)
+        self._run = self._load([leaf[0] for leaf in leaves])
+        self._profiled = self._load([_profiled_leaf(leaf[0]) for leaf in leaves])
+
+    def _load(self, functions):
+        namespace = {f"f{i}": function for i, function in enumerate(functions)}
+        namespace['RUNNING'] = RUNNING
+        exec(compile(self.source, '<behavior tree>', 'exec'), namespace)
+        return namespace['run']
+
+    def run(self, entity, map_ref):
+        board = getattr(entity, 'blackboard', None)
+        if board is None:
+            board = blackboard_of(entity)
+        elif 'bt_asleep' in board:
+            return RUNNING
+        run = self._profiled if Profiler.enabled else self._run
+        pc, busy = run(entity, map_ref, board.pop('bt_skip', NO_SKIP))
+        hint = board.pop('bt_hint', None)
+        wake = board.pop('bt_sleep', None)
+        if pc < self.size:
+            if self.skips[pc]:
+                board['bt_skip'] = self.skips[pc]
+            status = RUNNING
+        else:
+            status = pc == self.size
+            if wake is None and not busy:
+                # Só condições estáveis: nada muda antes do horário informado (ou de um evento)
+                wake = hint if hint is not None else ASLEEP_UNTIL_EVENT
+        if wake is not None:
+            BehaviorScheduler.sleep_until(board, wake)
+        return status
+
+
+class BehaviorScheduler:
+    """Acorda as árvores que dormem, com uma roda de timers por tick de simulação.
+
+    Cada árvore dormindo fica numa das WHEEL_SLOTS listas (tick % WHEEL_SLOTS)
+    e custa zero por tick até lá: run() (etapa do tick de simulação) só
+    olha a lista do tick atual. Esperas mais longas que a roda continuam na
+    lista e são acordadas na volta certa. Também dá para dormir até um
+    evento (wait_event/notify) ou ser acordada direto (wake, ex.: ao tomar
+    dano).
+    """
+    wheel = [[] for _ in range(WHEEL_SLOTS)]  # slot -> [(tick, blackboard)]
+    waiting = {}                              # evento -> [blackboard]
+    last_tick = None
+    woken = 0
+
+    def sleep_until(board, wake_time):
+        """Põe o blackboard para dormir até `wake_time` (SimClock.time) ou ASLEEP_UNTIL_EVENT."""
+        if wake_time == ASLEEP_UNTIL_EVENT:
+            board['bt_asleep'] = ASLEEP_UNTIL_EVENT
+            return
+        ticks = math.ceil((wake_time - SimClock.time) / SimClock.dt - 1e-9)
+        tick = SimClock.ticks + max(ticks, 1)
+        board['bt_asleep'] = tick
+        BehaviorScheduler.wheel[tick % WHEEL_SLOTS].append((tick, board))
+
+    def wake(entity):
+        """Acorda a árvore da entidade (roda no próximo tick)."""
+        board = getattr(entity, 'blackboard', None)
+        if board is not None:
+            board.pop('bt_asleep', None)
+
+    def wait_event(entity, name):
+        """Põe a árvore para dormir até notify(name)."""
+        board = blackboard_of(entity)
+        board['bt_asleep'] = ASLEEP_UNTIL_EVENT
+        BehaviorScheduler.waiting.setdefault(name, []).append(board)
+
+    def notify(name):
+        """Acorda todas as árvores esperando o evento `name`."""
+        for board in BehaviorScheduler.waiting.pop(name, ()):
+            board.pop('bt_asleep', None)
+
+    def forget(entity):
+        """Entidade saiu do jogo: tira o blackboard das esperas por evento.
+
+        As entradas da roda não precisam ser procuradas: sem 'bt_asleep' o
+        blackboard não bate com a entrada e ela é descartada quando o slot vence.
+        """
+        board = getattr(entity, 'blackboard', None)
+        if board is None:
+            return
+        board.pop('bt_asleep', None)
+        waiting = BehaviorScheduler.waiting
+        for name in [name for name, boards in waiting.items() if any(b is board for b in boards)]:
+            boards = [b for b in waiting[name] if b is not board]
+            if boards:
+                waiting[name] = boards
+            else:
+                del waiting[name]
+
+    def run(game_map=None, dt=None):
+        """Etapa do tick: acorda quem tem horário marcado até o tick atual."""
+        now = SimClock.ticks
+        last = BehaviorScheduler.last_tick
+        BehaviorScheduler.last_tick = now
+        if last is None or now - last >= WHEEL_SLOTS:
+            ticks = range(WHEEL_SLOTS)
+        else:
+            ticks = range(last + 1, now + 1)
+        wheel = BehaviorScheduler.wheel
+        for tick in ticks:
+            slot = wheel[tick % WHEEL_SLOTS]
+            if not slot:
+                continue
+            later = []
+            for entry in slot:
+                due, board = entry
+                if due > now:
+                    later.append(entry)
+                elif board.get('bt_asleep') == due:
+                    del board['bt_asleep']
+                    BehaviorScheduler.woken += 1
+            slot[:] = later
+
+    def reset():
+        for slot in BehaviorScheduler.wheel:
+            slot.clear()
+        BehaviorScheduler.waiting = {}
+        BehaviorScheduler.last_tick = None
+
+
 class Condition:
     def __init__(self,name,function):
         self.name = name
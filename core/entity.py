@@ -1,12 +1,63 @@
+import numpy as np
+
+from core.area import WALL_CLASS
+from core.batch import (LAYER_BREAKABLES, LAYER_ENTITIES, LAYER_ITEMS, LAYER_OVERLAY,
+                        LAYER_PLAYERS, LAYER_PROJECTILES, SpriteBatch)
+from core.clock import SimClock
+from core.condition_nodes import BehaviorScheduler
+from core.lod import FROZEN, SimLOD
+from core.projectiles import ProjectileEngine
+from core.registry import Registry
+from core.spatial import SpatialHash, rect_overlap
+
 # Flag global para exibir hitboxes (configurada pelo Game)
 SHOW_HITBOXES = False
 
+# Tamanho (px) das células dos índices espaciais dos controladores
+GRID_CELL_SIZE = 64
+
+def release_texture(obj):
+    """Devolve ao TextureManager a referência da textura de um objeto que saiu do jogo."""
+    texture = getattr(obj, 'texture', None)
+    if hasattr(texture, 'release'):
+        texture.release()
+
+def recycle(obj):
+    """Devolve a textura e, se a classe tem pool (core/pool.py), guarda o objeto para reuso."""
+    release_texture(obj)
+    pool = getattr(type(obj), 'pool', None)
+    if pool is not None:
+        pool.release(obj)
+
+# Deslocamento (px) em um tick acima do qual não se interpola (teleporte, volta do abismo)
+SNAP_DISTANCE = 64
+
+def render_pos(obj, alpha):
+    """Posição de desenho interpolada entre o tick anterior (tick_x/tick_y) e o atual."""
+    px = getattr(obj, 'tick_x', None)
+    if px is None or alpha >= 1.0:
+        return obj.posx, obj.posy
+    dx = obj.posx - px
+    dy = obj.posy - obj.tick_y
+    if abs(dx) > SNAP_DISTANCE or abs(dy) > SNAP_DISTANCE:
+        return obj.posx, obj.posy
+    return px + dx * alpha, obj.tick_y + dy * alpha
+
 def set_show_hitboxes(value: bool):
     global SHOW_HITBOXES
     SHOW_HITBOXES = bool(value)
 
 
 class Entity:
+    # Layout fixo dos campos comuns. Subclasses sem __slots__ (Mob, Player,
+    # Breakable) ainda ganham __dict__ para os seus; as de alta rotatividade
+    # (Projectile, ItemEntity) declaram os próprios e ficam sem dicionário.
+    __slots__ = ('id', 'posx', 'posy', 'sizex', 'sizey', 'velx', 'vely', 'decPosx', 'decPosy',
+                 'anim', 'texture', 'facing', 'attacking', 'is_in_special_atk', 'type',
+                 'damage_effect_timer', 'damage_effect_duration', 'damage_blink_count',
+                 'damage_max_blinks', 'damage_blink_interval', 'prev_posx', 'prev_posy',
+                 'tick_x', 'tick_y', 'behavior', 'blackboard', 'lod_debt', 'lod_tier')
+
     def __init__(self, id, x, y, sizex, sizey, texture,type):
         self.id = id
         self.posx = x
@@ -34,45 +85,33 @@ class Entity:
         # Propriedades para sistema de abismo
         self.prev_posx = x  # Posição anterior X
         self.prev_posy = y  # Posição anterior Y
+        # Posição no início do tick (interpolação, ver render_pos); None até o primeiro tick
+        self.tick_x = self.tick_y = None
+        # Memória das ações/condições do behavior (core/condition_nodes.Blackboard)
+        self.blackboard = None
+        # Tempo simulado ainda não entregue a run() (ticks pulados pelo SimLOD)
+        self.lod_debt = 0.0
+        self.lod_tier = 0
 
     def move(self, x, y, map):
         hitbox_width = self.sizex 
         hitbox_height = self.sizey 
     
         # Checa apenas a linha inferior da hitbox (pé da entidade)
-        can_move = True
-        dy = hitbox_height - 1  # Última linha (pé)
-        for dx in range(hitbox_width):
-            r = map.check_col(self.posx + x + dx, self.posy + y + dy, 0)
-            r_2 = map.check_col(self.posx + x + dx, self.posy + y + dy, 1)
-
-
-            if r == 1 or r_2 == 1:
-                can_move = False
-                break
+        can_move = not map.has_col_in_rect(self.posx + x, self.posy + y + hitbox_height - 1,
+                                           hitbox_width, 1, (1,))
 
         # Bloqueia por breakables (objetos quebráveis) como obstáculos
         if can_move:
-            try:
-                for br in BrControl.Breakables:
-                    if br is self:
-                        continue
-                    new_left = self.posx + x
-                    new_right = new_left + self.sizex
-                    new_top = self.posy + y
-                    new_bottom = new_top + self.sizey
-
-                    br_left = br.posx
-                    br_right = br.posx + br.sizex
-                    br_top = br.posy
-                    br_bottom = br.posy + br.sizey
-
-                    if new_right > br_left and new_left < br_right and new_bottom > br_top and new_top < br_bottom:
-                        can_move = False
-                        break
-            except NameError:
-                # BrControl pode não estar definido ainda no momento da análise estática
-                pass
+            new_left = self.posx + x
+            new_top = self.posy + y
+            for br in BrControl.grid.query_rect(new_left, new_top, self.sizex, self.sizey):
+                if br is self:
+                    continue
+                if rect_overlap(new_left, new_top, self.sizex, self.sizey,
+                                br.posx, br.posy, br.sizex, br.sizey):
+                    can_move = False
+                    break
 
         if can_move:
             self.posx += x
@@ -80,26 +119,21 @@ class Entity:
     
     def collision(self, x, y):
         return (self.posx <= x < self.posx + self.sizex and self.posy <= y < self.posy + self.sizey)
-    def run(self,map):
+    def run(self, map, dt=None):
+        if dt is None:
+            dt = SimClock.dt
         
         # Atualiza efeito visual de dano
         if self.damage_effect_timer > 0:
-            self.damage_effect_timer -= 1/60  # Assume 60 FPS
+            self.damage_effect_timer -= dt
             if self.damage_effect_timer <= 0:
                 self.damage_effect_timer = 0
         
         # Verifica se está sobre abismo (col=2) ou trap (col=3) - toda a parte inferior
         if hasattr(self, "stats"):
-            abyss_detected = True
-            trap_detected = True
-            dy = self.sizey - 1  # Última linha (parte inferior)
-            for dx in range(self.sizex):
-                r = map.check_col(self.posx + dx, self.posy + dy, 0)
-                r_2 = map.check_col(self.posx + dx, self.posy + dy, 1)
-                if r != 2 and r_2 != 2:
-                    abyss_detected = False
-                if r != 3 and r_2 != 3:
-                    trap_detected = False
+            feet_y = self.posy + self.sizey - 1  # Última linha (parte inferior)
+            abyss_detected = map.all_col_in_rect(self.posx, feet_y, self.sizex, 1, 2)
+            trap_detected = map.all_col_in_rect(self.posx, feet_y, self.sizex, 1, 3)
             # Abismo: perde 10% da vida e volta para última posição válida (apenas se não estiver dashing)
             if abyss_detected and (not hasattr(self, 'dashing') or not self.dashing):
                 damage = int(self.stats.maxHp * 0.1)
@@ -110,22 +144,32 @@ class Entity:
                 self.posy = self.prev_posy
             # Trap: toma 10 de dano por segundo enquanto estiver no tile (apenas se não estiver dashing)
             if trap_detected and (not hasattr(self, 'dashing') or not self.dashing):
-                self.take_damage(10/60)  # 10 de dano por segundo (assume 60 FPS)
+                self.take_damage(10 * dt)  # 10 de dano por segundo
         
         if self.behavior:
             self.behavior.run(self, map)
+
+    def light_run(self, map, dt=None):
+        """Tick reduzido, nos ticks em que o SimLOD pula run() (ver core/lod.py)."""
+        pass
+
     def take_damage(self, amount):
         # Se estiver dashing, não toma dano
         if hasattr(self, 'dashing') and self.dashing:
             return
             
         self.stats.hp -= amount
+        # Condições de HP podem mudar: acorda a árvore se estiver dormindo
+        if self.blackboard is not None:
+            BehaviorScheduler.wake(self)
         # Ativa o efeito visual de dano
         self.damage_effect_timer = self.damage_effect_duration
         self.damage_blink_count = 0
         if self.stats.hp <= 0:
             self.kill()
     def kill(self):
+        # O estado do behavior (caminhos pedidos, alvo, timers) sai junto com a entidade
+        self.blackboard = None
         # Verifica se é um player
         if hasattr(self, 'type') and self.type == 'player':
             PControl.rem(self.id)
@@ -153,55 +197,43 @@ class Entity:
         
         # Após todas as piscadas, sempre normal
         return False
-    def check_projectile(self):
-        # No estado de dashing, o player não interage com projéteis
-        try:
-            if getattr(self, 'type', None) == 'player' and getattr(self, 'dashing', False):
-                return
-        except Exception:
-            pass
-        # Checa se há algum projétil se colidindo com a entidade
-        for projectile in PrjControl.Projectiles:
-            if projectile.id_owner == self.id and projectile.type_owner == self.type:
-                continue  # Ignora projéteis do próprio jogador
-            # Checa colisão para toda a área do projétil
-            for dx in range(projectile.sizex):
-                for dy in range(projectile.sizey):
-                    px = projectile.posx + dx
-                    py = projectile.posy + dy
-                    if self.collision(px, py):
-                        self.take_damage(projectile.damage)
-                        projectile.kill()
-                        break  # Para após a primeira colisão detectada
-                else:
-                    continue
-                break
 class EControl:
-    Entities = []
+    Entities = Registry()
+    grid = SpatialHash(GRID_CELL_SIZE)
 
     def add(e):
-        e.id = len(EControl.Entities) + 1
-        EControl.Entities.append(e)
+        EControl.Entities.add(e)
+        EControl.grid.insert(e)
 
     def rem(id):
-        entidade_remover = None
-        for e in EControl.Entities:
-            if e.id == id:
-                entidade_remover = e
-                break
-        if entidade_remover:
-            EControl.Entities.remove(entidade_remover)
-            for i, entidade in enumerate(EControl.Entities):
-                entidade.id = i + 1
-
-    def run(map):
+        # Remoção O(1); se ocorrer durante a iteração, o registro adia a exclusão
+        entidade_remover = EControl.Entities.remove(id)
+        if entidade_remover is not None:
+            EControl.grid.remove(entidade_remover)
+            BehaviorScheduler.forget(entidade_remover)
+            release_texture(entidade_remover)
+
+    def run(map, dt=None):
+        if dt is None:
+            dt = SimClock.dt
+        # Faixas de atividade pela distância aos jogadores (core/lod.py)
+        anchors = SimLOD.anchors(PControl.Players)
+        SimLOD.begin()
         for i, entidades in enumerate(EControl.Entities):
-            entidades.run(map)
+            entidades.tick_x, entidades.tick_y = entidades.posx, entidades.posy
+            entidades.lod_tier, step = SimLOD.step(entidades, anchors, dt)
+            if step is not None:
+                entidades.run(map, step)
+                EControl.grid.update(entidades)
+            elif entidades.lod_tier != FROZEN:
+                entidades.light_run(map, dt)
+        SimLOD.report()
 
-    def draw(camera_x, camera_y, zoom):
+    def draw(camera_x, camera_y, zoom, alpha=1.0):
         for i, entidades in enumerate(EControl.Entities):
-            screen_x = (entidades.posx - camera_x) * zoom
-            screen_y = (entidades.posy - camera_y) * zoom
+            x, y = render_pos(entidades, alpha)
+            screen_x = (x - camera_x) * zoom
+            screen_y = (y - camera_y) * zoom
             
             # Verifica se deve aplicar efeito de dano
             color_filter = None
@@ -209,12 +241,12 @@ class EControl:
                 # Filtro vermelho com transparência
                 color_filter = (1.0, 0.3, 0.3, 1.0)  # Vermelho forte
             
-            entidades.texture.draw(screen_x, screen_y, entidades.anim, zoom, color_filter)
+            entidades.texture.draw(screen_x, screen_y, entidades.anim, zoom, color_filter, LAYER_ENTITIES)
             # Desenha efeito de fumaça se ativo
             if hasattr(entidades, 'smoke_timer') and entidades.smoke_timer > 0:
                 from core.resources import draw_rect
-                alpha = entidades.smoke_timer / 1.5
-                color = (128, 128, 128, int(alpha * 255))  # Cinza com alpha
+                smoke_alpha = entidades.smoke_timer / 1.5
+                color = (128, 128, 128, int(smoke_alpha * 255))  # Cinza com alpha
                 # Posição da fumaça (local de spawn)
                 smoke_screen_x = (entidades.smoke_x - camera_x) * zoom
                 smoke_screen_y = (entidades.smoke_y - camera_y) * zoom
@@ -225,7 +257,7 @@ class EControl:
                 # Desenha pequenos quadrados fragmentados subindo
                 offsets = [(-10, -10), (10, 10), (0, -15), (-15, 0), (15, 15), (-5, 5), (5, -5)]
                 for ox, oy in offsets:
-                    draw_rect(int(smoke_screen_x + ox * zoom - 4), int(smoke_screen_y + oy * zoom - 4 - rise), 8, 8, color)
+                    draw_rect(int(smoke_screen_x + ox * zoom - 4), int(smoke_screen_y + oy * zoom - 4 - rise), 8, 8, color, LAYER_ENTITIES + LAYER_OVERLAY)
             # Desenha a hitbox do mob com transparência parcial (se habilitado)
             if SHOW_HITBOXES:
                 try:
@@ -234,7 +266,7 @@ class EControl:
                         hb_color = (0, 255, 0, 80)  # Verde translúcido
                         hb_w = int(entidades.sizex * zoom)
                         hb_h = int(entidades.sizey * zoom)
-                        draw_rect(int(screen_x), int(screen_y), hb_w, hb_h, hb_color)
+                        draw_rect(int(screen_x), int(screen_y), hb_w, hb_h, hb_color, LAYER_ENTITIES + LAYER_OVERLAY)
                 except Exception:
                     pass
             # Renderiza texto de vida na cabeça dos mobs
@@ -242,69 +274,178 @@ class EControl:
             draw_text(f"{entidades.stats.hp}/{entidades.stats.maxHp}hp", screen_x, screen_y - 20, 10, (255,0,0,255),"Arial",'center')
 # Controle exclusivo para projéteis
 class PrjControl:
-    Projectiles = []
+    """Projéteis em colunas NumPy (core/projectiles.ProjectileEngine).
+
+    Os objetos Projectile servem para criar o projétil (PrjControl.add
+    copia posição, direção, dano etc. para o motor) e guardam a textura;
+    depois disso a posição vive só no motor. Colisão contínua: o step
+    para os projéteis na primeira parede do trajeto e collide() aplica os
+    acertos em players e entidades na ordem em que cada projétil os
+    alcançaria no tick (engine.sweep). Breakables consultam o motor no
+    próprio run.
+    """
+    Projectiles = Registry()
+    engine = ProjectileEngine()
 
     def add(p):
-        p.id = len(PrjControl.Projectiles) + 1
-        PrjControl.Projectiles.append(p)
+        PrjControl.Projectiles.add(p)
+        PrjControl.engine.spawn(p, p.id, p.posx, p.posy, p.dirx, p.diry, p.speed, p.damage,
+                                p.penetration, p.time, p.sizex, p.sizey,
+                                p.behavior, p.id_owner, p.type_owner)
 
     def rem(id):
-        proj_remover = None
-        for p in PrjControl.Projectiles:
-            if p.id == id:
-                proj_remover = p
-                break
-        if proj_remover:
-            PrjControl.Projectiles.remove(proj_remover)
-            for i, proj in enumerate(PrjControl.Projectiles):
-                proj.id = i + 1
-
-    def run(map):
-        for proj in PrjControl.Projectiles:
-            proj.run(map)
-
-    def draw(camera_x, camera_y, zoom):
-        for proj in PrjControl.Projectiles:
-            screen_x = (proj.posx - camera_x) * zoom
-            screen_y = (proj.posy - camera_y) * zoom
-            proj.texture.draw(screen_x, screen_y, proj.anim, zoom, None)
+        # O objeto continua na linha (morta) do motor até a compactação; só então volta ao pool
+        if PrjControl.Projectiles.remove(id) is not None:
+            PrjControl.engine.kill_uid(id)
+
+    def run(map, dt=None):
+        walls = map.col_classes.get(WALL_CLASS)
+        version = getattr(getattr(map, 'nav', None), 'version', None)
+        for proj in PrjControl.engine.step(walls, map.tilewidth, map.tileheight, version):
+            PrjControl.Projectiles.remove(proj.id)
+            recycle(proj)
+        PrjControl.collide()
+
+    def collide():
+        """Aplica os acertos do tick em ordem de entrada (t), sem o dono e sem player em dash."""
+        engine = PrjControl.engine
+        if not engine.count:
+            return
+        targets = [target for registry in (PControl.Players, EControl.Entities) for target in registry
+                   if not (target.type == 'player' and getattr(target, 'dashing', False))]
+        if not targets:
+            return
+        rows, indices, times = engine.sweep_boxes(
+            np.array([target.posx for target in targets], dtype=float),
+            np.array([target.posy for target in targets], dtype=float),
+            np.array([target.sizex for target in targets], dtype=float),
+            np.array([target.sizey for target in targets], dtype=float),
+            [target.id for target in targets], [target.type for target in targets])
+        hits = zip(times.tolist(), rows.tolist(), [targets[i] for i in indices.tolist()])
+        for t, row, target in hits:
+            if not engine.alive[row]:
+                continue
+            projectile = engine.objects[row]
+            key = (target.type, target.id)
+            if key in projectile.already_hit:
+                continue  # projétil que atravessa só acerta cada alvo uma vez
+            target.take_damage(engine.damage[row])
+            if engine.hit(row):
+                projectile.already_hit.add(key)
+            else:
+                engine.clip(row, t)
+
+    def clear():
+        PrjControl.Projectiles.clear()
+        for proj in PrjControl.engine.objects:
+            recycle(proj)
+        PrjControl.engine.clear()
+
+    def draw(camera_x, camera_y, zoom, alpha=1.0):
+        engine = PrjControl.engine
+        if not engine.count:
+            return
+        xs, ys = engine.render_positions(alpha, SNAP_DISTANCE)
+        screen_xs = ((xs - camera_x) * zoom).tolist()
+        screen_ys = ((ys - camera_y) * zoom).tolist()
+        alive = engine.alive[:engine.count].tolist()
+        for i, proj in enumerate(engine.objects):
+            if not alive[i]:
+                continue
+            screen_x, screen_y = screen_xs[i], screen_ys[i]
+            proj.texture.draw(screen_x, screen_y, proj.anim, zoom, None, LAYER_PROJECTILES)
             # Desenha a hitbox do projétil (se habilitado)
             if SHOW_HITBOXES:
                 try:
                     from core.resources import draw_rect
                     hb_color = (255, 128, 0, 80)  # Laranja translúcido
-                    hb_w = int(getattr(proj, 'sizex', 0) * zoom)
-                    hb_h = int(getattr(proj, 'sizey', 0) * zoom)
-                    draw_rect(int(screen_x), int(screen_y), hb_w, hb_h, hb_color)
+                    hb_w = int(engine.w[i] * zoom)
+                    hb_h = int(engine.h[i] * zoom)
+                    draw_rect(int(screen_x), int(screen_y), hb_w, hb_h, hb_color, LAYER_PROJECTILES + LAYER_OVERLAY)
                 except Exception:
                     pass
+class AreaControl:
+    """Áreas de dano resolvidas a cada tick sem projéteis: feixes e anéis (core/area.py).
+
+    Cada área recorta seu alcance nas paredes (raycast na grade de tiles),
+    pega os candidatos pelo broadphase dos players, entidades e breakables
+    dentro do seu retângulo e aplica o dano que area.hit() devolver. O dono
+    nunca é atingido e player em dash é imune, como nos projéteis.
+    """
+    Areas = Registry()
+    colors = {'beam': (255, 70, 70, 190), 'ring': (255, 170, 60, 210)}
+
+    def add(area):
+        return AreaControl.Areas.add(area)
+
+    def rem(id):
+        AreaControl.Areas.remove(id)
+
+    def targets(x0, y0, x1, y1):
+        """Candidatos no retângulo; se ele cobre mais células que objetos, varre o registro."""
+        found = []
+        for controller, registry in ((PControl, PControl.Players), (EControl, EControl.Entities),
+                                     (BrControl, BrControl.Breakables)):
+            cs = controller.grid.cell_size
+            cells = (int((x1 - x0) // cs) + 1) * (int((y1 - y0) // cs) + 1)
+            if cells < len(registry):
+                found += controller.grid.query_rect(x0, y0, x1 - x0, y1 - y0)
+            else:
+                found += registry
+        return found
+
+    def run(map, dt=None):
+        if dt is None:
+            dt = SimClock.dt
+        walls = map.col_classes.get(WALL_CLASS)
+        for area in AreaControl.Areas:
+            if not area.update(walls, map.tilewidth, map.tileheight, dt):
+                AreaControl.rem(area.id)
+                continue
+            for target in AreaControl.targets(*area.bounds()):
+                if (target.type, target.id) == area.owner_key:
+                    continue
+                if target.type == 'player' and getattr(target, 'dashing', False):
+                    continue
+                damage = area.hit(target)
+                if damage:
+                    target.take_damage(damage)
+
+    def draw(camera_x, camera_y, zoom, alpha=1.0):
+        if not SpriteBatch.active():
+            return
+        for area in AreaControl.Areas:
+            color = AreaControl.colors[area.kind]
+            for quad in area.polygons():
+                SpriteBatch.polygon(LAYER_PROJECTILES,
+                                    [((x - camera_x) * zoom, (y - camera_y) * zoom) for x, y in quad], color)
+
+
 class PControl:
-    Players = []
+    Players = Registry()
+    grid = SpatialHash(GRID_CELL_SIZE)
     
     def add(e):
-        e.id = len(PControl.Players) + 1
-        PControl.Players.append(e)
+        PControl.Players.add(e)
+        PControl.grid.insert(e)
 
     def rem(id):
-        player_remover = None
-        for p in PControl.Players:
-            if p.id == id:
-                player_remover = p
-                break
-        
-        if player_remover:
-            PControl.Players.remove(player_remover)
-            for i, player in enumerate(PControl.Players):
-                player.id = i + 1
+        player_remover = PControl.Players.remove(id)
+        if player_remover is not None:
+            PControl.grid.remove(player_remover)
+            release_texture(player_remover)
 
-    def run(map):
+    def run(map, dt=None):
         for i, player in enumerate(PControl.Players):
-            player.run(map)
+            player.tick_x, player.tick_y = player.posx, player.posy
+            player.run(map, dt)
+            PControl.grid.update(player)
 
-    def draw(camera_x, camera_y, zoom):
+    def draw(camera_x, camera_y, zoom, alpha=1.0):
         for i, player in enumerate(PControl.Players):
-            screen_x = (player.posx - camera_x) * zoom
-            screen_y = (player.posy - camera_y) * zoom
+            x, y = render_pos(player, alpha)
+            screen_x = (x - camera_x) * zoom
+            screen_y = (y - camera_y) * zoom
             
             # Verifica se deve aplicar efeito de dano
             color_filter = None
@@ -313,7 +454,7 @@ class PControl:
                 color_filter = (1.0, 0.3, 0.3, 1.0)  # Vermelho forte
             
             # Desenha a textura base do player
-            player.texture.draw(screen_x, screen_y, player.anim, zoom, color_filter)
+            player.texture.draw(screen_x, screen_y, player.anim, zoom, color_filter, LAYER_PLAYERS)
             from core.resources import draw_text
             draw_text(f"{player.stats.hp}/{player.stats.maxHp}hp", screen_x, screen_y - 20, 10, (255,0,0,255),"Arial",'center')
 
@@ -340,9 +481,9 @@ class PControl:
                         pass
                     # Aplica o mesmo filtro de cor na arma se o player estiver tomando dano
                     if(player.moving and player.attacking):
-                        weapon_texture.draw(screen_x, screen_y, (player.anim - 20), zoom, color_filter)
+                        weapon_texture.draw(screen_x, screen_y, (player.anim - 20), zoom, color_filter, LAYER_PLAYERS + LAYER_OVERLAY)
                     else:
-                        weapon_texture.draw(screen_x, screen_y, player.anim - 16, zoom, color_filter)
+                        weapon_texture.draw(screen_x, screen_y, player.anim - 16, zoom, color_filter, LAYER_PLAYERS + LAYER_OVERLAY)
 
             # Desenha a hitbox do player (se habilitado)
             if SHOW_HITBOXES:
@@ -351,40 +492,43 @@ class PControl:
                     hb_color = (0, 128, 255, 80)  # Azul claro translúcido
                     hb_w = int(player.sizex * zoom)
                     hb_h = int(player.sizey * zoom)
-                    draw_rect(int(screen_x), int(screen_y), hb_w, hb_h, hb_color)
+                    draw_rect(int(screen_x), int(screen_y), hb_w, hb_h, hb_color, LAYER_PLAYERS + LAYER_OVERLAY)
                 except Exception:
                     pass
     
     def get_main_player():
-        """Retorna o player principal (primeiro da lista)"""
-        return PControl.Players[0] if PControl.Players else None              
+        """Retorna o player principal (o primeiro registrado)"""
+        return PControl.Players.first()              
 class BrControl:
-    Breakables = []
+    Breakables = Registry()
+    grid = SpatialHash(GRID_CELL_SIZE)
 
     def add(e):
-        e.id = len(BrControl.Breakables) + 1
-        BrControl.Breakables.append(e)
+        BrControl.Breakables.add(e)
+        BrControl.grid.insert(e)
         return e.id  # Retorna o ID atribuído
 
     def rem(id):
-        br_remover = None
-        for b in BrControl.Breakables:
-            if b.id == id:
-                br_remover = b
-                break
-        if br_remover:
-            BrControl.Breakables.remove(br_remover)
-            for i, br in enumerate(BrControl.Breakables):
-                br.id = i + 1
-
-    def run(map):
+        br_remover = BrControl.Breakables.remove(id)
+        if br_remover is not None:
+            BrControl.grid.remove(br_remover)
+            release_texture(br_remover)
+
+    def run(map, dt=None):
         for i, breakables in enumerate(BrControl.Breakables):
-            breakables.run(map)
+            breakables.tick_x, breakables.tick_y = breakables.posx, breakables.posy
+            breakables.run(map, dt)
+            BrControl.grid.update(breakables)
+        # Breakables bloqueiam a navegação: a grade só recalcula o que mudou
+        nav = getattr(map, 'nav', None)
+        if nav is not None:
+            nav.sync_blockers(BrControl.Breakables)
 
-    def draw(camera_x, camera_y, zoom):
+    def draw(camera_x, camera_y, zoom, alpha=1.0):
         for i, breakables in enumerate(BrControl.Breakables):
-            screen_x = (breakables.posx - camera_x) * zoom
-            screen_y = (breakables.posy - camera_y) * zoom
+            x, y = render_pos(breakables, alpha)
+            screen_x = (x - camera_x) * zoom
+            screen_y = (y - camera_y) * zoom
             
             # Verifica se deve aplicar efeito de dano
             color_filter = None
@@ -392,37 +536,36 @@ class BrControl:
                 # Filtro vermelho com transparência
                 color_filter = (1.0, 0.3, 0.3, 1.0)  # Vermelho forte
             
-            breakables.texture.draw(screen_x, screen_y, breakables.anim, zoom, color_filter)
+            breakables.texture.draw(screen_x, screen_y, breakables.anim, zoom, color_filter, LAYER_BREAKABLES)
 class ItControl:
-    items = []
+    items = Registry()
+    grid = SpatialHash(GRID_CELL_SIZE)
     
     def add(e):
-        e.id = len(ItControl.items) + 1
-        ItControl.items.append(e)
+        ItControl.items.add(e)
+        ItControl.grid.insert(e)
 
     def rem(id):
-        item_remover = None
-        for e in ItControl.items:
-            if e.id == id:
-                item_remover = e
-                break
-        if item_remover:
-            ItControl.items.remove(item_remover)
-            for i, item in enumerate(ItControl.items):
-                item.id = i + 1
-
-    def run(map):
+        item_remover = ItControl.items.remove(id)
+        if item_remover is not None:
+            ItControl.grid.remove(item_remover)
+            recycle(item_remover)
+
+    def run(map, dt=None):
         for item in ItControl.items:
-            item.run(map)
+            item.tick_x, item.tick_y = item.posx, item.posy
+            item.run(map, dt)
+            ItControl.grid.update(item)
 
-    def draw(camera_x, camera_y, zoom):
+    def draw(camera_x, camera_y, zoom, alpha=1.0):
         for item in ItControl.items:
-            screen_x = (item.posx - camera_x) * zoom
-            screen_y = (item.posy - camera_y) * zoom
+            x, y = render_pos(item, alpha)
+            screen_x = (x - camera_x) * zoom
+            screen_y = (y - camera_y) * zoom
             color_filter = None
             if hasattr(item, 'should_render_damage_effect') and item.should_render_damage_effect():
                 # Filtro vermelho com transparência
                 color_filter = (1.0, 0.3, 0.3, 1.0)  # Vermelho forte
             
             # Desenha itens com metade do tamanho
-            item.texture.draw(screen_x, screen_y, item.anim, zoom * 0.333333, color_filter)
\ No newline at end of file
+            item.texture.draw(screen_x, screen_y, item.anim, zoom * 0.333333, color_filter, LAYER_ITEMS)
\ No newline at end of file
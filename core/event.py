@@ -1,23 +1,28 @@
 from core.condition_nodes import Condition
-from core.entity import EControl
+from core.entity import EControl, PControl
+from core.trigger import ENTER, EXIT, STAY, TriggerIndex, trigger_from_data
 from assets.classes.entities import Breakable, Mob
 import sqlite3
 import json
 
 class Event:
-    def __init__(self, condition, name, actionType, action, cooldown, isloop):
+    def __init__(self, condition, name, actionType, action, cooldown, isloop, trigger=None):
         self.id = 0
         self.name = name
 
         # Se vier string, converte para função
         if isinstance(condition, str):
-            condition = eval(condition)
+            condition = eval(condition) if condition.strip() else None
 
-        # Se for função/lambda, cria Condition normalmente
-        if isinstance(condition, Condition):
+        # Se for função/lambda, cria Condition normalmente; sem condição, vale só o volume
+        if condition is None or isinstance(condition, Condition):
             self.condition = condition
         else:
             self.condition = Condition(name + "_condition", condition)
+        # Volume de gatilho (core/trigger.py): com ele, o evento só é avaliado com um player no volume
+        self.trigger = trigger
+        if trigger is not None:
+            trigger.event = self
 
         self.actionType = actionType
         self.action = action
@@ -35,7 +40,9 @@ class Event:
 
         # Avalia condição (suporta Condition e lambda)
         try:
-            if isinstance(self.condition, Condition):
+            if self.condition is None:
+                condition_result = True
+            elif isinstance(self.condition, Condition):
                 condition_result = self.condition.check()
             elif callable(self.condition):
                 condition_result = self.condition()
@@ -115,7 +122,17 @@ class Event:
 
 
 class EventControl:
+    """Eventos do mapa.
+
+    Eventos sem volume de gatilho avaliam a condição todo tick. Os com
+    volume ficam num TriggerIndex e só são avaliados quando o volume
+    ganha (enter), tem (stay) ou perde (exit) um player, conforme
+    trigger.on; a condição, se houver, é checada só então.
+    """
     Events = []
+    polled = []          # eventos sem volume
+    triggers = TriggerIndex()
+    unarmed = []         # adicionados desde o último run (o cooldown conta a partir daí)
 
     def load():
         conn = sqlite3.connect('assets/data/data.db')
@@ -128,16 +145,28 @@ class EventControl:
                 actionType TEXT,
                 action_json TEXT,
                 cooldown REAL,
-                isloop INTEGER
+                isloop INTEGER,
+                condition_type TEXT DEFAULT 'proximidade',
+                condition_data TEXT DEFAULT '{}',
+                action_data TEXT DEFAULT '{}'
             )
         ''')
-        cursor.execute('SELECT name, condition_code, actionType, action_json, cooldown, isloop FROM Events')
+        columns = [row[1] for row in cursor.execute('PRAGMA table_info(Events)')]
+        if 'condition_type' not in columns:
+            cursor.execute("ALTER TABLE Events ADD COLUMN condition_type TEXT DEFAULT 'proximidade'")
+            cursor.execute("ALTER TABLE Events ADD COLUMN condition_data TEXT DEFAULT '{}'")
+        cursor.execute('SELECT name, condition_code, actionType, action_json, cooldown, isloop, '
+                       'condition_type, condition_data FROM Events')
         rows = cursor.fetchall()
         for row in rows:
-            name, condition_code, actionType, action_json, cooldown, isloop = row
-            condition_func = eval(condition_code)
+            name, condition_code, actionType, action_json, cooldown, isloop, condition_type, condition_data = row
+            trigger = trigger_from_data(condition_type, json.loads(condition_data or '{}'))
+            if trigger is None and not condition_code:
+                print(f"[AVISO]: evento '{name}' sem condição nem volume de gatilho; ignorado")
+                continue
+            condition_func = eval(condition_code) if condition_code else None
             action = json.loads(action_json)
-            event = Event(condition_func, name, actionType, action, cooldown, bool(isloop))
+            event = Event(condition_func, name, actionType, action, cooldown, bool(isloop), trigger)
             EventControl.add(event)
         conn.close()
 
@@ -146,22 +175,49 @@ class EventControl:
         cursor = conn.cursor()
         cursor.execute('DELETE FROM Events')
         for event in EventControl.Events:
-            condition_code = "lambda: True"  # simplificado
+            condition_code = "lambda: True" if event.condition is not None else ""  # simplificado
             action_json = json.dumps(event.action)
+            condition_type, condition_data = 'proximidade', {}
+            if event.trigger is not None:
+                condition_type, condition_data = event.trigger.to_data()
             cursor.execute('''
-                INSERT INTO Events (name, condition_code, actionType, action_json, cooldown, isloop)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (event.name, condition_code, event.actionType, action_json, event.cooldown, int(event.isloop)))
+                INSERT INTO Events (name, condition_code, actionType, action_json, cooldown, isloop,
+                                    condition_type, condition_data)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (event.name, condition_code, event.actionType, action_json, event.cooldown, int(event.isloop),
+                  condition_type, json.dumps(condition_data)))
         conn.commit()
         conn.close()
 
     def add(event):
         event.id = len(EventControl.Events)
         EventControl.Events.append(event)
+        EventControl.unarmed.append(event)
+        if event.trigger is None:
+            EventControl.polled.append(event)
+        else:
+            EventControl.triggers.add(event.trigger)
+
+    def clear():
+        EventControl.Events = []
+        EventControl.polled = []
+        EventControl.unarmed = []
+        EventControl.triggers.clear()
 
     def run(time):
-        for event in EventControl.Events:
+        # Primeira passada de cada evento só marca o início do cooldown (ver Event.run)
+        for event in EventControl.unarmed:
+            if event.last_activation == 0:
+                event.last_activation = time
+        EventControl.unarmed = []
+        for event in EventControl.polled:
             event.run(time)
+        points = [(player.posx, player.posy) for player in PControl.Players]
+        entered, inside, exited = EventControl.triggers.update(points)
+        for volumes, on in ((entered, ENTER), (inside, STAY), (exited, EXIT)):
+            for volume in volumes:
+                if volume.on == on:
+                    volume.event.run(time)
 
 
 class Raid:
@@ -216,8 +272,7 @@ class RaidControl:
             raid = RaidControl.Raids[RaidControl.current_raid_index]
             all_dead = True
             for entity_id in raid.spawned_entities:
-                entity_exists = any(e.id == entity_id for e in EControl.Entities)
-                if entity_exists:
+                if EControl.Entities.has(entity_id):
                     all_dead = False
                     break
             if all_dead:
@@ -228,7 +283,5 @@ class RaidControl:
                     RaidControl.active = False
                     from core.entity import BrControl
                     for bid in RaidControl.lock_breakables:
-                        BrControl.Breakables = [b for b in BrControl.Breakables if b.id != bid]
-                    for i, br in enumerate(BrControl.Breakables):
-                        br.id = i + 1
+                        BrControl.rem(bid)
                     RaidControl.lock_breakables = []
@@ -0,0 +1,156 @@
+import numpy as np
+
+from core.clock import SimClock
+
+# Raio (tiles) da janela em volta do objetivo coberta por um campo
+FLOW_RADIUS = 48
+# Intervalo mínimo (ticks) entre recálculos de um campo cujo objetivo mudou de tile
+FLOW_MIN_INTERVAL = 6
+
+UNREACHABLE = np.iinfo(np.int32).max
+
+# Vizinhos (dx, dy): 4 ortogonais e 4 diagonais
+_STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1))
+
+
+def _shift(a, dx, dy, fill):
+    """out[y, x] = a[y + dy, x + dx] (fill fora da janela)."""
+    h, w = a.shape
+    out = np.full_like(a, fill)
+    ys, yd = (slice(dy, h), slice(0, h - dy)) if dy >= 0 else (slice(0, h + dy), slice(-dy, h))
+    xs, xd = (slice(dx, w), slice(0, w - dx)) if dx >= 0 else (slice(0, w + dx), slice(-dx, w))
+    out[yd, xd] = a[ys, xs]
+    return out
+
+
+def bfs_distances(walkable, gx, gy):
+    """Distância em passos 4-vizinhos de cada tile até (gx, gy); UNREACHABLE onde não chega."""
+    # BFS em frentes de onda: cada iteração expande um anel inteiro com NumPy
+    dist = np.full(walkable.shape, UNREACHABLE, dtype=np.int32)
+    frontier = np.zeros(walkable.shape, dtype=bool)
+    frontier[gy, gx] = True
+    visited = frontier.copy()
+    d = 0
+    while frontier.any():
+        dist[frontier] = d
+        grown = np.zeros_like(frontier)
+        grown[1:] |= frontier[:-1]
+        grown[:-1] |= frontier[1:]
+        grown[:, 1:] |= frontier[:, :-1]
+        grown[:, :-1] |= frontier[:, 1:]
+        frontier = grown & walkable & ~visited
+        visited |= frontier
+        d += 1
+    return dist
+
+
+class FlowField:
+    """Mapa de distâncias (BFS em tiles) até um objetivo, com o passo já resolvido.
+
+    Cobre a janela de FLOW_RADIUS tiles em volta do objetivo. step(tx, ty)
+    devolve o vizinho (dx, dy) que mais aproxima do objetivo, ou None se o
+    tile está fora da janela, já é o objetivo ou não tem vizinho
+    alcançável. Um tile bloqueado vizinho da área livre (entidade encostada
+    na parede) também recebe passo, de volta para ela. Diagonais só são
+    usadas quando os dois vizinhos ortogonais também são livres (sem
+    cortar quina de parede).
+    """
+
+    def __init__(self, walkable, goal, x0, y0):
+        self.goal = goal
+        self.x0 = x0
+        self.y0 = y0
+        self.height, self.width = walkable.shape
+        self.dist = bfs_distances(walkable, goal[0] - x0, goal[1] - y0)
+        self.step_x, self.step_y = self._steps(walkable)
+
+    def _steps(self, walkable):
+        best = self.dist.copy()
+        step_x = np.zeros(best.shape, dtype=np.int8)
+        step_y = np.zeros(best.shape, dtype=np.int8)
+        for dx, dy in _STEPS:
+            nd = _shift(self.dist, dx, dy, UNREACHABLE)
+            if dx and dy:
+                # Diagonal exige os dois ortogonais livres
+                nd[~(_shift(walkable, dx, 0, False) & _shift(walkable, 0, dy, False))] = UNREACHABLE
+            better = nd < best
+            best[better] = nd[better]
+            step_x[better] = dx
+            step_y[better] = dy
+        return step_x, step_y
+
+    def _local(self, tx, ty):
+        lx, ly = tx - self.x0, ty - self.y0
+        if 0 <= lx < self.width and 0 <= ly < self.height:
+            return lx, ly
+        return None
+
+    def distance(self, tx, ty):
+        """Distância em passos até o objetivo, ou None (fora da janela/inalcançável)."""
+        local = self._local(tx, ty)
+        if local is None:
+            return None
+        d = self.dist[local[1], local[0]]
+        return None if d == UNREACHABLE else int(d)
+
+    def step(self, tx, ty):
+        local = self._local(tx, ty)
+        if local is None:
+            return None
+        lx, ly = local
+        dx, dy = self.step_x[ly, lx], self.step_y[ly, lx]
+        if not dx and not dy:
+            return None
+        return int(dx), int(dy)
+
+
+class FlowFields:
+    """Campos de fluxo compartilhados: um por (objetivo, tamanho de entidade).
+
+    Qualquer número de mobs perseguindo o mesmo player lê o próximo passo
+    do mesmo campo em O(1), em vez de cada um rodar seu próprio A*. Um
+    campo é recalculado quando a grade de navegação muda (NavGrid.version)
+    ou quando o objetivo muda de tile, no máximo a cada `min_interval`
+    ticks de simulação.
+    """
+
+    def __init__(self, nav, radius=FLOW_RADIUS, min_interval=FLOW_MIN_INTERVAL):
+        self.nav = nav
+        self.radius = radius
+        self.min_interval = min_interval
+        self.fields = {}   # (chave, tamanho) -> (campo, versão da nav, tick do cálculo)
+        self.builds = 0
+
+    def goal_tile(self, obj):
+        """Tile do centro da hitbox de `obj`."""
+        return (int((obj.posx + obj.sizex / 2) // self.nav.tilewidth),
+                int((obj.posy + obj.sizey / 2) // self.nav.tileheight))
+
+    def field_for(self, key, goal, size=1):
+        """Campo até o tile `goal` para entidades de `size` tiles; `key` identifica o objetivo (ex.: id do player)."""
+        cached = self.fields.get((key, size))
+        if cached is not None:
+            field, version, tick = cached
+            if version == self.nav.version and (
+                    field.goal == goal or SimClock.ticks - tick < self.min_interval):
+                return field
+        field = self.build(goal, size)
+        self.fields[(key, size)] = (field, self.nav.version, SimClock.ticks)
+        return field
+
+    def field_to(self, obj, size=1):
+        """Campo até a entidade `obj` (player), identificada pelo id."""
+        return self.field_for(obj.id, self.goal_tile(obj), size)
+
+    def build(self, goal, size=1):
+        nav = self.nav
+        gx = min(max(goal[0], 0), nav.width - 1)
+        gy = min(max(goal[1], 0), nav.height - 1)
+        x0, y0 = max(gx - self.radius, 0), max(gy - self.radius, 0)
+        x1, y1 = min(gx + self.radius + 1, nav.width), min(gy + self.radius + 1, nav.height)
+        walkable = nav.walkable_mask(size)[y0:y1, x0:x1]
+        self.builds += 1
+        return FlowField(walkable, (gx, gy), x0, y0)
+
+    def clear(self):
+        self.fields.clear()
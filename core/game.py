@@ -6,14 +6,24 @@ import sys
 import io
 from OpenGL.GL import *
 from OpenGL.GLU import *
-from core.entity import BrControl, EControl as EntityTick, PControl as PlayerTick, PrjControl as PrjTick
+from core.entity import AreaControl, BrControl, EControl as EntityTick, PControl as PlayerTick, PrjControl as PrjTick, render_pos
 from core.event import EventControl as EventTick
 from core.event import RaidControl
 from core.event import Event
 from core.map import Map
 from assets.classes.entities import Player, save_player,Breakable
 from core.resources import load_sprite_from_db, draw_text
-from utils.input import Input, control
+from core.prototypes import Prototypes
+from core.batch import SpriteBatch
+from core.text import TextRenderer
+from core.textures import TextureManager
+from core.clock import SimClock
+from core.profiler import Profiler
+from core.pathservice import PathService
+from core.lod import SimLOD
+from core.pool import Pool
+from core import simulation
+from utils.input import Input, control, SIM_EDGE_KEYS
 from assets.classes.components import Mouse
 from core.resources import draw_text
 from core.entity import ItControl
@@ -81,7 +91,23 @@ class Game:
         pygame.display.set_caption(self.CONFIG['project']['window_name'])
         self.clock = pygame.time.Clock()
         self.time = time.time()
+        TextureManager.configure(self.CONFIG.get('textures', {}))
+        SimClock.configure(self.CONFIG.get('simulation', {}))
+        Profiler.configure(self.CONFIG.get('profiler', {}))
+        PathService.configure(self.CONFIG.get('pathfinding', {}))
+        SimLOD.configure(self.CONFIG.get('lod', {}))
+        Pool.configure(self.CONFIG.get('pools', {}))
+        # Overlay do profiler (F3); F4 grava um trace dos próximos frames
+        self.show_profiler = Profiler.enabled
         self.map = Map('assets/data/map.json','assets/images/layers/basic.png')
+        # Carrega os protótipos (criaturas, projéteis, sprites...) e suas texturas
+        # de uma vez, para que os spawns durante o jogo não acessem o banco nem a GPU
+        Prototypes.preload()
+        for table in ('Creature', 'Projectile', 'Breakbles'):
+            for row in Prototypes.table(table).values():
+                sprite = load_sprite_from_db(row['idTextura'])
+                if sprite is not None:
+                    sprite.release()  # fica residente no TextureManager, sem referência
         # Instancia o player no novo PlayerController
         PlayerTick.add(Player(1,"saves/player.json",load_sprite_from_db(8)))
         ##from assets.classes.itens import get_item_from_db
@@ -158,8 +184,13 @@ class Game:
         self.interface_manager.connect_inventory_to_interface(PlayerTick.get_main_player().inv)
 
 
+    def tick(self, dt):
+        """Um tick de simulação de duração fixa `dt` (segundos)."""
+        simulation.tick(self.map, dt, self.input)
+
     def run(self):
             ########Loop principal e controles:
+            last_frame = time.perf_counter()
             while self.running:
                 self.input.update()
                 
@@ -183,25 +214,34 @@ class Game:
                         self.zoom -= 0.5
                         if self.zoom < 0.1:
                             self.zoom = 0.5  # Limita o zoom mínimo
+                if self.input.get_key_pressed("profiler"):
+                    self.show_profiler = not self.show_profiler
+                    if self.show_profiler != Profiler.enabled:
+                        Profiler.toggle()
+                if self.input.get_key_pressed("profiler_trace") and not Profiler.recording():
+                    Profiler.start_trace()
                 
-            ###### Atualizações p/tick
+            ###### Atualizações p/tick (passo fixo, independente do FPS)
+                now = time.perf_counter()
+                frame_time = now - last_frame
+                last_frame = now
                 # Só atualiza entidades e eventos quando estamos jogando
                 if self.game_state == "playing":
-                    EntityTick.run(self.map)
-                    PlayerTick.run(self.map)
-                    EventTick.run(time.time())
-                    RaidControl.run()
-                    PrjTick.run(self.map)
-                    BrControl.run( self.map)
-                    ItControl.run(self.map)
-                    
-                    # Controlador do player (apenas durante o jogo)
-                    main_player = PlayerTick.get_main_player()
-                    if main_player:
-                        control(self.input, main_player, self.map)
+                    ticks = SimClock.advance(frame_time)
+                    for _ in range(ticks):
+                        self.tick(SimClock.dt)
+                        SimClock.step()
+                    if ticks:
                         # Recoleta posição/estado do mouse após controle (mira pode ter sido atualizada)
                         mx, my = self.input.get_mouse_pos()
                         mouse_pressed = self.input.get_mouse_button(0)
+                    else:
+                        # Nenhum tick neste frame: guarda os toques do controle do player para o próximo
+                        self.input.defer_edges(SIM_EDGE_KEYS)
+                    alpha = SimClock.alpha()
+                else:
+                    SimClock.pause()
+                    alpha = 1.0
                 
             ###### Renderização gráfica
                 glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
@@ -211,19 +251,41 @@ class Game:
                 if self.game_state != "menu":
                     main_player = PlayerTick.get_main_player()
                     if main_player:
-                        # Renderiza o mundo do jogo primeiro
-                        self.map.render(0,0,self.zoom,main_player,self.CONFIG["screen"]["width"],self.CONFIG["screen"]["height"])
-                        EntityTick.draw(main_player.posx- (self.CONFIG["screen"]["width"]/(2*self.zoom)),main_player.posy- (self.CONFIG["screen"]["height"]/(2*self.zoom)),self.zoom)
-                        PlayerTick.draw(main_player.posx- (self.CONFIG["screen"]["width"]/(2*self.zoom)),main_player.posy- (self.CONFIG["screen"]["height"]/(2*self.zoom)),self.zoom)
-                        PrjTick.draw(main_player.posx- (self.CONFIG["screen"]["width"]/(2*self.zoom)),main_player.posy- (self.CONFIG["screen"]["height"]/(2*self.zoom)),self.zoom)
-                        BrControl.draw(main_player.posx- (self.CONFIG["screen"]["width"]/(2*self.zoom)),main_player.posy- (self.CONFIG["screen"]["height"]/(2*self.zoom)),self.zoom)
-                        ItControl.draw(main_player.posx- (self.CONFIG["screen"]["width"]/(2*self.zoom)),main_player.posy- (self.CONFIG["screen"]["height"]/(2*self.zoom)),self.zoom)
+                        # Sprites e textos do mundo (vida dos mobs/players) vão em lotes,
+                        # enviados depois que todos os controladores desenharam
+                        SpriteBatch.begin()
+                        TextRenderer.begin()
+                        try:
+                            # Câmera centrada na posição interpolada do player
+                            px, py = render_pos(main_player, alpha)
+                            cam_x = px - (self.CONFIG["screen"]["width"]/(2*self.zoom))
+                            cam_y = py - (self.CONFIG["screen"]["height"]/(2*self.zoom))
+                            # Renderiza o mundo do jogo primeiro
+                            with Profiler.scope('map.render'):
+                                self.map.render(cam_x,cam_y,self.zoom,None,self.CONFIG["screen"]["width"],self.CONFIG["screen"]["height"])
+                            with Profiler.scope('EntityTick.draw'):
+                                EntityTick.draw(cam_x,cam_y,self.zoom,alpha)
+                            with Profiler.scope('PlayerTick.draw'):
+                                PlayerTick.draw(cam_x,cam_y,self.zoom,alpha)
+                            with Profiler.scope('PrjTick.draw'):
+                                PrjTick.draw(cam_x,cam_y,self.zoom,alpha)
+                            with Profiler.scope('AreaTick.draw'):
+                                AreaControl.draw(cam_x,cam_y,self.zoom,alpha)
+                            with Profiler.scope('BrControl.draw'):
+                                BrControl.draw(cam_x,cam_y,self.zoom,alpha)
+                            with Profiler.scope('ItControl.draw'):
+                                ItControl.draw(cam_x,cam_y,self.zoom,alpha)
+                        finally:
+                            with Profiler.scope('batch.flush'):
+                                SpriteBatch.flush()
+                                TextRenderer.flush()
                 # Reseta completamente a matriz de transformação para a interface
                 glMatrixMode(GL_MODELVIEW)
                 glLoadIdentity()
                 
                 # Atualiza e renderiza interface ativa
-                self.interface_manager.update(mx, my, mouse_pressed)
+                with Profiler.scope('interface.update'):
+                    self.interface_manager.update(mx, my, mouse_pressed)
                 # Limpa cliques simulados (gerados pelo controller, ex.: botão A)
                 try:
                     for idx in list(getattr(self.input, '_simulated_clicks', set())):
@@ -235,7 +297,8 @@ class Game:
                         pass
                 except Exception:
                     pass
-                self.interface_manager.draw()
+                with Profiler.scope('interface.draw'):
+                    self.interface_manager.draw()
                 
                 # Debug overlay: coordenadas
                 try:
@@ -261,8 +324,13 @@ class Game:
                         except Exception:
                             wx, wy = 0, 0
                         draw_text(f"M: {sx},{sy}  W: {int(wx)},{int(wy)}", 10, 48, size=14, color=(200, 200, 255, 255))
+                        tex = TextureManager.stats()
+                        draw_text(f"Tex: {tex['textures']} ({tex['bytes_resident'] / (1024 * 1024):.1f} MB)  uploads: {tex['uploads']}  hit: {tex['hit_rate'] * 100:.0f}%",
+                                  10, 66, size=14, color=(255, 200, 200, 255))
                 except Exception:
                     pass
+                if self.show_profiler or Profiler.recording():
+                    self._draw_profiler_overlay()
                 # Renderiza cursor por último (controla visibilidade conforme flag do input)
                 if hasattr(self.input.mouse, '__getitem__'):
                     self.mouse.visible = bool(self.input.mouse.get("visible", True))
@@ -272,6 +340,7 @@ class Game:
                 
                 
 
+                Profiler.end_frame()
                 deltatime = self.clock.tick(self.CONFIG['project']['FPS'])
                 # Desenha contador de FPS no canto superior esquerdo
                 fps = self.clock.get_fps()
@@ -281,6 +350,7 @@ class Game:
                 
             # Restaura stdout original antes de sair
             sys.stdout = self.action_capture.original_stdout
+            PathService.shutdown()
             pygame.quit()
             main_player = PlayerTick.get_main_player()
             if main_player:
@@ -300,6 +370,27 @@ class Game:
             except Exception:
                 pass
     
+    def _draw_profiler_overlay(self):
+        """Tabela p50/p95/máx (ms por frame) dos escopos do Profiler, no canto superior direito."""
+        x = self.CONFIG["screen"]["width"] - 380
+        y = 10
+        if Profiler.recording():
+            draw_text(f"Gravando trace... {Profiler.trace_left} frames", x, y, size=14, color=(255, 120, 120, 255))
+            y += 18
+        elif Profiler.last_trace_path:
+            draw_text(f"Trace: {Profiler.last_trace_path}", x, y, size=14, color=(180, 180, 180, 255))
+            y += 18
+        draw_text(f"{'escopo':<20}{'p50':>7}{'p95':>7}{'max':>7}", x, y, size=14, color=(255, 255, 0, 255))
+        for name, p50, p95, worst in Profiler.stats()[:20]:
+            y += 16
+            draw_text(f"{name[:20]:<20}{p50 * 1000.0:7.2f}{p95 * 1000.0:7.2f}{worst * 1000.0:7.2f}",
+                      x, y, size=14, color=(220, 220, 220, 255))
+        if Profiler.counts:
+            y += 20
+            for name, value in sorted(Profiler.counts.items()):
+                draw_text(f"{name[:20]:<20}{value:7d}", x, y, size=14, color=(160, 220, 255, 255))
+                y += 16
+
     def _handle_interface_state_changes(self, mx, my, mouse_pressed):
         """Gerencia mudanças de estado baseadas nas interfaces e teclas pressionadas"""
         
@@ -379,6 +470,6 @@ class Game:
             elif action == "quit_game":
                 self.running = False
 
-game = Game()
-
-game.run()
+if __name__ == "__main__":
+    game = Game()
+    game.run()
@@ -0,0 +1,270 @@
+"""
+Modo headless: roda a simulação sem janela nem OpenGL.
+
+Monta o mundo com um cenário nomeado, alimenta o controle do player com
+entradas roteirizadas e executa N ticks de passo fixo, medindo o tempo de
+cada controlador. Deve ser executado a partir da raiz do projeto:
+
+    python -m core.headless --scenario rats --ticks 600
+    python -m core.headless --scenario all
+    python -m core.headless --scenario boss_laser --trace saves/traces/boss.json
+
+Os mesmos cenários servem para benchmarks e para testes de regressão da
+lógica do jogo (nada aqui depende de renderização).
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+import yaml
+
+from core.clock import SimClock
+from core.profiler import Profiler
+from core.pathservice import PathService
+from core.lod import SimLOD
+from core.pool import Pool
+from core.textures import TextureManager
+from core.prototypes import Prototypes
+from core.map import Map
+from core.entity import EControl, PControl, PrjControl
+from core.resources import load_sprite_from_db
+from core import simulation
+from assets.classes.entities import Player, Mob, Projectile
+
+DEFAULT_MAP = 'assets/data/map.json'
+DEFAULT_TILESET = 'assets/images/layers/basic.png'
+
+
+class ScriptedInput:
+    """Substituto do utils.input.Input guiado por roteiro, sem pygame.
+
+    O cenário altera `keys`, `mouse["pos"]` e `mouse["buttons"]` antes de
+    cada tick; `press(nome)` marca um toque (tecla pressionada neste tick).
+    """
+
+    def __init__(self):
+        self.joystick = None
+        self.keys = {"up": False, "down": False, "left": False, "right": False,
+                     "dash": False, "key_1": False, "key_2": False, "inventory": False}
+        self.key_pressed = {}
+        self.key_double_pressed = {}
+        self.mouse = {"pos": (960, 540), "buttons": [False, False, False], "aim_neutral": False}
+
+    def press(self, name):
+        self.key_pressed[name] = True
+
+    def get_key(self, key):
+        return self.keys.get(key, False)
+
+    def get_key_pressed(self, key):
+        return self.key_pressed.get(key, False)
+
+    def get_key_double_pressed(self, key):
+        return self.key_double_pressed.get(key, False)
+
+    def get_mouse_pos(self):
+        return self.mouse["pos"]
+
+    def get_mouse_button(self, button=0):
+        return self.mouse["buttons"][button]
+
+    def clear_edges(self, names):
+        for name in names:
+            self.key_pressed[name] = False
+            self.key_double_pressed[name] = False
+
+
+def make_open_map(width=160, height=160):
+    """Mapa Tiled (JSON) só com chão livre, para quando o mapa do jogo não existe."""
+    conn = sqlite3.connect('assets/data/data.db')
+    rows = conn.execute('SELECT id, col FROM tile').fetchall()
+    conn.close()
+    floor = min(tid for tid, col in rows if tid > 0 and not col)
+    map_data = {
+        "tilewidth": 32, "tileheight": 32, "width": width, "height": height,
+        "layers": [{"id": 1, "name": "floor", "type": "tilelayer", "visible": True,
+                    "width": width, "height": height, "data": [floor] * (width * height)}],
+    }
+    fd, path = tempfile.mkstemp(suffix='.json', prefix='headless_map_')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(map_data, f)
+    return path
+
+
+def load_map(path=None):
+    if path is None:
+        path = DEFAULT_MAP
+    if os.path.exists(path):
+        return Map(path, DEFAULT_TILESET)
+    print(f"[headless] {path} não encontrado; usando mapa aberto sintético.")
+    tmp = make_open_map()
+    try:
+        return Map(tmp, DEFAULT_TILESET)
+    finally:
+        os.remove(tmp)
+
+
+def spawn_player(x, y):
+    player = Player(1, "saves/player.json", load_sprite_from_db(8))
+    player.posx, player.posy = x, y
+    # Nos cenários o player não morre: o objetivo é medir a carga, não o resultado
+    player.stats.maxHp = player.stats.hp = 10 ** 9
+    PControl.add(player)
+    return player
+
+
+def spawn_ring(creature_id, count, cx, cy, r_min, r_max, rng):
+    mobs = []
+    for _ in range(count):
+        angle = rng.uniform(0, 2 * math.pi)
+        r = rng.uniform(r_min, r_max)
+        mob = Mob(0, cx + math.cos(angle) * r, cy + math.sin(angle) * r, creature_id)
+        EControl.add(mob)
+        mobs.append(mob)
+    return mobs
+
+
+# ---------------------------------------------------------------------------
+# Cenários: setup(player, rng) monta o mundo e retorna script(tick, input),
+# chamado antes de cada tick para definir as entradas.
+# ---------------------------------------------------------------------------
+
+def _walk_circle(tick, input, period=240):
+    """Anda em quadrado (direita, baixo, esquerda, cima), trocando a cada period/4 ticks."""
+    side = (tick // (period // 4)) % 4
+    for key in ("up", "down", "left", "right"):
+        input.keys[key] = False
+    input.keys[("right", "down", "left", "up")[side]] = True
+
+
+def scenario_rats(player, rng):
+    """200 ratos (criatura 5) dentro do raio de aggro, player andando e atacando."""
+    spawn_ring(5, 200, player.posx, player.posy, 48, 150, rng)
+
+    def script(tick, input):
+        _walk_circle(tick, input)
+        input.mouse["buttons"][0] = tick % 20 < 2
+        input.mouse["pos"] = (960 + 200 * math.cos(tick / 15.0), 540 + 200 * math.sin(tick / 15.0))
+    return script
+
+
+def scenario_boss_laser(player, rng):
+    """Bombastic (criatura 4) com vida abaixo de 30%: fase do laser e do anel."""
+    boss = Mob(0, player.posx + 200, player.posy - 64, 4)
+    boss.stats.hp = boss.stats.maxHp * 0.25
+    EControl.add(boss)
+
+    def script(tick, input):
+        _walk_circle(tick, input, period=480)
+        # Mantém o chefe vivo e na fase final
+        boss.stats.hp = boss.stats.maxHp * 0.25
+    return script
+
+
+def scenario_bullets(player, rng):
+    """50 orcs e uma saraivada contínua de projéteis do player."""
+    spawn_ring(2, 50, player.posx, player.posy, 200, 600, rng)
+
+    def script(tick, input):
+        _walk_circle(tick, input)
+        for _ in range(8):
+            angle = rng.uniform(0, 2 * math.pi)
+            PrjControl.add(Projectile.pool.acquire(0, player.posx, player.posy, 1, math.cos(angle),
+                                                   math.sin(angle), type_owner="player", id_owner=player.id))
+    return script
+
+
+SCENARIOS = {
+    'rats': scenario_rats,
+    'boss_laser': scenario_boss_laser,
+    'bullets': scenario_bullets,
+}
+
+
+def setup():
+    """Prepara o ambiente sem janela: texturas sem GL, protótipos e relógio."""
+    TextureManager.headless = True
+    with open('saves/config.yaml', 'r') as config:
+        cfg = yaml.safe_load(config) or {}
+    SimClock.configure(cfg.get('simulation', {}))
+    PathService.configure(cfg.get('pathfinding', {}))
+    SimLOD.configure(cfg.get('lod', {}))
+    Pool.configure(cfg.get('pools', {}))
+    Prototypes.preload()
+
+
+def run_scenario(name, ticks, game_map, seed=1, trace=None):
+    """Executa o cenário e retorna (segundos totais, {etapa: segundos}).
+
+    Com `trace`, grava os ticks (etapas, nós de behavior, A*) nesse arquivo
+    no formato Chrome trace.
+    """
+    simulation.reset_world()
+    rng = random.Random(seed)
+    cx = game_map.map_width * game_map.tilewidth / 2
+    cy = game_map.map_height * game_map.tileheight / 2
+    player = spawn_player(cx, cy)
+    script = SCENARIOS[name](player, rng)
+    input = ScriptedInput()
+    dt = SimClock.dt
+    timings = {}
+    if trace:
+        Profiler.reset()
+        Profiler.start_trace(ticks + 1)
+    start = time.perf_counter()
+    for i in range(ticks):
+        script(i, input)
+        simulation.tick(game_map, dt, input, timings)
+        SimClock.step()
+        Profiler.end_frame()
+    elapsed = time.perf_counter() - start
+    if trace:
+        Profiler.stop_trace(trace)
+        Profiler.enabled = False
+    return elapsed, timings
+
+
+def report(name, ticks, elapsed, timings):
+    print(f"\n== {name}: {ticks} ticks em {elapsed:.3f}s -> {ticks / elapsed:.1f} ticks/s "
+          f"({elapsed * 1000.0 / ticks:.3f} ms/tick) ==")
+    print(f"   entidades={len(EControl.Entities)} projéteis={len(PrjControl.Projectiles)} "
+          f"lod(ativas/espaçadas/congeladas)={'/'.join(map(str, SimLOD.counts))}")
+    total = sum(timings.values()) or 1.0
+    for step in simulation.TICK_STEPS:
+        t = timings.get(step, 0.0)
+        print(f"   {step:<14}{t * 1000.0 / ticks:9.3f} ms/tick  {100.0 * t / total:5.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulação headless e benchmark de ticks.")
+    parser.add_argument('--scenario', default='all', choices=sorted(SCENARIOS) + ['all'])
+    parser.add_argument('--ticks', type=int, default=600)
+    parser.add_argument('--map', default=None, help="mapa Tiled (padrão: assets/data/map.json)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--trace', default=None,
+                        help="grava um Chrome trace (JSON) do cenário neste arquivo")
+    args = parser.parse_args(argv)
+
+    setup()
+    game_map = load_map(args.map)
+    names = sorted(SCENARIOS) if args.scenario == 'all' else [args.scenario]
+    for name in names:
+        trace = args.trace
+        if trace and len(names) > 1:
+            root, ext = os.path.splitext(trace)
+            trace = f"{root}_{name}{ext or '.json'}"
+        elapsed, timings = run_scenario(name, args.ticks, game_map, args.seed, trace)
+        report(name, args.ticks, elapsed, timings)
+    simulation.reset_world()
+    PathService.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+import heapq
+from collections import deque
+
+import numpy as np
+
+from core.flowfield import UNREACHABLE
+from core.pathfinding import astar
+
+# Lado (tiles) de cada cluster da grade abstrata
+CLUSTER_SIZE = 16
+# Trechos de borda livres mais curtos que isso viram uma entrada só (no meio);
+# os maiores, uma em cada ponta
+MAX_SINGLE_ENTRANCE = 6
+
+
+def label_components(walkable):
+    """Rotula as regiões 4-conexas de `walkable` (0 = bloqueado, 1.. = componente).
+
+    Trabalha com trechos contínuos de cada linha (union-find entre trechos
+    que se sobrepõem na linha de cima), então o custo em Python é por
+    trecho e não por tile.
+    """
+    h, w = walkable.shape
+    runs = np.zeros((h, w), dtype=np.int32)
+    parent = [0]
+
+    def find(a):
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    padded = np.zeros((h, w + 2), dtype=bool)
+    padded[:, 1:-1] = walkable
+    prev = []
+    for y in range(h):
+        edges = np.flatnonzero(padded[y, 1:] != padded[y, :-1]).tolist()
+        cur = []
+        i = 0
+        for s, e in zip(edges[::2], edges[1::2]):
+            run = len(parent)
+            parent.append(run)
+            runs[y, s:e] = run
+            cur.append((s, e, run))
+            # Trechos da linha de cima que se sobrepõem a [s, e)
+            while i < len(prev) and prev[i][1] <= s:
+                i += 1
+            j = i
+            while j < len(prev) and prev[j][0] < e:
+                ra, rb = find(prev[j][2]), find(run)
+                if ra != rb:
+                    parent[max(ra, rb)] = min(ra, rb)
+                j += 1
+        prev = cur
+    roots = np.array([find(i) for i in range(len(parent))], dtype=np.int32)
+    return roots[runs]
+
+
+class HierarchicalPathfinder:
+    """HPA*: pathfinding em dois níveis sobre a máscara de walkability de um tamanho.
+
+    A grade é dividida em clusters de CLUSTER_SIZE tiles. Em cada borda
+    entre clusters vizinhos, os trechos livres dos dois lados viram
+    entradas (pares de tiles ligados com custo 1); dentro de cada cluster,
+    as entradas são ligadas pela distância BFS entre elas. Uma consulta
+    liga início e fim às entradas dos seus clusters, roda A* nesse grafo
+    pequeno e depois refina cada trecho com A* limitado a um cluster.
+
+    Um índice de componentes conexas responde em O(1) se o destino é
+    alcançável, antes de qualquer busca. Mudanças na NavGrid (nav.dirty)
+    reconstroem só os clusters e bordas afetados.
+    """
+
+    def __init__(self, nav, size=1, cluster_size=CLUSTER_SIZE):
+        self.nav = nav
+        self.size = size
+        self.cs = cluster_size
+        self.cw = -(-nav.width // cluster_size)
+        self.ch = -(-nav.height // cluster_size)
+        self.version = None
+        self.walkable = None
+        self.components = None
+        self.edges = {}          # tile -> {tile vizinho no grafo abstrato: custo}
+        self.cluster_nodes = {}  # (cx, cy) -> {tiles de entrada do cluster}
+        self.border_nodes = {}   # borda -> [(tile, tile), ...] pares de entrada
+        self.node_borders = {}   # tile -> {bordas que usam o tile}
+
+    # --- Construção ---
+
+    def refresh(self):
+        """Atualiza a estrutura se a NavGrid mudou desde a última consulta."""
+        nav = self.nav
+        if self.version == nav.version:
+            return
+        self.walkable = nav.walkable_mask(self.size)
+        self.components = label_components(self.walkable)
+        changes = [entry for entry in nav.dirty if self.version is not None and entry[0] > self.version]
+        if not changes or changes[0][0] != self.version + 1:
+            self._build_all()
+        else:
+            pad = self.size - 1  # a máscara de tamanho k depende dos k-1 tiles abaixo/à direita
+            for _, y0, y1, x0, x1 in changes:
+                self._update_region(max(x0 - pad, 0), max(y0 - pad, 0), x1, y1)
+        self.version = nav.version
+
+    def _build_all(self):
+        self.edges = {}
+        self.cluster_nodes = {}
+        self.border_nodes = {}
+        self.node_borders = {}
+        for border in self._all_borders():
+            self._build_border(border)
+        for cy in range(self.ch):
+            for cx in range(self.cw):
+                self._build_intra((cx, cy))
+
+    def _all_borders(self):
+        for cy in range(self.ch):
+            for cx in range(self.cw):
+                if cx + 1 < self.cw:
+                    yield (cx, cy, 'v')
+                if cy + 1 < self.ch:
+                    yield (cx, cy, 'h')
+
+    def _cluster_borders(self, cx, cy):
+        """Bordas (chave) de um cluster: 'v' liga (cx, cy) a (cx+1, cy); 'h' a (cx, cy+1)."""
+        if cx + 1 < self.cw:
+            yield (cx, cy, 'v')
+        if cy + 1 < self.ch:
+            yield (cx, cy, 'h')
+        if cx > 0:
+            yield (cx - 1, cy, 'v')
+        if cy > 0:
+            yield (cx, cy - 1, 'h')
+
+    def _update_region(self, x0, y0, x1, y1):
+        """Reconstrói as bordas e ligações internas que dependem dos tiles [x0, x1) x [y0, y1)."""
+        cs = self.cs
+        clusters = {(cx, cy)
+                    for cy in range(y0 // cs, min((y1 - 1) // cs, self.ch - 1) + 1)
+                    for cx in range(x0 // cs, min((x1 - 1) // cs, self.cw - 1) + 1)}
+        borders = {b for c in clusters for b in self._cluster_borders(*c)}
+        touched = set(clusters)
+        for cx, cy, kind in borders:
+            touched.add((cx, cy))
+            touched.add((cx + 1, cy) if kind == 'v' else (cx, cy + 1))
+        for cluster in touched:
+            self._drop_intra(cluster)
+        for border in borders:
+            self._drop_border(border)
+            self._build_border(border)
+        for cluster in touched:
+            self._build_intra(cluster)
+
+    def _cluster_of(self, tile):
+        return tile[0] // self.cs, tile[1] // self.cs
+
+    def _bounds(self, cluster):
+        cs = self.cs
+        x0, y0 = cluster[0] * cs, cluster[1] * cs
+        return x0, y0, min(x0 + cs, self.nav.width), min(y0 + cs, self.nav.height)
+
+    def _add_node(self, tile, border):
+        self.edges.setdefault(tile, {})
+        self.cluster_nodes.setdefault(self._cluster_of(tile), set()).add(tile)
+        self.node_borders.setdefault(tile, set()).add(border)
+
+    def _build_border(self, border):
+        cx, cy, kind = border
+        x0, y0, x1, y1 = self._bounds((cx, cy))
+        walk = self.walkable
+        if kind == 'v':
+            # Coluna x1-1 do cluster da esquerda com a coluna x1 do da direita
+            open_ = walk[y0:y1, x1 - 1] & walk[y0:y1, x1]
+            pair = lambda i: ((x1 - 1, y0 + i), (x1, y0 + i))
+        else:
+            open_ = walk[y1 - 1, x0:x1] & walk[y1, x0:x1]
+            pair = lambda i: ((x0 + i, y1 - 1), (x0 + i, y1))
+        pairs = []
+        padded = np.concatenate(([False], open_, [False]))
+        edges = np.flatnonzero(padded[1:] != padded[:-1])
+        for s, e in zip(edges[::2], edges[1::2]):
+            s, e = int(s), int(e)
+            if e - s < MAX_SINGLE_ENTRANCE:
+                pairs.append(pair((s + e - 1) // 2))
+            else:
+                pairs.append(pair(s))
+                pairs.append(pair(e - 1))
+        self.border_nodes[border] = pairs
+        for a, b in pairs:
+            self._add_node(a, border)
+            self._add_node(b, border)
+            self.edges[a][b] = 1
+            self.edges[b][a] = 1
+
+    def _drop_border(self, border):
+        for a, b in self.border_nodes.pop(border, ()):
+            for node, other in ((a, b), (b, a)):
+                self.edges.get(node, {}).pop(other, None)
+                users = self.node_borders.get(node)
+                if users is not None:
+                    users.discard(border)
+                    if not users:
+                        del self.node_borders[node]
+                        self.edges.pop(node, None)
+                        self.cluster_nodes.get(self._cluster_of(node), set()).discard(node)
+
+    def _drop_intra(self, cluster):
+        nodes = self.cluster_nodes.get(cluster, ())
+        for node in nodes:
+            edges = self.edges.get(node)
+            if edges:
+                for other in nodes:
+                    edges.pop(other, None)
+
+    def _cluster_distances(self, cluster, source, targets):
+        """Distâncias (BFS restrita ao cluster) de `source` até cada tile de `targets` alcançável."""
+        x0, y0, x1, y1 = self._bounds(cluster)
+        walk = self.walkable
+        remaining = set(targets)
+        found = {}
+        dist = {source: 0}
+        queue = deque([source])
+        while queue and remaining:
+            tile = queue.popleft()
+            d = dist[tile]
+            if tile in remaining:
+                remaining.discard(tile)
+                found[tile] = d
+            x, y = tile
+            for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if x0 <= nx < x1 and y0 <= ny < y1 and (nx, ny) not in dist and walk[ny, nx]:
+                    dist[(nx, ny)] = d + 1
+                    queue.append((nx, ny))
+        return found
+
+    def _build_intra(self, cluster):
+        nodes = list(self.cluster_nodes.get(cluster, ()))
+        for i, a in enumerate(nodes):
+            for b, d in self._cluster_distances(cluster, a, nodes[i + 1:]).items():
+                self.edges[a][b] = d
+                self.edges[b][a] = d
+
+    # --- Consultas ---
+
+    def _walkable_tile(self, tile):
+        x, y = tile
+        return 0 <= x < self.nav.width and 0 <= y < self.nav.height and self.walkable[y, x]
+
+    def connected(self, start, goal):
+        """True se existe caminho entre os tiles (consulta O(1) no índice de componentes)."""
+        self.refresh()
+        if not self._walkable_tile(start) or not self._walkable_tile(goal):
+            return False
+        return self.components[start[1], start[0]] == self.components[goal[1], goal[0]]
+
+    def _local_path(self, cluster, a, b):
+        x0, y0, x1, y1 = self._bounds(cluster)
+        path = astar(self.walkable[y0:y1, x0:x1], (a[0] - x0, a[1] - y0), (b[0] - x0, b[1] - y0),
+                     (x1 - x0) * (y1 - y0) + 1)
+        if path is None:
+            return None
+        return [(x + x0, y + y0) for x, y in path]
+
+    def _links(self, cluster, tile):
+        """Custo de `tile` até cada entrada do seu cluster."""
+        return self._cluster_distances(cluster, tile, self.cluster_nodes.get(cluster, ()))
+
+    def find_path(self, start, goal):
+        """Caminho em tiles [(x, y), ...] de start até goal, ou None."""
+        start = (int(start[0]), int(start[1]))
+        goal = (int(goal[0]), int(goal[1]))
+        if not self.connected(start, goal):
+            return None
+        if start == goal:
+            return [start]
+        start_cluster, goal_cluster = self._cluster_of(start), self._cluster_of(goal)
+        if start_cluster == goal_cluster:
+            path = self._local_path(start_cluster, start, goal)
+            if path is not None:
+                return path
+        abstract = self._abstract_search(start, goal, self._links(start_cluster, start),
+                                         self._links(goal_cluster, goal))
+        if abstract is None:
+            return None
+        return self._refine(abstract)
+
+    def _abstract_search(self, start, goal, start_links, goal_links):
+        def h(tile):
+            return abs(tile[0] - goal[0]) + abs(tile[1] - goal[1])
+
+        g = {start: 0}
+        parent = {start: None}
+        heap = [(h(start), 0, start)]
+        counter = 0
+        closed = set()
+        while heap:
+            _, _, node = heapq.heappop(heap)
+            if node == goal:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parent[node]
+                return path[::-1]
+            if node in closed:
+                continue
+            closed.add(node)
+            neighbors = list(self.edges.get(node, {}).items())
+            if node == start:
+                neighbors += start_links.items()
+            if node in goal_links:
+                neighbors.append((goal, goal_links[node]))
+            for other, cost in neighbors:
+                tentative = g[node] + cost
+                if tentative < g.get(other, UNREACHABLE):
+                    g[other] = tentative
+                    parent[other] = node
+                    counter += 1
+                    heapq.heappush(heap, (tentative + h(other), counter, other))
+        return None
+
+    def _refine(self, abstract):
+        path = [abstract[0]]
+        for a, b in zip(abstract, abstract[1:]):
+            if a == b:
+                continue
+            if abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1:
+                path.append(b)
+                continue
+            segment = self._local_path(self._cluster_of(a), a, b)
+            if segment is None:
+                return None
+            path.extend(segment[1:])
+        return path
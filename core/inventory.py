@@ -88,7 +88,7 @@ class Inventory:
             item_x = player.posx + offset_x
             item_y = player.posy + offset_y
             
-            item_entity = ItemEntity(0, item_x, item_y, item)
+            item_entity = ItemEntity.pool.acquire(0, item_x, item_y, item)
             ItControl.add(item_entity)
             
             print(f"Item '{item.name}' dropado ao lado do player em ({item_x}, {item_y})")
@@ -0,0 +1,84 @@
+from core.clock import SimClock
+from core.profiler import Profiler
+
+# Faixas de atividade de uma entidade, pela distância (px) ao jogador mais próximo
+ACTIVE = 0      # tick completo todo tick
+THROTTLED = 1   # tick completo a cada `throttle_interval` ticks; nos outros, só light_run
+FROZEN = 2      # parada; o tempo perdido é compensado ao acordar
+TIER_NAMES = ('active', 'throttled', 'frozen')
+
+# Padrões da seção `lod` do config.yaml
+NEAR_RADIUS = 1200.0
+WAKE_RADIUS = 2400.0
+THROTTLE_INTERVAL = 4
+MAX_CATCH_UP = 1.0
+
+
+class SimLOD:
+    """Nível de detalhe da simulação das entidades (EControl.run).
+
+    Perto de algum jogador (near_radius, cobrindo a tela) a entidade roda
+    todo tick. Até wake_radius roda o tick completo só a cada
+    throttle_interval ticks, escalonado pelo id para espalhar a carga; nos
+    ticks pulados roda só light_run (os acertos de projéteis são
+    aplicados pelo PrjControl em qualquer nível). Além disso
+    fica congelada. O tempo não simulado vai para entity.lod_debt e é
+    entregue como `dt` no próximo tick completo (timers de dano, fumaça),
+    limitado a max_catch_up segundos para o acúmulo de um congelamento
+    longo não virar, por exemplo, um dano de armadilha enorme ao acordar.
+    Os timers de behavior usam SimClock.time e se ajustam sozinhos.
+
+    Sem jogadores (ex.: cenários headless sem player) tudo fica ACTIVE.
+    """
+    enabled = True
+    near_radius = NEAR_RADIUS
+    wake_radius = WAKE_RADIUS
+    throttle_interval = THROTTLE_INTERVAL
+    max_catch_up = MAX_CATCH_UP
+    counts = [0, 0, 0]   # entidades por faixa no último EControl.run
+
+    def configure(config):
+        """Lê a seção `lod` do config.yaml."""
+        config = config or {}
+        SimLOD.enabled = bool(config.get('enabled', True))
+        SimLOD.near_radius = float(config.get('near_radius', NEAR_RADIUS))
+        SimLOD.wake_radius = max(SimLOD.near_radius, float(config.get('wake_radius', WAKE_RADIUS)))
+        SimLOD.throttle_interval = max(1, int(config.get('throttle_interval', THROTTLE_INTERVAL)))
+        SimLOD.max_catch_up = float(config.get('max_catch_up', MAX_CATCH_UP))
+
+    def anchors(players):
+        """Centros dos jogadores, referência das distâncias deste tick."""
+        return [(p.posx + p.sizex * 0.5, p.posy + p.sizey * 0.5) for p in players]
+
+    def tier_of(entity, anchors):
+        if not SimLOD.enabled or not anchors:
+            return ACTIVE
+        cx = entity.posx + entity.sizex * 0.5
+        cy = entity.posy + entity.sizey * 0.5
+        nearest = min((ax - cx) ** 2 + (ay - cy) ** 2 for ax, ay in anchors)
+        if nearest <= SimLOD.near_radius ** 2:
+            return ACTIVE
+        if nearest <= SimLOD.wake_radius ** 2:
+            return THROTTLED
+        return FROZEN
+
+    def step(entity, anchors, dt):
+        """Faixa da entidade neste tick e o `dt` do tick completo (None se ele deve ser pulado)."""
+        tier = SimLOD.tier_of(entity, anchors)
+        SimLOD.counts[tier] += 1
+        entity.lod_debt += dt
+        if tier == FROZEN:
+            return tier, None
+        if tier == THROTTLED and (SimClock.ticks + entity.id) % SimLOD.throttle_interval:
+            return tier, None
+        step = min(entity.lod_debt, max(dt, SimLOD.max_catch_up))
+        entity.lod_debt = 0.0
+        return tier, step
+
+    def begin():
+        SimLOD.counts = [0, 0, 0]
+
+    def report():
+        """Publica as contagens por faixa no Profiler (lod.active, lod.throttled, lod.frozen)."""
+        for name, count in zip(TIER_NAMES, SimLOD.counts):
+            Profiler.gauge('lod.' + name, count)
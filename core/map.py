@@ -2,27 +2,162 @@ import pygame
 import json
 import numpy as np
 import sqlite3
-from OpenGL.GL import *
-
-
-def load_texture(path):
-    image = pygame.image.load(path).convert_alpha()
-    # Inverte verticalmente para o padrão do OpenGL
-    image = pygame.transform.flip(image, False, True)
-    image_data = pygame.image.tostring(image, "RGBA", True)
-    width, height = image.get_size()
-    texture_id = glGenTextures(1)
-    glBindTexture(GL_TEXTURE_2D, texture_id)
-    glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, image_data)
-    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
-    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
-    return texture_id, width, height
+import ctypes
+import math
+from core.textures import TextureManager
+from core.navigation import NavGrid
+from core.flowfield import FlowFields
+
+# Tamanho (em tiles) de cada bloco do mapa que vira um vertex buffer
+CHUNK_SIZE = 32
+
+# Camadas consultadas nas checagens de colisão das entidades (chão e objetos)
+COLLISION_LAYERS = (0, 1)
+
 
 class Layer:
     def __init__(self, id, name):
         self.id = id
         self.name = name
 
+class ChunkRenderer:
+    """Renderizador do mapa baseado em blocos (chunks) com vertex buffers.
+
+    Cada bloco de CHUNK_SIZE x CHUNK_SIZE tiles de cada camada é convertido
+    uma única vez em um VBO com coordenadas de mundo e de textura. No frame,
+    apenas os blocos visíveis são desenhados (um glDrawArrays por bloco), e a
+    câmera/zoom viram uma transformação da matriz de modelview.
+    Um bloco só é reconstruído quando algum tile dele muda (ver Map.set_tile).
+    """
+
+    # Layout intercalado por vértice: u, v, x, y (float32)
+    STRIDE = 4 * 4
+
+    def __init__(self, map_ref, chunk_size=CHUNK_SIZE):
+        self.map = map_ref
+        self.chunk_size = chunk_size
+        self.chunks_x = (map_ref.map_width + chunk_size - 1) // chunk_size
+        self.chunks_y = (map_ref.map_height + chunk_size - 1) // chunk_size
+        # (layer, cx, cy) -> (vbo_id, quantidade de vértices)
+        self._buffers = {}
+        self._dirty = set()
+        # Estatísticas do último frame (usadas pelo benchmark)
+        self.draw_calls = 0
+        self.visible_chunks = 0
+
+    def invalidate_tile(self, layer_index, tile_x, tile_y):
+        """Marca o bloco que contém o tile para ser reconstruído."""
+        self._dirty.add((layer_index, tile_x // self.chunk_size, tile_y // self.chunk_size))
+
+    def invalidate_all(self):
+        self._dirty.update(self._buffers.keys())
+
+    def build_vertices(self, layer_index, cx, cy):
+        """Gera o array (n_tiles * 4, 4) de vértices de um bloco, ou None se vazio."""
+        m = self.map
+        cs = self.chunk_size
+        x0, y0 = cx * cs, cy * cs
+        x1 = min(x0 + cs, m.map_width)
+        y1 = min(y0 + cs, m.map_height)
+        gids = m.matriz[layer_index, y0:y1, x0:x1]
+        ys, xs = np.nonzero(gids)
+        if len(xs) == 0:
+            return None
+
+        tile_ids = gids[ys, xs] - 1
+        tw, th = m.tilewidth, m.tileheight
+        u1 = (tile_ids % m.tileset_cols) * tw / m.tileset_width
+        v1 = (tile_ids // m.tileset_cols) * th / m.tileset_height
+        u2 = u1 + tw / m.tileset_width
+        v2 = v1 + th / m.tileset_height
+        px = (xs + x0) * tw
+        py = (ys + y0) * th
+
+        verts = np.empty((len(xs), 4, 4), dtype=np.float32)
+        verts[:, 0] = np.stack((u1, v1, px, py), axis=1)
+        verts[:, 1] = np.stack((u2, v1, px + tw, py), axis=1)
+        verts[:, 2] = np.stack((u2, v2, px + tw, py + th), axis=1)
+        verts[:, 3] = np.stack((u1, v2, px, py + th), axis=1)
+        return verts.reshape(-1, 4)
+
+    def _upload(self, key):
+        from OpenGL.GL import (
+            glBindBuffer, glBufferData, glDeleteBuffers, glGenBuffers, GL_ARRAY_BUFFER,
+            GL_STATIC_DRAW
+        )
+        old = self._buffers.pop(key, None)
+        if old is not None:
+            glDeleteBuffers(1, [old[0]])
+        verts = self.build_vertices(*key)
+        if verts is None:
+            self._buffers[key] = None
+            return None
+        vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, vbo)
+        glBufferData(GL_ARRAY_BUFFER, verts.nbytes, verts, GL_STATIC_DRAW)
+        self._buffers[key] = (vbo, len(verts))
+        return self._buffers[key]
+
+    def render(self, camera_x, camera_y, zoom, screen_width, screen_height):
+        from OpenGL.GL import (
+            glBindBuffer, glBindTexture, glDisableClientState, glDrawArrays, glEnableClientState,
+            glPopMatrix, glPushMatrix, glScalef, glTexCoordPointer, glTranslatef, glVertexPointer,
+            GL_ARRAY_BUFFER, GL_FLOAT, GL_QUADS, GL_TEXTURE_2D, GL_TEXTURE_COORD_ARRAY,
+            GL_VERTEX_ARRAY
+        )
+        m = self.map
+        cs = self.chunk_size
+        view_w = screen_width / zoom
+        view_h = screen_height / zoom
+        cx0 = max(0, int(camera_x // (m.tilewidth * cs)))
+        cy0 = max(0, int(camera_y // (m.tileheight * cs)))
+        cx1 = min(self.chunks_x - 1, int((camera_x + view_w) // (m.tilewidth * cs)))
+        cy1 = min(self.chunks_y - 1, int((camera_y + view_h) // (m.tileheight * cs)))
+
+        self.draw_calls = 0
+        self.visible_chunks = max(0, cx1 - cx0 + 1) * max(0, cy1 - cy0 + 1)
+
+        glBindTexture(GL_TEXTURE_2D, m.tileset_id)
+        glPushMatrix()
+        glScalef(zoom, zoom, 1.0)
+        glTranslatef(-camera_x, -camera_y, 0.0)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        try:
+            for layer_index, layer in enumerate(m.layers):
+                if not layer["data"].get("visible", True):
+                    continue
+                for cy in range(cy0, cy1 + 1):
+                    for cx in range(cx0, cx1 + 1):
+                        key = (layer_index, cx, cy)
+                        if key in self._dirty or key not in self._buffers:
+                            self._dirty.discard(key)
+                            buf = self._upload(key)
+                        else:
+                            buf = self._buffers[key]
+                        if buf is None:
+                            continue
+                        vbo, count = buf
+                        glBindBuffer(GL_ARRAY_BUFFER, vbo)
+                        glTexCoordPointer(2, GL_FLOAT, self.STRIDE, ctypes.c_void_p(0))
+                        glVertexPointer(2, GL_FLOAT, self.STRIDE, ctypes.c_void_p(8))
+                        glDrawArrays(GL_QUADS, 0, count)
+                        self.draw_calls += 1
+        finally:
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
+            glPopMatrix()
+
+    def close(self):
+        ids = [buf[0] for buf in self._buffers.values() if buf is not None]
+        if ids:
+            from OpenGL.GL import glDeleteBuffers
+            glDeleteBuffers(len(ids), ids)
+        self._buffers.clear()
+        self._dirty.clear()
+
+
 class Map:
     def __init__(self, filename, tileset_img):
         with open(filename) as f:
@@ -34,7 +169,8 @@ class Map:
         self.map_height = self.map_data["height"]
         
         # Carrega o tileset como textura OpenGL
-        self.tileset_id, self.tileset_width, self.tileset_height = load_texture(tileset_img)
+        self.tileset_img = tileset_img
+        self.tileset_id, self.tileset_width, self.tileset_height = TextureManager.acquire(tileset_img)
         self.tileset_cols = self.tileset_width // self.tilewidth
         
         # Processa as camadas do mapa
@@ -59,31 +195,93 @@ class Map:
         cursor.execute("SELECT * FROM tile")
         self.col = {row[0]: row[2] for row in cursor.fetchall()}
         conn.close()
+
+        # Grade de classes de colisão por tile (pré-calculada para consultas por região)
+        self.build_collision_grid()
+        # Clearance por tile para o pathfinding (walkability por tamanho de entidade)
+        self.nav = NavGrid(self)
+        # Campos de fluxo até os players, compartilhados pelos mobs em perseguição
+        self.flow = FlowFields(self.nav)
+
+        # Renderizador em blocos (VBOs criados sob demanda no primeiro render)
+        self.chunk_renderer = ChunkRenderer(self)
     
+    def build_collision_grid(self):
+        """Converte os IDs de tile em classes de colisão (coluna `col` da tabela tile).
+
+        - self.col_layers[layer, y, x]: classe de cada tile em cada camada (0 = sem colisão)
+        - self.col_classes[c]: máscara 2D (y, x) com True onde alguma das
+          COLLISION_LAYERS possui um tile de classe c
+        """
+        max_id = int(self.matriz.max()) if self.matriz.size else 0
+        if self.col:
+            max_id = max(max_id, max(self.col))
+        lut = np.zeros(max_id + 1, dtype=np.int8)
+        for tile_id, col in self.col.items():
+            if col and tile_id >= 0:
+                lut[tile_id] = col
+        self._col_lut = lut
+        self.col_layers = lut[self.matriz]
+        self._refresh_col_classes()
+
+    def _refresh_col_classes(self, y0=0, y1=None, x0=0, x1=None):
+        layers = [i for i in COLLISION_LAYERS if i < len(self.layers)]
+        sub = self.col_layers[layers, y0:y1, x0:x1]
+        if not hasattr(self, "col_classes"):
+            self.col_classes = {}
+        for c in set(np.unique(sub).tolist()) | set(self.col_classes):
+            if not c:
+                continue
+            mask = self.col_classes.get(c)
+            if mask is None:
+                mask = np.zeros((self.map_height, self.map_width), dtype=bool)
+                self.col_classes[c] = mask
+            mask[y0:y1, x0:x1] = np.any(sub == c, axis=0)
+
     def get_collision_matrix(self):
         """Retorna uma matriz 2D (lista de listas) com 0=livre e 1=bloqueado.
         Um tile é considerado bloqueado se QUALQUER camada possuir um tile com
         colisão (segundo o dicionário self.col).
         """
-        rows = int(self.map_height)
-        cols = int(self.map_width)
-        matrix = [[0 for _ in range(cols)] for _ in range(rows)]
-        try:
-            total_layers = len(self.layers)
-            for y in range(rows):
-                for x in range(cols):
-                    blocked = 0
-                    for li in range(total_layers):
-                        tile_gid = int(self.matriz[li, y, x])
-                        if self.col.get(tile_gid):
-                            blocked = 1
-                            break
-                    matrix[y][x] = blocked
-        except Exception:
-            # Em caso de erro, retorna tudo caminhável (evita crash)
-            pass
-        return matrix
-    
+        return np.any(self.col_layers != 0, axis=0).astype(int).tolist()
+
+    def _tile_span(self, x, y, w, h):
+        """Faixa de tiles (inclusiva) coberta pelos pixels [x, x+w) x [y, y+h)."""
+        tx0 = int(math.floor(x / self.tilewidth))
+        ty0 = int(math.floor(y / self.tileheight))
+        tx1 = int(math.floor((x + w - 1) / self.tilewidth))
+        ty1 = int(math.floor((y + h - 1) / self.tileheight))
+        return tx0, ty0, tx1, ty1
+
+    def has_col_in_rect(self, x, y, w, h, classes):
+        """True se algum tile sob o retângulo de pixels tiver classe em `classes`.
+        Tiles fora do mapa são ignorados (mesmo comportamento de check_col)."""
+        if w <= 0 or h <= 0:
+            return False
+        tx0, ty0, tx1, ty1 = self._tile_span(x, y, w, h)
+        tx0, ty0 = max(tx0, 0), max(ty0, 0)
+        tx1, ty1 = min(tx1, self.map_width - 1), min(ty1, self.map_height - 1)
+        if tx0 > tx1 or ty0 > ty1:
+            return False
+        for c in classes:
+            mask = self.col_classes.get(c)
+            if mask is not None and mask[ty0:ty1 + 1, tx0:tx1 + 1].any():
+                return True
+        return False
+
+    def all_col_in_rect(self, x, y, w, h, col):
+        """True se TODOS os tiles sob o retângulo de pixels tiverem a classe `col`
+        em alguma das camadas de colisão. Qualquer parte fora do mapa resulta em False."""
+        if w <= 0 or h <= 0:
+            return True
+        tx0, ty0, tx1, ty1 = self._tile_span(x, y, w, h)
+        if tx0 < 0 or ty0 < 0 or tx1 >= self.map_width or ty1 >= self.map_height:
+            return False
+        mask = self.col_classes.get(col)
+        if mask is None:
+            return False
+        return bool(mask[ty0:ty1 + 1, tx0:tx1 + 1].all())
+
     def check_col(self, x, y, layer):
         tile_x = x // self.tilewidth
         tile_y = y // self.tileheight
@@ -93,7 +291,28 @@ class Map:
             return self.col.get(tile_id)
         return None
     
+    def set_tile(self, layer, tile_x, tile_y, gid):
+        """Altera um tile do mapa e invalida o bloco correspondente do renderizador."""
+        self.matriz[layer, tile_y, tile_x] = gid
+        self.layers[layer]["data"]["data"][tile_y * self.map_width + tile_x] = gid
+        self.col_layers[layer, tile_y, tile_x] = self.col.get(gid) or 0
+        self._refresh_col_classes(tile_y, tile_y + 1, tile_x, tile_x + 1)
+        self.nav.invalidate_tiles(tile_x, tile_y, tile_x, tile_y)
+        self.chunk_renderer.invalidate_tile(layer, tile_x, tile_y)
+
     def render(self, camera_x=0, camera_y=0, zoom=1.0, player=None, screen_width =1920,screen_height = 1080):
+        zoom = max(0.1, zoom)
+        if player:
+            camera_x = player.posx - (screen_width / zoom) / 2
+            camera_y = player.posy - (screen_height / zoom) / 2
+        self.chunk_renderer.render(camera_x, camera_y, zoom, screen_width, screen_height)
+
+    def render_immediate(self, camera_x=0, camera_y=0, zoom=1.0, player=None, screen_width =1920,screen_height = 1080):
+        """Caminho antigo em modo imediato (um glVertex por canto de tile).
+        Mantido para comparação no benchmark (tools/bench_map_render.py)."""
+        from OpenGL.GL import (
+            glBegin, glBindTexture, glEnd, glTexCoord2f, glVertex2f, GL_QUADS, GL_TEXTURE_2D
+        )
         zoom = max(0.1, zoom)
         # Definindo uma área visível (aqui os valores de tela estão "hard-coded", mas podem ser parametrizados)
         
@@ -143,4 +362,5 @@ class Map:
         glEnd()
     
     def close(self):
-        glDeleteTextures([self.tileset_id])
+        self.chunk_renderer.close()
+        TextureManager.release(self.tileset_img)
@@ -0,0 +1,164 @@
+import math
+from collections import deque
+
+import numpy as np
+
+# Classes de colisão que bloqueiam a navegação (parede, abismo, trap)
+BLOCKING_CLASSES = (1, 2, 3)
+# Maior lado (em tiles) guardado na grade de clearance; entidades maiores
+# usam uma máscara calculada sob demanda
+MAX_CLEARANCE = 4
+# Quantas mudanças recentes ficam registradas em NavGrid.dirty
+DIRTY_LOG = 64
+
+
+class NavGrid:
+    """Grade de navegação do mapa, por tile.
+
+    - blocked[y, x]: tile com colisão em BLOCKING_CLASSES (dados do Map)
+    - blockers[y, x]: quantos obstáculos dinâmicos (breakables) cobrem o tile
+    - clearance[y, x]: lado do maior quadrado livre (até MAX_CLEARANCE) com
+      canto superior esquerdo no tile, ou seja, o maior tamanho de entidade
+      (em tiles) que cabe parado ali
+
+    Uma entidade de k x k tiles (size_class) pode ocupar o tile se
+    clearance >= k: a checagem de walkability vira uma leitura de array.
+    Tiles fora do mapa contam como livres, como em Map.has_col_in_rect.
+    Mudanças de tile (Map.set_tile) e de breakables (sync_blockers)
+    recalculam só a janela afetada e incrementam `version`.
+    """
+
+    def __init__(self, game_map, max_clearance=MAX_CLEARANCE):
+        self.map = game_map
+        self.width = game_map.map_width
+        self.height = game_map.map_height
+        self.tilewidth = game_map.tilewidth
+        self.tileheight = game_map.tileheight
+        self.max_clearance = max_clearance
+        self.blockers = np.zeros((self.height, self.width), dtype=np.int16)
+        self.clearance = np.zeros((self.height, self.width), dtype=np.uint8)
+        self._masks = {}         # size_class -> máscara bool de tiles ocupáveis
+        self._blocker_spans = {}  # id do obstáculo -> (tx0, ty0, tx1, ty1)
+        self._hierarchies = {}    # size_class -> HierarchicalPathfinder
+        # (versão, y0, y1, x0, x1) de cada recálculo, para quem atualiza estruturas derivadas
+        self.dirty = deque(maxlen=DIRTY_LOG)
+        self.version = 0
+        self.rebuild()
+
+    def size_class(self, sizex, sizey):
+        """Quantos tiles (lado do quadrado) uma hitbox alinhada ao tile ocupa."""
+        return max(1, math.ceil(sizex / self.tilewidth), math.ceil(sizey / self.tileheight))
+
+    def _static_blocked(self, y0, y1, x0, x1):
+        blocked = np.zeros((y1 - y0, x1 - x0), dtype=bool)
+        for c in BLOCKING_CLASSES:
+            mask = self.map.col_classes.get(c)
+            if mask is not None:
+                blocked |= mask[y0:y1, x0:x1]
+        return blocked
+
+    def rebuild(self):
+        """Recalcula a grade inteira."""
+        self._update(0, self.height, 0, self.width)
+        self._masks.clear()
+
+    def invalidate_tiles(self, tx0, ty0, tx1, ty1):
+        """Recalcula após mudança nos tiles [tx0..tx1] x [ty0..ty1] (inclusivo)."""
+        k = self.max_clearance
+        y0, y1 = max(ty0 - k + 1, 0), min(ty1 + 1, self.height)
+        x0, x1 = max(tx0 - k + 1, 0), min(tx1 + 1, self.width)
+        if y0 >= y1 or x0 >= x1:
+            return
+        self._update(y0, y1, x0, x1)
+
+    def _update(self, y0, y1, x0, x1):
+        # O clearance de um tile depende dos k-1 tiles abaixo/à direita
+        k = self.max_clearance
+        ey1, ex1 = min(y1 + k - 1, self.height), min(x1 + k - 1, self.width)
+        free = np.ones((y1 - y0 + k - 1, x1 - x0 + k - 1), dtype=bool)
+        free[:ey1 - y0, :ex1 - x0] = ~(self._static_blocked(y0, ey1, x0, ex1)
+                                       | (self.blockers[y0:ey1, x0:ex1] > 0))
+        h, w = y1 - y0, x1 - x0
+        clearance = np.zeros((h, w), dtype=np.uint8)
+        # free passa a ser "quadrado (n+1) x (n+1) livre" a cada iteração
+        for n in range(k):
+            clearance += free[:h, :w]
+            if n + 1 < k:
+                free = free[:-1, :-1] & free[1:, :-1] & free[:-1, 1:] & free[1:, 1:]
+        self.clearance[y0:y1, x0:x1] = clearance
+        for size, mask in list(self._masks.items()):
+            if size <= k:
+                mask[y0:y1, x0:x1] = clearance >= size
+            else:
+                del self._masks[size]
+        self.version += 1
+        self.dirty.append((self.version, y0, y1, x0, x1))
+
+    def walkable_mask(self, size):
+        """Máscara bool (y, x) dos tiles que uma entidade de `size` tiles pode ocupar."""
+        mask = self._masks.get(size)
+        if mask is None:
+            if size <= self.max_clearance:
+                mask = self.clearance >= size
+            else:
+                free = np.ones((self.height + size - 1, self.width + size - 1), dtype=bool)
+                free[:self.height, :self.width] = ~(self._static_blocked(0, self.height, 0, self.width)
+                                                     | (self.blockers > 0))
+                mask = np.ones((self.height, self.width), dtype=bool)
+                for dy in range(size):
+                    for dx in range(size):
+                        mask &= free[dy:dy + self.height, dx:dx + self.width]
+            self._masks[size] = mask
+        return mask
+
+    def hierarchy(self, size=1):
+        """Pathfinder hierárquico (HPA*) para entidades de `size` tiles."""
+        hpa = self._hierarchies.get(size)
+        if hpa is None:
+            from core.hpa import HierarchicalPathfinder
+            hpa = self._hierarchies[size] = HierarchicalPathfinder(self, size)
+        return hpa
+
+    def is_walkable(self, tx, ty, size=1):
+        if tx < 0 or ty < 0 or tx >= self.width or ty >= self.height:
+            return False
+        if size <= self.max_clearance:
+            return self.clearance[ty, tx] >= size
+        return bool(self.walkable_mask(size)[ty, tx])
+
+    # --- Obstáculos dinâmicos (breakables) ---
+
+    def _tile_span(self, obj):
+        tx0 = int(obj.posx // self.tilewidth)
+        ty0 = int(obj.posy // self.tileheight)
+        tx1 = int((obj.posx + max(obj.sizex, 1) - 1) // self.tilewidth)
+        ty1 = int((obj.posy + max(obj.sizey, 1) - 1) // self.tileheight)
+        return (max(tx0, 0), max(ty0, 0), min(tx1, self.width - 1), min(ty1, self.height - 1))
+
+    def _apply_span(self, span, delta):
+        tx0, ty0, tx1, ty1 = span
+        if tx0 > tx1 or ty0 > ty1:
+            return
+        self.blockers[ty0:ty1 + 1, tx0:tx1 + 1] += delta
+        self.invalidate_tiles(tx0, ty0, tx1, ty1)
+
+    def sync_blockers(self, objects):
+        """Atualiza os obstáculos dinâmicos a partir dos objetos atuais (com id/posx/posy/sizex/sizey).
+
+        Só os que entraram, saíram ou mudaram de tile causam recálculo.
+        """
+        spans = self._blocker_spans
+        seen = set()
+        for obj in objects:
+            seen.add(obj.id)
+            span = self._tile_span(obj)
+            old = spans.get(obj.id)
+            if old == span:
+                continue
+            if old is not None:
+                self._apply_span(old, -1)
+            self._apply_span(span, 1)
+            spans[obj.id] = span
+        if len(seen) != len(spans):
+            for obj_id in [i for i in spans if i not in seen]:
+                self._apply_span(spans.pop(obj_id), -1)
@@ -0,0 +1,328 @@
+import heapq
+import math
+
+import numpy as np
+
+# Limite de nós expandidos por busca
+MAX_ITERATIONS = 500
+
+# Direções: direita, esquerda, baixo, cima
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+# Diagonais, usadas com diagonal=True
+DIAGONALS = ((1, 1), (-1, 1), (1, -1), (-1, -1))
+
+SQRT2 = math.sqrt(2)
+
+
+def _octile(dx, dy):
+    dx, dy = abs(dx), abs(dy)
+    return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+
+
+def _prepare(walkable, start, goal):
+    """Grade achatada (bytes, 1 = livre) e índices de start/goal; None se o objetivo é inválido."""
+    height, width = walkable.shape
+    start = (int(start[0]), int(start[1]))
+    goal = (int(goal[0]), int(goal[1]))
+    if not (0 <= goal[0] < width and 0 <= goal[1] < height) or not walkable[goal[1], goal[0]]:
+        return None
+    if not (0 <= start[0] < width and 0 <= start[1] < height):
+        return None
+    cells = np.ascontiguousarray(walkable, dtype=bool).tobytes()
+    return cells, width, height, start, goal
+
+
+def _walk_back(parent, index, width):
+    """Reconstrói o caminho (tiles) seguindo os ponteiros de pai até a origem (pai -1)."""
+    return [(i % width, i // width) for i in _chain(parent, index)]
+
+
+def astar(walkable, start, goal, max_iterations=MAX_ITERATIONS, diagonal=False, cut_corners=False):
+    """A* em tiles sobre uma máscara bool `walkable[y, x]` (ver NavGrid.walkable_mask).
+
+    Não depende de Map nem de entidades, para poder rodar em outro processo
+    sobre uma cópia da grade (core/pathservice.py).
+
+    Cada tile guarda só o custo e o índice do pai (listas planas do tamanho
+    da grade); o caminho é montado uma vez, no fim. Com `diagonal`, os
+    passos diagonais custam sqrt(2) e só são aceitos com os dois vizinhos
+    ortogonais livres; `cut_corners` relaxa para pelo menos um livre (nunca
+    passa espremido entre duas paredes na diagonal).
+
+    Returns:
+        Lista de tiles [(x, y), ...] de start até goal, ou None se não houver caminho
+    """
+    prepared = _prepare(walkable, start, goal)
+    if prepared is None:
+        return None
+    cells, width, height, start, goal = prepared
+    gx, gy = goal
+    source = start[1] * width + start[0]
+    target = gy * width + gx
+
+    steps = [(dx, dy, dy * width + dx, 1.0) for dx, dy in DIRECTIONS]
+    if diagonal:
+        steps += [(dx, dy, dy * width + dx, SQRT2) for dx, dy in DIAGONALS]
+        heuristic = _octile
+    else:
+        def heuristic(dx, dy):
+            return abs(dx) + abs(dy)
+
+    inf = float('inf')
+    g_score = [inf] * (width * height)
+    parent = [-1] * (width * height)
+    closed = bytearray(width * height)
+    g_score[source] = 0.0
+
+    # Heap de prioridade: (f_score, -g_score, índice); desempata pelo nó mais avançado
+    open_heap = [(heuristic(start[0] - gx, start[1] - gy), 0.0, source)]
+    iterations = 0
+    while open_heap and iterations < max_iterations:
+        iterations += 1
+        _, _, current = heapq.heappop(open_heap)
+        if current == target:
+            return _walk_back(parent, current, width)
+        if closed[current]:
+            continue
+        closed[current] = 1
+        cx, cy = current % width, current // width
+        base = g_score[current]
+
+        for dx, dy, offset, cost in steps:
+            nx, ny = cx + dx, cy + dy
+            if not (0 <= nx < width and 0 <= ny < height):
+                continue
+            neighbor = current + offset
+            if not cells[neighbor] or closed[neighbor]:
+                continue
+            if dx and dy:
+                # Quina: os ortogonais (cx+dx, cy) e (cx, cy+dy)
+                side_x, side_y = cells[current + dx], cells[current + dy * width]
+                if not (side_x or side_y) or not (cut_corners or (side_x and side_y)):
+                    continue
+            tentative = base + cost
+            if tentative < g_score[neighbor]:
+                g_score[neighbor] = tentative
+                parent[neighbor] = current
+                heapq.heappush(open_heap, (tentative + heuristic(nx - gx, ny - gy), -tentative, neighbor))
+
+    # Não encontrou caminho
+    return None
+
+
+def jps(walkable, start, goal, max_iterations=MAX_ITERATIONS):
+    """Jump Point Search: mesmo resultado de astar(..., diagonal=True), expandindo menos nós.
+
+    Em áreas abertas, as linhas retas e diagonais são "puladas" até um
+    tile com vizinho forçado (quina de parede) ou até o objetivo, e só
+    esses pontos entram no heap. Segue a regra de quinas do astar padrão
+    (diagonal só com os dois ortogonais livres). O caminho devolvido é
+    completo, tile a tile.
+    """
+    prepared = _prepare(walkable, start, goal)
+    if prepared is None:
+        return None
+    _, width, height, start, goal = prepared
+    # Grade com uma borda bloqueada: dispensa checar limites nos pulos
+    stride = width + 2
+    padded = np.zeros((height + 2, stride), dtype=bool)
+    padded[1:-1, 1:-1] = walkable
+    cells = padded.tobytes()
+    gx, gy = goal
+    target = (gy + 1) * stride + gx + 1
+
+    def jump_straight(i, step, side):
+        """Anda de i em linha reta (step) até um jump point; `side` é o passo perpendicular."""
+        while cells[i]:
+            if i == target:
+                return i
+            # Vizinho forçado: lado livre cujo tile de trás (contra o passo) é parede
+            if (cells[i - side] and not cells[i - side - step]) or (cells[i + side] and not cells[i + side - step]):
+                return i
+            i += step
+        return None
+
+    def jump(i, dx, dy):
+        if not dy:
+            return jump_straight(i, dx, stride)
+        if not dx:
+            return jump_straight(i, dy * stride, 1)
+        step_y = dy * stride
+        while cells[i]:
+            if i == target:
+                return i
+            # Na diagonal, para onde um dos ramos retos encontra um jump point
+            if jump_straight(i + dx, dx, stride) is not None or jump_straight(i + step_y, step_y, 1) is not None:
+                return i
+            if not (cells[i + dx] and cells[i + step_y]):
+                return None
+            i += dx + step_y
+        return None
+
+    def neighbors(i, dx, dy):
+        free = cells
+        if not (dx or dy):
+            dirs = [(ddx, ddy) for ddx, ddy in DIRECTIONS if free[i + ddx + ddy * stride]]
+            dirs += [(ddx, ddy) for ddx, ddy in DIAGONALS
+                     if free[i + ddx] and free[i + ddy * stride] and free[i + ddx + ddy * stride]]
+            return dirs
+        dirs = []
+        if dx and dy:
+            side_y, side_x = free[i + dy * stride], free[i + dx]
+            if side_y:
+                dirs.append((0, dy))
+            if side_x:
+                dirs.append((dx, 0))
+            if side_x and side_y:
+                dirs.append((dx, dy))
+        elif dx:
+            ahead, down, up = free[i + dx], free[i + stride], free[i - stride]
+            if ahead:
+                dirs.append((dx, 0))
+                if down:
+                    dirs.append((dx, 1))
+                if up:
+                    dirs.append((dx, -1))
+            if down:
+                dirs.append((0, 1))
+            if up:
+                dirs.append((0, -1))
+        else:
+            ahead, right, left = free[i + dy * stride], free[i + 1], free[i - 1]
+            if ahead:
+                dirs.append((0, dy))
+                if right:
+                    dirs.append((1, dy))
+                if left:
+                    dirs.append((-1, dy))
+            if right:
+                dirs.append((1, 0))
+            if left:
+                dirs.append((-1, 0))
+        return dirs
+
+    source = (start[1] + 1) * stride + start[0] + 1
+    g_score = {source: 0.0}
+    parent = {source: -1}
+    closed = set()
+    open_heap = [(_octile(start[0] - gx, start[1] - gy), 0.0, source)]
+    iterations = 0
+    while open_heap and iterations < max_iterations:
+        iterations += 1
+        _, _, node = heapq.heappop(open_heap)
+        if node == target:
+            points = [(p % stride - 1, p // stride - 1) for p in _chain(parent, node)]
+            return _expand(points)
+        if node in closed:
+            continue
+        closed.add(node)
+        x, y = node % stride, node // stride
+        prev = parent[node]
+        if prev == -1:
+            pdx = pdy = 0
+        else:
+            px, py = prev % stride, prev // stride
+            pdx, pdy = (x > px) - (x < px), (y > py) - (y < py)
+        for dx, dy in neighbors(node, pdx, pdy):
+            point = jump(node + dx + dy * stride, dx, dy)
+            if point is None or point in closed:
+                continue
+            jx, jy = point % stride, point // stride
+            tentative = g_score[node] + _octile(jx - x, jy - y)
+            if tentative < g_score.get(point, float('inf')):
+                g_score[point] = tentative
+                parent[point] = node
+                heapq.heappush(open_heap, (tentative + _octile(jx - 1 - gx, jy - 1 - gy), -tentative, point))
+    return None
+
+
+def _chain(parent, index):
+    chain = []
+    while index != -1:
+        chain.append(index)
+        index = parent[index]
+    chain.reverse()
+    return chain
+
+
+def _expand(points):
+    """Liga jump points consecutivos tile a tile (trechos são retas ou diagonais puras)."""
+    path = [points[0]]
+    for (x1, y1) in points[1:]:
+        x, y = path[-1]
+        dx = (x1 > x) - (x1 < x)
+        dy = (y1 > y) - (y1 < y)
+        while (x, y) != (x1, y1):
+            # Trecho diagonal seguido de reto: a diagonal acaba quando um eixo chega
+            if x == x1:
+                dx = 0
+            if y == y1:
+                dy = 0
+            x += dx
+            y += dy
+            path.append((x, y))
+    return path
+
+
+def line_of_sight(walkable, a, b):
+    """Se uma entidade ancorada em `walkable` anda em linha reta de a até b sem bater.
+
+    Uma hitbox do tamanho da máscara, no ponto real p da reta, cobre as
+    âncoras floor(p) e ceil(p) de cada eixo; todas precisam estar livres.
+    Elas só mudam quando a reta cruza uma linha inteira da grade, então
+    basta checar o meio de cada trecho entre cruzamentos (aritmética
+    inteira, sem erro de arredondamento).
+    """
+    height, width = walkable.shape
+    ax, ay = a
+    bx, by = b
+    dx, dy = bx - ax, by - ay
+    adx, ady = abs(dx), abs(dy)
+    # Parâmetro t da reta em unidades de 1/denom; cruzamentos em x a cada ady, em y a cada adx
+    denom = max(adx, 1) * max(ady, 1)
+    cuts = {0, denom}
+    if adx:
+        cuts.update(range(0, denom + 1, denom // adx))
+    if ady:
+        cuts.update(range(0, denom + 1, denom // ady))
+    cuts = sorted(cuts)
+    scale = 2 * denom
+    for t0, t1 in zip(cuts, cuts[1:]):
+        m = t0 + t1  # meio do trecho, em unidades de 1/scale
+        nx, ny = ax * scale + dx * m, ay * scale + dy * m
+        for x in {nx // scale, -(-nx // scale)}:
+            for y in {ny // scale, -(-ny // scale)}:
+                if not (0 <= x < width and 0 <= y < height) or not walkable[y, x]:
+                    return False
+    return True
+
+
+def smooth_path(walkable, path):
+    """Corta os waypoints intermediários que têm linha de visão (string pulling).
+
+    Mantém o primeiro e o último tile; de cada ponto mantido, avança até o
+    tile mais distante do caminho ainda visível em linha reta.
+    """
+    if path is None or len(path) <= 2:
+        return path
+    result = [path[0]]
+    anchor = 0
+    i = 2
+    while i < len(path):
+        if not line_of_sight(walkable, path[anchor], path[i]):
+            anchor = i - 1
+            result.append(path[anchor])
+        i += 1
+    result.append(path[-1])
+    return result
+
+
+def find_path(walkable, start, goal, max_iterations=MAX_ITERATIONS, diagonal=False, smooth=False, jump=False):
+    """Ponto de entrada único: A* (4 ou 8 direções) ou JPS, com suavização opcional."""
+    if jump:
+        path = jps(walkable, start, goal, max_iterations)
+    else:
+        path = astar(walkable, start, goal, max_iterations, diagonal)
+    if smooth:
+        path = smooth_path(walkable, path)
+    return path
@@ -0,0 +1,261 @@
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from core.clock import SimClock
+from core.pathfinding import find_path, smooth_path, MAX_ITERATIONS
+
+# Tempo máximo (ms) gasto em buscas síncronas por chamada de run()
+BUDGET_MS = 2.0
+# Ticks durante os quais um resultado pronto é reaproveitado por pedidos iguais
+RESULT_TTL = 30
+# Buscas em andamento no pool, por processo
+INFLIGHT_PER_WORKER = 4
+# Distância (tiles, Manhattan) até a qual um pedido usa A* direto; acima, HPA*
+LOCAL_RANGE = 24
+
+
+class PathRequest:
+    """Pedido de caminho. `done` fica verdadeiro num tick seguinte ao pedido;
+    `path` é a lista de tiles [(x, y), ...] ou None se não houver caminho."""
+    __slots__ = ('key', 'start', 'goal', 'size', 'version', 'done', 'path', 'finished_tick')
+
+    def __init__(self, key, version):
+        self.key = key
+        self.start, self.goal, self.size = key
+        self.version = version
+        self.done = False
+        self.path = None
+        self.finished_tick = 0
+
+
+# --- Lado do processo de trabalho -------------------------------------------
+
+_attached = {}   # nome do bloco de memória compartilhada -> (SharedMemory, array)
+MAX_ATTACHED = 8
+
+
+def _search_shared(shm_name, shape, start, goal, max_iterations, options):
+    """Executa no processo do pool: find_path sobre a grade em memória compartilhada."""
+    from multiprocessing import shared_memory
+    entry = _attached.get(shm_name)
+    if entry is None:
+        # Grades de versões antigas da navegação deixam de ser usadas
+        while len(_attached) >= MAX_ATTACHED:
+            _attached.pop(next(iter(_attached)))[0].close()
+        shm = shared_memory.SharedMemory(name=shm_name)
+        entry = _attached[shm_name] = (shm, np.ndarray(shape, dtype=bool, buffer=shm.buf))
+    return find_path(entry[1], start, goal, max_iterations, **options)
+
+
+# --- Serviço -------------------------------------------------------------------
+
+class PathService:
+    """Serviço de pathfinding assíncrono.
+
+    Os behaviors pedem caminhos com request() e recebem um PathRequest que
+    só é resolvido num tick seguinte: run() (uma etapa do tick de
+    simulação) processa a fila até gastar `budget_ms` e nunca bloqueia o
+    frame com uma rajada de pedidos (ex.: uma raid inteira nascendo).
+    Pedidos iguais (tile inicial, tile final, tamanho) são unidos num só,
+    enquanto pendentes e por RESULT_TTL ticks depois de prontos.
+
+    Pedidos para outra região conexa são recusados em O(1) pelo índice de
+    componentes do HPA*; os de longa distância (mais de LOCAL_RANGE tiles)
+    usam o HPA* em vez do A* com limite de iterações.
+
+    `diagonal`, `smooth` e `jump_points` escolhem o modo da busca
+    (core/pathfinding.find_path): passos diagonais, caminho suavizado só
+    com os pontos de virada, e JPS em vez de A*.
+
+    Com `workers` > 0, as buscas curtas vão para um pool de processos que
+    lê uma cópia da máscara de walkability em memória compartilhada (uma
+    por tamanho e versão da NavGrid); run() só recolhe o que terminou.
+    """
+    budget_ms = BUDGET_MS
+    workers = 0
+    max_iterations = MAX_ITERATIONS
+    diagonal = False
+    smooth = False
+    jump_points = False
+    pending = OrderedDict()  # chave -> PathRequest na fila
+    inflight = {}            # (chave, versão) -> (PathRequest, future)
+    results = {}             # chave -> PathRequest pronto (reaproveitado por RESULT_TTL ticks)
+    searches = 0
+    coalesced = 0
+    _pool = None
+    _shared = {}             # (tamanho, versão) -> (SharedMemory, shape)
+
+    def configure(config):
+        """Lê a seção `pathfinding` do config.yaml."""
+        config = config or {}
+        PathService.budget_ms = float(config.get('budget_ms', BUDGET_MS))
+        PathService.workers = int(config.get('workers', 0))
+        PathService.max_iterations = int(config.get('max_iterations', MAX_ITERATIONS))
+        PathService.diagonal = bool(config.get('diagonal', False))
+        PathService.smooth = bool(config.get('smooth', False))
+        PathService.jump_points = bool(config.get('jump_points', False))
+
+    def _options():
+        return {'diagonal': PathService.diagonal, 'smooth': PathService.smooth,
+                'jump': PathService.jump_points}
+
+    def request(game_map, start_px, goal_px, sizex, sizey):
+        """Pede um caminho entre dois pontos (pixels) para uma hitbox sizex x sizey."""
+        nav = game_map.nav
+        key = ((int(start_px[0] // nav.tilewidth), int(start_px[1] // nav.tileheight)),
+               (int(goal_px[0] // nav.tilewidth), int(goal_px[1] // nav.tileheight)),
+               nav.size_class(sizex, sizey))
+        # Pendentes ainda serão calculados sobre a grade atual: sempre valem
+        found = PathService.pending.get(key)
+        if found is None:
+            inflight = PathService.inflight.get((key, nav.version))
+            found = inflight[0] if inflight else PathService.results.get(key)
+            if found is not None and found.version != nav.version:
+                found = None
+        if found is not None:
+            PathService.coalesced += 1
+            return found
+        req = PathRequest(key, nav.version)
+        PathService.pending[key] = req
+        return req
+
+    def _finish(req, path):
+        req.path = path
+        req.done = True
+        req.finished_tick = SimClock.ticks
+        PathService.results[req.key] = req
+        PathService.searches += 1
+
+    def run(game_map, dt=None):
+        """Etapa do tick: resolve pedidos dentro do orçamento (ou via pool)."""
+        PathService._expire()
+        if not PathService.pending and not PathService.inflight:
+            return
+        nav = game_map.nav
+        use_pool = PathService.workers > 0 and PathService._ensure_pool()
+        if use_pool:
+            PathService._collect(nav)
+        capacity = PathService.workers * INFLIGHT_PER_WORKER
+        deadline = time.perf_counter() + PathService.budget_ms / 1000.0
+        searched = False
+        for key in list(PathService.pending):
+            req = PathService.pending[key]
+            hpa = nav.hierarchy(req.size)
+            # Destino em outra região: descartado em O(1), sem gastar busca
+            if not hpa.connected(req.start, req.goal):
+                del PathService.pending[key]
+                req.version = nav.version
+                PathService._finish(req, None)
+                continue
+            if use_pool and PathService._is_local(req):
+                if len(PathService.inflight) < capacity:
+                    del PathService.pending[key]
+                    PathService._submit(nav, req)
+                continue
+            # Pelo menos uma busca por chamada, para a fila sempre andar
+            if searched and time.perf_counter() >= deadline:
+                continue
+            del PathService.pending[key]
+            req.version = nav.version
+            PathService._finish(req, PathService._search(nav, req, hpa))
+            searched = True
+
+    def _is_local(req):
+        return abs(req.start[0] - req.goal[0]) + abs(req.start[1] - req.goal[1]) <= LOCAL_RANGE
+
+    def _search(nav, req, hpa):
+        """A* direto para pedidos curtos; HPA* para os longos ou quando o A* esgota o limite."""
+        walkable = nav.walkable_mask(req.size)
+        path = None
+        if PathService._is_local(req):
+            path = find_path(walkable, req.start, req.goal, PathService.max_iterations,
+                             **PathService._options())
+        if path is None:
+            path = PathService._hierarchical(nav, req, hpa)
+        return path
+
+    def _hierarchical(nav, req, hpa):
+        path = hpa.find_path(req.start, req.goal)
+        if PathService.smooth:
+            path = smooth_path(nav.walkable_mask(req.size), path)
+        return path
+
+    def _expire():
+        if not PathService.results:
+            return
+        now = SimClock.ticks
+        stale = [key for key, req in PathService.results.items() if now - req.finished_tick > RESULT_TTL]
+        for key in stale:
+            del PathService.results[key]
+
+    # --- Pool de processos ---
+
+    def _ensure_pool():
+        if PathService._pool is None:
+            try:
+                from concurrent.futures import ProcessPoolExecutor
+                PathService._pool = ProcessPoolExecutor(max_workers=PathService.workers)
+            except (ImportError, OSError, NotImplementedError) as e:
+                print(f"[PathService] pool de processos indisponível ({e}); buscando no processo principal.")
+                PathService.workers = 0
+                return False
+        return True
+
+    def _shared_grid(nav, size):
+        """Nome e formato do bloco compartilhado com a máscara de `size` na versão atual da NavGrid."""
+        from multiprocessing import shared_memory
+        key = (size, nav.version)
+        entry = PathService._shared.get(key)
+        if entry is None:
+            # Versões antigas só são liberadas quando nenhuma busca as usa mais
+            if not PathService.inflight:
+                PathService._release_shared(keep_version=nav.version)
+            mask = nav.walkable_mask(size)
+            shm = shared_memory.SharedMemory(create=True, size=max(mask.nbytes, 1))
+            np.ndarray(mask.shape, dtype=bool, buffer=shm.buf)[:] = mask
+            entry = PathService._shared[key] = (shm, mask.shape)
+        return entry[0].name, entry[1]
+
+    def _collect(nav):
+        for slot, (req, future) in list(PathService.inflight.items()):
+            if future.done():
+                del PathService.inflight[slot]
+                try:
+                    path = future.result()
+                except Exception as e:
+                    print(f"[PathService] erro na busca {req.key}: {e}")
+                    path = None
+                if path is None and req.version == nav.version:
+                    # Alcançável (já checado) mas além do limite do A*
+                    path = PathService._hierarchical(nav, req, nav.hierarchy(req.size))
+                PathService._finish(req, path)
+
+    def _submit(nav, req):
+        req.version = nav.version
+        name, shape = PathService._shared_grid(nav, req.size)
+        future = PathService._pool.submit(_search_shared, name, shape, req.start, req.goal,
+                                          PathService.max_iterations, PathService._options())
+        PathService.inflight[(req.key, req.version)] = (req, future)
+
+    def _release_shared(keep_version=None):
+        for key in [k for k in PathService._shared if k[1] != keep_version]:
+            shm, _ = PathService._shared.pop(key)
+            shm.close()
+            shm.unlink()
+
+    def reset():
+        """Descarta pedidos e resultados (troca de mapa, reset do mundo)."""
+        for req, future in PathService.inflight.values():
+            future.cancel()
+        PathService.pending = OrderedDict()
+        PathService.inflight = {}
+        PathService.results = {}
+
+    def shutdown():
+        PathService.reset()
+        if PathService._pool is not None:
+            PathService._pool.shutdown(wait=False, cancel_futures=True)
+            PathService._pool = None
+        PathService._release_shared()
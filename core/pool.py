@@ -0,0 +1,65 @@
+"""
+Listas livres (free lists) para objetos de vida curta: projéteis e itens no chão.
+
+Um objeto devolvido ao pool é reaproveitado no próximo acquire em vez de
+alocar outro, o que tira do coletor de lixo a maior parte da rotatividade
+de uma luta com muitos disparos. O contrato das classes com pool:
+
+- reset(*args) reinicia todos os campos; o construtor só chama reset,
+  então acquire(*args) aceita os mesmos argumentos do construtor;
+- clear() solta as referências (textura, item, linha do protótipo) para
+  o objeto parado no pool não segurar nada vivo.
+
+Quem tira o objeto do jogo (PrjControl, ItControl) chama release depois
+de tirá-lo do registro; ninguém deve guardar o objeto depois disso (o
+registro guarda ids, que não se repetem).
+"""
+
+# Objetos guardados por pool; acima disso os devolvidos são descartados
+DEFAULT_LIMIT = 4096
+
+
+class Pool:
+    """Lista livre de uma classe com reset explícito (ver o docstring do módulo)."""
+    enabled = True
+    limit = DEFAULT_LIMIT
+
+    def configure(config):
+        """Lê a seção `pools` do config.yaml (vale para todos os pools)."""
+        config = config or {}
+        Pool.enabled = bool(config.get('enabled', True))
+        Pool.limit = max(0, int(config.get('limit', DEFAULT_LIMIT)))
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            obj = self.free.pop()
+            obj.in_pool = False
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+            return obj
+        self.created += 1
+        return self.cls(*args, **kwargs)
+
+    def release(self, obj):
+        """Guarda o objeto para reuso (ignora se já está no pool ou se o pool está cheio/desligado)."""
+        if getattr(obj, 'in_pool', False):
+            return
+        obj.clear()
+        if Pool.enabled and len(self.free) < Pool.limit:
+            obj.in_pool = True
+            self.free.append(obj)
+
+    def drain(self):
+        self.free.clear()
+
+    def __len__(self):
+        return len(self.free)
+
+    def __repr__(self):
+        return f"Pool({self.cls.__name__}: {len(self.free)} livres, {self.created} criados, {self.reused} reusados)"
@@ -0,0 +1,213 @@
+import functools
+import json
+import os
+import time
+from collections import deque
+
+# Frames guardados no histórico de cada escopo (ring buffer)
+HISTORY_FRAMES = 240
+# Frames gravados por uma captura de trace (Profiler.start_trace)
+TRACE_FRAMES = 120
+TRACE_DIR = 'saves/traces'
+
+
+class _NullScope:
+    """Escopo que não mede nada, usado com o profiler desligado."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class _Scope:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        Profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class Profiler:
+    """Profiler de frame por subsistema.
+
+    Escopos nomeados (`with Profiler.scope('map.render'):`) somam o tempo
+    gasto no frame atual; end_frame() empurra esses totais para o ring
+    buffer de cada escopo, de onde saem p50/p95/máximo para o overlay.
+    Um escopo chamado várias vezes no frame (ex.: uma ação de behavior
+    por mob) conta a soma das chamadas. Com `enabled` falso, scope()
+    devolve um contexto vazio e record() retorna logo, então os pontos
+    de medição podem ficar no código. Contadores (count()) seguem o mesmo
+    ciclo, mas guardam só o valor do último frame (`counts`). Medidores
+    (gauge()) guardam o último valor informado, que continua em `counts`
+    nos frames em que ninguém o atualiza (ex.: frame sem tick de simulação).
+
+    start_trace() grava também cada chamada individual dos próximos
+    frames e, ao terminar, exporta um JSON no formato Chrome trace
+    (abrir em chrome://tracing ou ui.perfetto.dev).
+    """
+    enabled = False
+    history = HISTORY_FRAMES
+    trace_frames = TRACE_FRAMES
+    trace_dir = TRACE_DIR
+    samples = {}         # escopo -> deque com o total (s) de cada frame
+    frame_totals = {}    # escopo -> tempo (s) acumulado no frame atual
+    frame_counts = {}    # contador -> valor no frame atual
+    gauges = {}          # medidor -> último valor informado
+    counts = {}          # contador -> valor no último frame fechado
+    frames = 0
+    # Captura de trace em andamento
+    trace_events = None
+    trace_left = 0
+    trace_origin = 0.0
+    trace_restore = None   # `enabled` de antes da captura, restaurado em stop_trace()
+    last_trace_path = None
+
+    def configure(config):
+        """Lê a seção `profiler` do config.yaml."""
+        config = config or {}
+        Profiler.enabled = bool(config.get('enabled', False))
+        Profiler.history = int(config.get('history_frames', HISTORY_FRAMES))
+        Profiler.trace_frames = int(config.get('trace_frames', TRACE_FRAMES))
+        Profiler.trace_dir = config.get('trace_dir', TRACE_DIR)
+        Profiler.reset()
+
+    def reset():
+        Profiler.samples = {}
+        Profiler.frame_totals = {}
+        Profiler.frame_counts = {}
+        Profiler.gauges = {}
+        Profiler.counts = {}
+        Profiler.frames = 0
+
+    def scope(name):
+        """Contexto que mede o bloco sob o nome `name` (no-op se desligado)."""
+        if not Profiler.enabled:
+            return _NULL_SCOPE
+        return _Scope(name)
+
+    def record(name, start, end):
+        """Registra uma medição já feita com time.perf_counter()."""
+        if not Profiler.enabled:
+            return
+        Profiler.frame_totals[name] = Profiler.frame_totals.get(name, 0.0) + end - start
+        if Profiler.trace_events is not None:
+            Profiler.trace_events.append({
+                "name": name, "ph": "X", "pid": 1, "tid": 1,
+                "ts": (start - Profiler.trace_origin) * 1e6,
+                "dur": (end - start) * 1e6,
+            })
+
+    def count(name, value):
+        """Soma `value` ao contador `name` do frame (ex.: entidades por faixa de LOD)."""
+        if not Profiler.enabled:
+            return
+        Profiler.frame_counts[name] = Profiler.frame_counts.get(name, 0) + value
+
+    def gauge(name, value):
+        """Define o medidor `name` (ex.: entidades por faixa de LOD); vale até o próximo gauge()."""
+        if not Profiler.enabled:
+            return
+        Profiler.gauges[name] = value
+
+    def end_frame():
+        """Fecha o frame: guarda os totais no histórico e avança a captura de trace."""
+        if not Profiler.enabled:
+            return
+        for name, total in Profiler.frame_totals.items():
+            buf = Profiler.samples.get(name)
+            if buf is None:
+                buf = Profiler.samples[name] = deque(maxlen=Profiler.history)
+            buf.append(total)
+        Profiler.frame_totals = {}
+        Profiler.counts = Profiler.frame_counts
+        Profiler.counts.update(Profiler.gauges)
+        Profiler.frame_counts = {}
+        Profiler.frames += 1
+        if Profiler.trace_events is not None:
+            Profiler.trace_left -= 1
+            if Profiler.trace_left <= 0:
+                Profiler.stop_trace()
+
+    def stats():
+        """Retorna [(escopo, p50, p95, máximo)] em segundos, do mais caro (p95) ao mais barato."""
+        rows = []
+        for name, buf in Profiler.samples.items():
+            if not buf:
+                continue
+            ordered = sorted(buf)
+            last = len(ordered) - 1
+            rows.append((name, ordered[last // 2], ordered[int(last * 0.95)], ordered[last]))
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows
+
+    def toggle():
+        """Liga/desliga a coleta (o overlay mostra o que estiver no histórico)."""
+        Profiler.enabled = not Profiler.enabled
+        if not Profiler.enabled and Profiler.trace_events is not None:
+            Profiler.trace_restore = False
+            Profiler.stop_trace()
+        Profiler.frame_totals = {}
+
+    def start_trace(frames=None):
+        """Grava cada chamada de escopo dos próximos `frames` frames para exportar como trace.
+
+        Liga a coleta durante a captura; stop_trace() volta `enabled` ao que era antes.
+        """
+        if Profiler.trace_events is None:
+            Profiler.trace_restore = Profiler.enabled
+        Profiler.enabled = True
+        Profiler.trace_events = []
+        Profiler.trace_left = frames or Profiler.trace_frames
+        Profiler.trace_origin = time.perf_counter()
+
+    def stop_trace(path=None):
+        """Encerra a captura e grava o JSON; retorna o caminho do arquivo (ou None)."""
+        events = Profiler.trace_events
+        Profiler.trace_events = None
+        Profiler.trace_left = 0
+        if Profiler.trace_restore is not None:
+            Profiler.enabled = Profiler.trace_restore
+            Profiler.trace_restore = None
+        if not events:
+            return None
+        if path is None:
+            os.makedirs(Profiler.trace_dir, exist_ok=True)
+            path = os.path.join(Profiler.trace_dir, time.strftime('trace_%Y%m%d_%H%M%S.json'))
+        Profiler.export_trace(events, path)
+        Profiler.last_trace_path = path
+        return path
+
+    def export_trace(events, path):
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def recording():
+        return Profiler.trace_events is not None
+
+
+def profiled(name):
+    """Decorador: mede cada chamada da função como o escopo `name`."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not Profiler.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                Profiler.record(name, start, time.perf_counter())
+        return wrapper
+    return decorator
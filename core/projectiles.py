@@ -0,0 +1,362 @@
+from itertools import compress
+
+import numpy as np
+
+from core.spatial import swept_aabb
+
+# Capacidade inicial das colunas; dobra quando enche
+INITIAL_CAPACITY = 256
+
+# Colunas por projétil. x/y: posição atual; prev_x/prev_y: do tick anterior
+# (interpolação); ox/oy: origem que anda em linha reta (base da onda, centro
+# da espiral); dx/dy: direção como veio do disparo; nx/ny: direção normalizada;
+# phase/radius: estado dos kernels; time: ticks de vida restantes.
+FLOAT_COLUMNS = ('x', 'y', 'prev_x', 'prev_y', 'ox', 'oy', 'dx', 'dy', 'nx', 'ny',
+                 'speed', 'phase', 'radius', 'time', 'damage', 'penetration', 'w', 'h')
+INT_COLUMNS = ('uid', 'owner', 'owner_type', 'kernel')
+
+# Kernels de movimento registrados (ver assets/behaviors/prj.py)
+KERNELS = []          # índice -> função(engine, rows)
+KERNEL_DEFAULTS = []  # índice -> {coluna: valor inicial}
+_KERNEL_INDEX = {}    # função -> índice
+
+
+def projectile_kernel(**defaults):
+    """Registra uma função `kernel(engine, rows)` como movimento de projétil.
+
+    O kernel atualiza de uma vez as colunas das linhas `rows` (array de
+    índices ou slice) do ProjectileEngine. `defaults` são os valores
+    iniciais de colunas de estado (ex.: phase=1.0) para os projéteis
+    criados com ele.
+    """
+    def decorator(function):
+        _KERNEL_INDEX[function] = len(KERNELS)
+        KERNELS.append(function)
+        KERNEL_DEFAULTS.append(defaults)
+        return function
+    return decorator
+
+
+class ProjectileEngine:
+    """Projéteis em colunas NumPy (struct of arrays).
+
+    Cada tick (step) descarta os expirados e os que acertaram o último
+    alvo, compactando todas as colunas com a máscara `alive`, e roda cada
+    kernel de movimento uma vez sobre todas as linhas que o usam. Depois
+    ordena as linhas por x para as consultas de colisão (query, sweep),
+    que fazem busca binária na faixa de x do retângulo e filtram o resto
+    com máscaras. Mortes no meio do tick (hit, kill) só desligam `alive`;
+    a compactação fica para o próximo step.
+
+    A colisão é contínua: o movimento do tick vai de (prev_x, prev_y) a
+    (x, y) e é testado inteiro (AABB varrida), então um projétil rápido
+    não atravessa paredes nem alvos entre dois ticks. Com `walls`, step()
+    corta o movimento no primeiro tile de parede do trajeto (o projétil
+    para ali e expira); sweep() devolve em que fração do movimento cada
+    projétil entra num alvo, para quem aplica os acertos seguir a ordem.
+
+    `objects[i]` é o objeto Python da linha i (textura, animação, dono);
+    as linhas mudam de posição na compactação, os objetos não guardam o
+    índice.
+    """
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self.capacity = capacity
+        self.count = 0
+        for name in FLOAT_COLUMNS:
+            setattr(self, name, np.zeros(capacity))
+        for name in INT_COLUMNS:
+            setattr(self, name, np.zeros(capacity, dtype=np.int64))
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.objects = []
+        self._owner_types = {}
+        self._order = np.zeros(0, dtype=np.int64)
+        self._sorted_x = np.zeros(0)
+        self._indexed = 0
+        self._max_w = 0.0
+        self._max_step = 0.0
+        self._wall_table = None
+        self._wall_key = None
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        capacity = self.capacity * 2
+        for name in FLOAT_COLUMNS + INT_COLUMNS + ('alive',):
+            old = getattr(self, name)
+            column = np.zeros(capacity, dtype=old.dtype)
+            column[:self.count] = old[:self.count]
+            setattr(self, name, column)
+        self.capacity = capacity
+
+    def owner_type_code(self, owner_type):
+        """Código inteiro do tipo do dono ('player', 'mob', ...), para comparar em coluna."""
+        code = self._owner_types.get(owner_type)
+        if code is None:
+            code = self._owner_types[owner_type] = len(self._owner_types)
+        return code
+
+    def spawn(self, obj, uid, x, y, dirx, diry, speed, damage, penetration, time, w, h,
+              kernel=None, owner=None, owner_type=None):
+        """Adiciona um projétil e retorna a linha. `kernel` é uma função registrada (ou None: parado)."""
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        self.count += 1
+        magnitude = (dirx * dirx + diry * diry) ** 0.5
+        nx, ny = (dirx / magnitude, diry / magnitude) if magnitude > 0 else (1.0, 0.0)
+        self.x[i] = self.prev_x[i] = self.ox[i] = x
+        self.y[i] = self.prev_y[i] = self.oy[i] = y
+        self.dx[i], self.dy[i] = dirx, diry
+        self.nx[i], self.ny[i] = nx, ny
+        self.speed[i] = speed
+        self.damage[i] = damage
+        self.penetration[i] = penetration
+        self.time[i] = time
+        self.w[i], self.h[i] = w, h
+        self.phase[i] = self.radius[i] = 0.0
+        index = _KERNEL_INDEX.get(kernel, -1)
+        if index >= 0:
+            for name, value in KERNEL_DEFAULTS[index].items():
+                getattr(self, name)[i] = value
+        self.kernel[i] = index
+        self.uid[i] = uid
+        self.owner[i] = -1 if owner is None else owner
+        self.owner_type[i] = self.owner_type_code(owner_type)
+        self.alive[i] = True
+        self.objects.append(obj)
+        return i
+
+    def kill(self, row):
+        self.alive[row] = False
+
+    def kill_uid(self, uid):
+        """Desliga o projétil com esse id (se ainda estiver vivo)."""
+        n = self.count
+        self.alive[:n] &= self.uid[:n] != uid
+
+    def hit(self, row):
+        """Consome uma penetração; retorna se o projétil continua vivo."""
+        self.penetration[row] -= 1
+        if self.penetration[row] <= 0:
+            self.alive[row] = False
+            return False
+        return True
+
+    def compact(self):
+        """Remove as linhas mortas (mantendo a ordem) e retorna os objetos removidos."""
+        n = self.count
+        keep = self.alive[:n]
+        if keep.all():
+            return []
+        removed = [self.objects[i] for i in np.flatnonzero(~keep)]
+        m = int(np.count_nonzero(keep))
+        for name in FLOAT_COLUMNS + INT_COLUMNS:
+            column = getattr(self, name)
+            column[:m] = column[:n][keep]
+        self.objects = list(compress(self.objects, keep.tolist()))
+        self.alive[:m] = True
+        self.alive[m:n] = False
+        self.count = m
+        return removed
+
+    def step(self, walls=None, tilewidth=32, tileheight=32, walls_version=None):
+        """Um tick: expira, compacta, move (um kernel por vez), corta nas paredes e reindexa.
+
+        `walls` é uma máscara bool (y, x) de tiles que param projéteis
+        (Map.col_classes); `walls_version` muda quando ela muda (para
+        reaproveitar a tabela de somas). Retorna os objetos removidos.
+        """
+        n = self.count
+        self.alive[:n] &= self.time[:n] > 0
+        removed = self.compact()
+        n = self.count
+        if n:
+            self.prev_x[:n] = self.x[:n]
+            self.prev_y[:n] = self.y[:n]
+            kinds = self.kernel[:n]
+            for index, kernel in enumerate(KERNELS):
+                mask = kinds == index
+                found = int(np.count_nonzero(mask))
+                if found == n:
+                    kernel(self, slice(0, n))
+                elif found:
+                    kernel(self, np.flatnonzero(mask))
+            self.time[:n] -= 1
+            if walls is not None:
+                self._clip_to_walls(walls, tilewidth, tileheight, walls_version)
+        self._index()
+        return removed
+
+    def _walls_sum(self, walls, version):
+        """Tabela de somas (integral) da máscara de paredes: contagem de paredes num retângulo em O(1)."""
+        key = (id(walls), version)
+        if self._wall_table is None or version is None or key != self._wall_key:
+            table = np.zeros((walls.shape[0] + 1, walls.shape[1] + 1), dtype=np.int32)
+            table[1:, 1:] = walls.cumsum(0, dtype=np.int32).cumsum(1)
+            self._wall_table, self._wall_key = table, key
+        return self._wall_table
+
+    def _clip_to_walls(self, walls, tilewidth, tileheight, version):
+        n = self.count
+        height, width = walls.shape
+        table = self._walls_sum(walls, version)
+        px, py, x, y = self.prev_x[:n], self.prev_y[:n], self.x[:n], self.y[:n]
+        w, h = self.w[:n], self.h[:n]
+        # Tiles sob a caixa que envolve o trajeto; se nenhum é parede, não há o que cortar
+        x0 = np.floor(np.minimum(px, x) / tilewidth).astype(np.int64)
+        y0 = np.floor(np.minimum(py, y) / tileheight).astype(np.int64)
+        x1 = np.floor((np.maximum(px, x) + w - 1e-6) / tilewidth).astype(np.int64)
+        y1 = np.floor((np.maximum(py, y) + h - 1e-6) / tileheight).astype(np.int64)
+        np.clip(x0, 0, width, out=x0)
+        np.clip(y0, 0, height, out=y0)
+        np.clip(x1 + 1, 0, width, out=x1)
+        np.clip(y1 + 1, 0, height, out=y1)
+        count = table[y1, x1] - table[y0, x1] - table[y1, x0] + table[y0, x0]
+        for row in np.flatnonzero(count > 0).tolist():
+            ax, ay = float(self.prev_x[row]), float(self.prev_y[row])
+            dx, dy = float(self.x[row]) - ax, float(self.y[row]) - ay
+            aw, ah = float(self.w[row]), float(self.h[row])
+            first = None
+            for ty, tx in np.argwhere(walls[y0[row]:y1[row], x0[row]:x1[row]]).tolist():
+                t = swept_aabb(ax, ay, aw, ah, dx, dy, (x0[row] + tx) * tilewidth,
+                               (y0[row] + ty) * tileheight, tilewidth, tileheight)
+                if t is not None and (first is None or t < first):
+                    first = t
+            if first is not None:
+                # Para encostado na parede; ainda pode acertar alvos antes dela neste tick
+                self.x[row] = ax + dx * first
+                self.y[row] = ay + dy * first
+                self.time[row] = 0
+
+    def _index(self):
+        n = self.count
+        self._order = np.argsort(self.x[:n], kind='stable')
+        self._sorted_x = self.x[:n][self._order]
+        self._indexed = n
+        self._max_w = float(self.w[:n].max()) if n else 0.0
+        self._max_step = float(np.abs(self.x[:n] - self.prev_x[:n]).max()) if n else 0.0
+
+    def query(self, x, y, w, h, owner=None, owner_type=None):
+        """Linhas vivas cuja hitbox sobrepõe o retângulo, sem os projéteis do próprio dono.
+
+        Usa a ordenação por x do último step; projéteis criados depois dele
+        (no meio do tick) são testados direto.
+        """
+        lo = np.searchsorted(self._sorted_x, x - max(self._max_w, 0.0), 'right')
+        hi = np.searchsorted(self._sorted_x, x + w, 'left')
+        rows = self._order[lo:hi]
+        if self.count > self._indexed:
+            rows = np.concatenate((rows, np.arange(self._indexed, self.count)))
+        if not rows.size:
+            return rows
+        px, py = self.x[rows], self.y[rows]
+        mask = (self.alive[rows] & (px < x + w) & (px + self.w[rows] > x)
+                & (py < y + h) & (py + self.h[rows] > y))
+        if owner is not None:
+            code = self._owner_types.get(owner_type)
+            if code is not None:
+                mask &= ~((self.owner[rows] == owner) & (self.owner_type[rows] == code))
+        rows = rows[mask]
+        rows.sort()
+        return rows
+
+    def sweep(self, x, y, w, h, owner=None, owner_type=None):
+        """Linhas vivas que entram no retângulo durante o movimento do último tick, e quando.
+
+        Retorna (rows, t): t em [0, 1] é a fração do trajeto prev -> atual
+        em que a hitbox do projétil passa a sobrepor o retângulo (0 se já
+        sobrepunha). Sem os projéteis do próprio dono.
+        """
+        reach = max(self._max_w, 0.0) + self._max_step
+        lo = np.searchsorted(self._sorted_x, x - reach, 'right')
+        hi = np.searchsorted(self._sorted_x, x + w + self._max_step, 'left')
+        rows = self._order[lo:hi]
+        if self.count > self._indexed:
+            rows = np.concatenate((rows, np.arange(self._indexed, self.count)))
+        rows = rows[self.alive[rows]]
+        if owner is not None and rows.size:
+            code = self._owner_types.get(owner_type)
+            if code is not None:
+                rows = rows[~((self.owner[rows] == owner) & (self.owner_type[rows] == code))]
+        if not rows.size:
+            return rows, np.zeros(0)
+        hit, enter = self._entry(rows, x, y, w, h)
+        return rows[hit], enter[hit]
+
+    def sweep_boxes(self, x, y, w, h, owners, owner_types):
+        """sweep() de todos os alvos de uma vez: arrays x, y, w, h e listas owners/owner_types por alvo.
+
+        Retorna (rows, targets, t), um par por acerto, ordenado por t, linha e
+        índice do alvo. Em vez de uma busca por alvo, ordena os alvos por x e
+        casa a faixa de x varrida por cada projétil com os alvos dentro dela.
+        Um projétil não acerta o alvo que é o seu dono.
+        """
+        n = self.count
+        rows = np.flatnonzero(self.alive[:n])
+        empty = np.zeros(0, dtype=np.int64)
+        if not rows.size or not len(x):
+            return empty, empty, np.zeros(0)
+        order = np.argsort(x, kind='stable')
+        sorted_x = x[order]
+        px, cx = self.prev_x[rows], self.x[rows]
+        lo = np.searchsorted(sorted_x, np.minimum(px, cx) - float(w.max()), 'right')
+        hi = np.searchsorted(sorted_x, np.maximum(px, cx) + self.w[rows], 'left')
+        counts = np.maximum(hi - lo, 0)
+        total = int(counts.sum())
+        if not total:
+            return empty, empty, np.zeros(0)
+        # Pares (projétil, alvo): para cada linha, os alvos de order[lo:hi]
+        starts = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+        targets = order[starts + np.arange(total)]
+        rows = np.repeat(rows, counts)
+        codes = np.array([self._owner_types.get(name, -1) for name in owner_types], dtype=np.int64)
+        own = (self.owner[rows] == np.asarray(owners, dtype=np.int64)[targets]) & (self.owner_type[rows] == codes[targets])
+        rows, targets = rows[~own], targets[~own]
+        hit, enter = self._entry(rows, x[targets], y[targets], w[targets], h[targets])
+        rows, targets, enter = rows[hit], targets[hit], enter[hit]
+        ranked = np.lexsort((targets, rows, enter))
+        return rows[ranked], targets[ranked], enter[ranked]
+
+    def _entry(self, rows, x, y, w, h):
+        """Teste da AABB varrida das linhas contra retângulos (escalares ou um por linha): (acertou, t)."""
+        enter = np.zeros(rows.size)
+        leave = np.ones(rows.size)
+        hit = np.ones(rows.size, dtype=bool)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for a, d, size, lo_edge, hi_edge in (
+                    (self.prev_x[rows], self.x[rows] - self.prev_x[rows], self.w[rows], x, x + w),
+                    (self.prev_y[rows], self.y[rows] - self.prev_y[rows], self.h[rows], y, y + h)):
+                # No eixo, a caixa sobrepõe o retângulo quando lo < a < hi
+                lo_a, hi_a = lo_edge - size, hi_edge
+                still = d == 0
+                hit &= ~still | ((lo_a < a) & (a < hi_a))
+                t0 = np.where(still, -np.inf, (lo_a - a) / d)
+                t1 = np.where(still, np.inf, (hi_a - a) / d)
+                enter = np.maximum(enter, np.minimum(t0, t1))
+                leave = np.minimum(leave, np.maximum(t0, t1))
+        hit &= enter < leave
+        return hit, enter
+
+    def clip(self, row, t):
+        """Recua o projétil para a fração t do trajeto do último tick (ponto do acerto)."""
+        self.x[row] = self.prev_x[row] + (self.x[row] - self.prev_x[row]) * t
+        self.y[row] = self.prev_y[row] + (self.y[row] - self.prev_y[row]) * t
+
+    def render_positions(self, alpha, snap):
+        """Posições de desenho (x, y) interpoladas entre o tick anterior e o atual, como render_pos."""
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        if alpha >= 1.0:
+            return x, y
+        px, py = self.prev_x[:n], self.prev_y[:n]
+        dx, dy = x - px, y - py
+        jump = (np.abs(dx) > snap) | (np.abs(dy) > snap)
+        return np.where(jump, x, px + dx * alpha), np.where(jump, y, py + dy * alpha)
+
+    def clear(self):
+        self.count = 0
+        self.alive[:] = False
+        self.objects = []
+        self._index()
@@ -0,0 +1,72 @@
+import sqlite3
+
+DB_PATH = 'assets/data/data.db'
+
+# Tabelas de definição usadas no spawn de entidades
+PROTOTYPE_TABLES = ('Creature', 'Projectile', 'Sprite', 'BehaviorTree', 'Breakbles')
+
+
+class Prototypes:
+    """Cache de protótipos lidos do banco.
+
+    Cada tabela é lida inteira uma única vez (uma conexão só) e as linhas
+    ficam em memória como dicionários coluna -> valor. Objetos montados a
+    partir dessas linhas (Sprite com a textura já na GPU, árvore de
+    comportamento) também ficam guardados, para que criar um Mob ou um
+    Projectile não precise mais abrir o SQLite nem reenviar texturas.
+
+    As linhas e os objetos em cache são compartilhados: quem precisar de
+    estado próprio deve copiar (ver Sprite.clone).
+    """
+    rows = {}       # tabela -> {id: {coluna: valor}}
+    objects = {}    # (tipo, id) -> objeto montado
+
+    def table(name):
+        rows = Prototypes.rows.get(name)
+        if rows is None:
+            rows = Prototypes._load_tables([name])[name]
+        return rows
+
+    def get(name, id):
+        """Linha `id` da tabela `name` (dicionário compartilhado) ou None."""
+        return Prototypes.table(name).get(id)
+
+    def cached(kind, id, build):
+        """Retorna o objeto (kind, id) em cache, montando-o com build() na primeira vez.
+
+        Resultados None não são guardados (permite tentar de novo depois).
+        """
+        key = (kind, id)
+        obj = Prototypes.objects.get(key)
+        if obj is None:
+            obj = build()
+            if obj is not None:
+                Prototypes.objects[key] = obj
+        return obj
+
+    def preload():
+        """Carrega de uma vez todas as tabelas de protótipos que ainda não estão em memória."""
+        missing = [t for t in PROTOTYPE_TABLES if t not in Prototypes.rows]
+        if missing:
+            Prototypes._load_tables(missing)
+
+    def clear():
+        Prototypes.rows = {}
+        Prototypes.objects = {}
+
+    def _load_tables(names):
+        conn = sqlite3.connect(DB_PATH)
+        try:
+            cursor = conn.cursor()
+            for name in names:
+                try:
+                    cursor.execute(f'SELECT * FROM "{name}"')
+                except sqlite3.Error as e:
+                    print(f"Erro ao carregar a tabela {name}: {e}")
+                    Prototypes.rows[name] = {}
+                    continue
+                cols = [d[0] for d in cursor.description]
+                Prototypes.rows[name] = {row[0]: dict(zip(cols, row)) for row in cursor.fetchall()}
+        finally:
+            conn.close()
+        return Prototypes.rows
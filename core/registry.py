@@ -0,0 +1,110 @@
+class Registry:
+    """Coleção de objetos do jogo indexada por id estável.
+
+    - Os ids são crescentes e nunca reaproveitados: quem guardou um id
+      (already_hit dos projéteis, timers das condições, spawns das raids)
+      continua apontando para o mesmo objeto ou para nada.
+    - add/get/remove são O(1) (dicionário id -> objeto).
+    - A ordem de iteração é a ordem de inserção.
+    - Durante uma iteração, remoções e inserções são adiadas até o fim do
+      laço mais externo: o objeto removido deixa de ser visitado e de ser
+      encontrado por get/has imediatamente, e o novo objeto só passa a ser
+      visitado na próxima iteração.
+    """
+
+    def __init__(self):
+        self._items = {}
+        self._next_id = 1
+        self._depth = 0
+        self._pending_add = {}
+        self._pending_rem = set()
+
+    def add(self, obj):
+        """Registra o objeto, atribui `obj.id` e retorna o id."""
+        obj.id = self._next_id
+        self._next_id += 1
+        if self._depth:
+            self._pending_add[obj.id] = obj
+        else:
+            self._items[obj.id] = obj
+        return obj.id
+
+    def remove(self, id):
+        """Remove pelo id. Retorna o objeto removido ou None se não existir."""
+        obj = self._pending_add.pop(id, None)
+        if obj is not None:
+            return obj
+        obj = self._items.get(id)
+        if obj is None or id in self._pending_rem:
+            return None
+        if self._depth:
+            self._pending_rem.add(id)
+        else:
+            del self._items[id]
+        return obj
+
+    def get(self, id, default=None):
+        if id in self._pending_rem:
+            return default
+        obj = self._items.get(id)
+        if obj is None:
+            obj = self._pending_add.get(id, default)
+        return obj
+
+    def has(self, id):
+        return self.get(id) is not None
+
+    def first(self):
+        for obj in self:
+            return obj
+        return None
+
+    def last(self):
+        if self._pending_add:
+            return next(reversed(self._pending_add.values()))
+        for id in reversed(self._items):
+            if id not in self._pending_rem:
+                return self._items[id]
+        return None
+
+    def clear(self):
+        if self._depth:
+            self._pending_add.clear()
+            self._pending_rem.update(self._items)
+        else:
+            self._items.clear()
+            self._pending_rem.clear()
+            self._pending_add.clear()
+
+    def _flush(self):
+        items = self._items
+        for id in self._pending_rem:
+            items.pop(id, None)
+        self._pending_rem.clear()
+        if self._pending_add:
+            items.update(self._pending_add)
+            self._pending_add.clear()
+
+    def __iter__(self):
+        self._depth += 1
+        try:
+            pending_rem = self._pending_rem
+            for id, obj in self._items.items():
+                if id not in pending_rem:
+                    yield obj
+        finally:
+            self._depth -= 1
+            if not self._depth and (self._pending_rem or self._pending_add):
+                self._flush()
+
+    def __len__(self):
+        return len(self._items) - len(self._pending_rem) + len(self._pending_add)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __contains__(self, obj):
+        return self.get(getattr(obj, 'id', None)) is obj
+
+    def __repr__(self):
+        return f"Registry({len(self)} objetos)"
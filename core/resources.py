@@ -1,8 +1,12 @@
-def draw_rect(x, y, width, height, color):
+def draw_rect(x, y, width, height, color, layer=0):
     """
     Desenha um retângulo colorido na tela usando OpenGL.
     color: tupla (R, G, B, A) com valores de 0 a 255
+    layer: camada usada quando há um SpriteBatch aberto (ver core/batch.py)
     """
+    if SpriteBatch.active():
+        SpriteBatch.rect(x, y, width, height, color, layer)
+        return
     from OpenGL.GL import (
         glColor4f, glBegin, glVertex2f, glEnd, glDisable, glEnable,
         GL_QUADS, GL_TEXTURE_2D, glBlendFunc, glGetBooleanv, GL_BLEND, GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA
@@ -30,13 +34,23 @@ def draw_rect(x, y, width, height, color):
         glDisable(GL_BLEND)
 import pygame
 import sqlite3
+import copy
 import json
 import os
-from OpenGL.GL import *
+from core.textures import TextureManager
+from core.batch import SpriteBatch
 
 
 def load_texture(path):
-    """Load an image into an OpenGL texture with a couple of path fallbacks."""
+    """Load an image into an OpenGL texture with a couple of path fallbacks.
+
+    Always uploads a new texture; game code should go through
+    core.textures.TextureManager so identical sheets are shared.
+    """
+    from OpenGL.GL import (
+        glBindTexture, glGenTextures, glTexImage2D, glTexParameteri, GL_NEAREST, GL_RGBA,
+        GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_TEXTURE_MIN_FILTER, GL_UNSIGNED_BYTE
+    )
     original_path = path
     # Normalize path separators
     path = path.replace("\\", "/")
@@ -69,8 +83,10 @@ class Sprite:
         self.linhasSprite = linhas
         self.colunasSprite = colunas
         
+        self.holds_texture = False
         try:
-            self.texture_id, self.sheet_width, self.sheet_height = load_texture(src)
+            self.texture_id, self.sheet_width, self.sheet_height = TextureManager.acquire(src)
+            self.holds_texture = True
             self.sprite_width = self.sheet_width // colunas
             self.sprite_height = self.sheet_height // linhas
             self.valid = True
@@ -86,6 +102,26 @@ class Sprite:
         self.anim = animations
         self.numFrame = 0
         self.speed = 1/7  # Velocidade da animação
+
+    def clone(self):
+        """Cópia com estado de animação próprio, compartilhando a textura e as animações.
+
+        O clone registra sua própria referência à textura (recarregando-a se
+        ela tiver sido liberada pelo TextureManager).
+        """
+        other = copy.copy(self)
+        other.numFrame = 0
+        other.holds_texture = False
+        if self.valid:
+            other.texture_id, _, _ = TextureManager.acquire(self.src)
+            other.holds_texture = True
+        return other
+
+    def release(self):
+        """Devolve a referência à textura (chamado quando o dono sai do jogo)."""
+        if self.holds_texture:
+            self.holds_texture = False
+            TextureManager.release(self.src)
     
     def get_frame_coords(self, row, column):
         x = column * self.sprite_width
@@ -96,9 +132,19 @@ class Sprite:
         ty2 = (y + self.sprite_height) / self.sheet_height
         return tx1, ty1, tx2, ty2
     
-    def draw(self, x, y, anim_row, zoom, color_filter=None):
+    def draw(self, x, y, anim_row, zoom, color_filter=None, layer=0):
+        """Desenha o quadro atual da animação `anim_row`.
+
+        Dentro de um SpriteBatch (core/batch.py) o quad vai para o lote na
+        camada `layer`; fora dele é desenhado na hora.
+        """
         if not self.valid or self.texture_id is None:
+            if SpriteBatch.active():
+                SpriteBatch.rect(x, y, self.sprite_width * zoom, self.sprite_height * zoom, (255, 0, 255, 255), layer)
+                return
             # Desenha um retângulo colorido como fallback
+            from OpenGL.GL import (glBegin, glColor3f, glDisable, glEnable, glEnd, glVertex2f,
+                                   GL_QUADS, GL_TEXTURE_2D)
             glDisable(GL_TEXTURE_2D)
             glColor3f(1.0, 0.0, 1.0)  # Magenta para indicar erro
             sprite_w = self.sprite_width * zoom
@@ -129,22 +175,29 @@ class Sprite:
             sprite_w = self.sprite_width * zoom
             sprite_h = self.sprite_height * zoom
             
-            # Aplica filtro de cor se especificado
-            if color_filter:
-                r, g, b, a = color_filter
-                glColor4f(r, g, b, a)
-            
-            glBindTexture(GL_TEXTURE_2D, self.texture_id)
-            glBegin(GL_QUADS)
-            glTexCoord2f(tx1, ty1); glVertex2f(x, y)
-            glTexCoord2f(tx2, ty1); glVertex2f(x + sprite_w, y)
-            glTexCoord2f(tx2, ty2); glVertex2f(x + sprite_w, y + sprite_h)
-            glTexCoord2f(tx1, ty2); glVertex2f(x, y + sprite_h)
-            glEnd()
-            
-            # Reset cor para branco
-            if color_filter:
-                glColor4f(1.0, 1.0, 1.0, 1.0)
+            if SpriteBatch.active():
+                SpriteBatch.quad(self.texture_id, layer, x, y, x + sprite_w, y + sprite_h,
+                                 tx1, ty1, tx2, ty2, color_filter)
+            else:
+                # Import tardio, fora do lote: o modo headless roda sem PyOpenGL
+                from OpenGL.GL import (glBegin, glBindTexture, glColor4f, glEnd, glTexCoord2f, glVertex2f,
+                                       GL_QUADS, GL_TEXTURE_2D)
+                # Aplica filtro de cor se especificado
+                if color_filter:
+                    r, g, b, a = color_filter
+                    glColor4f(r, g, b, a)
+                
+                glBindTexture(GL_TEXTURE_2D, self.texture_id)
+                glBegin(GL_QUADS)
+                glTexCoord2f(tx1, ty1); glVertex2f(x, y)
+                glTexCoord2f(tx2, ty1); glVertex2f(x + sprite_w, y)
+                glTexCoord2f(tx2, ty2); glVertex2f(x + sprite_w, y + sprite_h)
+                glTexCoord2f(tx1, ty2); glVertex2f(x, y + sprite_h)
+                glEnd()
+                
+                # Reset cor para branco
+                if color_filter:
+                    glColor4f(1.0, 1.0, 1.0, 1.0)
             
             self.numFrame += atualizacao
             if self.numFrame >= len(self.anim[anim_row]):
@@ -152,21 +205,32 @@ class Sprite:
         except Exception as e:
             print(f"Erro ao desenhar sprite: {e}")
 def load_sprite_from_db(id_sprite):
+    """Retorna um Sprite para o id do banco.
+
+    A linha e a textura são carregadas uma única vez (Prototypes); cada chamada
+    devolve um clone com contador de animação próprio. Sprites cuja textura
+    falhou não entram no cache.
+    """
+    from core.prototypes import Prototypes
     try:
-        conn = sqlite3.connect("assets/data/data.db")
-        cursor = conn.cursor()
-        cursor.execute("SELECT src, linhas, colunas, animations FROM Sprite WHERE id = ?", (id_sprite,))
-        row = cursor.fetchone()
-        conn.close()
+        proto = Prototypes.objects.get(('sprite', id_sprite))
+        if proto is not None:
+            return proto.clone()
 
-        if row:
-            src, linhas, colunas, anim_json = row
-            animations = json.loads(anim_json)
-            print(f"Carregando sprite ID {id_sprite}: {src}")
-            return Sprite(src, linhas, colunas, animations)
-        else:
+        row = Prototypes.get('Sprite', id_sprite)
+        if not row:
             print(f"Sprite com ID {id_sprite} não encontrado no banco de dados.")
             return None
+        animations = json.loads(row['animations'])
+        print(f"Carregando sprite ID {id_sprite}: {row['src']}")
+        sprite = Sprite(row['src'], row['linhas'], row['colunas'], animations)
+        if not sprite.valid:
+            return sprite
+        # O protótipo não segura a textura: só os clones em uso contam referência
+        Prototypes.objects[('sprite', id_sprite)] = sprite
+        clone = sprite.clone()
+        sprite.release()
+        return clone
     except sqlite3.Error as e:
         print(f"Erro de banco de dados ao carregar sprite {id_sprite}: {e}")
         return None
@@ -180,8 +244,9 @@ def load_sprite_from_db(id_sprite):
 # ==========================
 def draw_text(text, x, y, size=16, color=(255, 255, 255, 255), font_name=None, align='left'):
     """
-    Desenha texto na tela usando pygame.font para rasterizar e OpenGL para exibir.
-    Suporta múltiplas linhas separadas por "\n".
+    Desenha texto na tela usando o atlas de glifos de core/text.py.
+    Suporta múltiplas linhas separadas por "\n". Dentro de um lote
+    (TextRenderer.begin/flush) o texto só é enviado no flush.
 
     Args:
         text (str): Texto a ser desenhado. Se vazio, não desenha.
@@ -196,82 +261,8 @@ def draw_text(text, x, y, size=16, color=(255, 255, 255, 255), font_name=None, a
         (width, height): tamanho em pixels do bloco de texto renderizado (máx largura, soma alturas).
     """
     try:
-        if text is None or text == "":
-            return 0, 0
-
-        # Garante inicialização da fonte
-        if not pygame.font.get_init():
-            pygame.font.init()
-
-        # Normaliza a cor para RGBA
-        if isinstance(color, (list, tuple)) and len(color) == 3:
-            r, g, b = color
-            a = 255
-        elif isinstance(color, (list, tuple)) and len(color) == 4:
-            r, g, b, a = color
-        else:
-            r, g, b, a = 255, 255, 255, 255
-
-        font = pygame.font.SysFont(font_name, size)
-        lines = str(text).splitlines()  # respeita \n 
-        line_height = font.get_linesize()
-
-        total_height = 0
-        max_width = 0
-        start_y = int(y)
-
-        for idx, line in enumerate(lines):
-            # Evita linha totalmente vazia ter altura zero visual
-            render_text = line if line != "" else " "
-            surface = font.render(render_text, True, (r, g, b, a))
-            width, height = surface.get_size()
-            max_width = max(max_width, width)
-
-            # Alinhamento por linha
-            if align == 'center':
-                draw_x = int(x - width // 2)
-            elif align == 'right':
-                draw_x = int(x - width)
-            else:
-                draw_x = int(x)
-
-            draw_y = start_y + total_height
-
-            # OpenGL utiliza origem diferente no texto; espelha vertical para corresponder
-            surface = pygame.transform.flip(surface, False, True)
-            image_data = pygame.image.tostring(surface, "RGBA", True)
-
-            # Cria textura temporária
-            tex_id = glGenTextures(1)
-            glBindTexture(GL_TEXTURE_2D, tex_id)
-            glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, image_data)
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
-
-            # Mistura alfa para texto com transparência
-            glEnable(GL_TEXTURE_2D)
-            glEnable(GL_BLEND)
-            glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-
-            # Desenha quad
-            glBegin(GL_QUADS)
-            glTexCoord2f(0.0, 0.0); glVertex2f(draw_x, draw_y)
-            glTexCoord2f(1.0, 0.0); glVertex2f(draw_x + width, draw_y)
-            glTexCoord2f(1.0, 1.0); glVertex2f(draw_x + width, draw_y + height)
-            glTexCoord2f(0.0, 1.0); glVertex2f(draw_x, draw_y + height)
-            glEnd()
-
-            # Limpa estado da textura desta linha
-            glBindTexture(GL_TEXTURE_2D, 0)
-            try:
-                glDeleteTextures(int(tex_id))
-            except Exception:
-                pass
-
-            # Avança para a próxima linha respeitando o espaçamento padrão
-            total_height += line_height
-
-        return max_width, total_height if total_height > 0 else line_height
+        from core.text import TextRenderer
+        return TextRenderer.draw(text, x, y, size, color, font_name, align)
     except Exception as e:
         print(f"Erro ao desenhar texto: {e}")
         return 0, 0
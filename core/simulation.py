@@ -0,0 +1,77 @@
+import time
+from core.condition_nodes import BehaviorScheduler
+from core.entity import AreaControl, BrControl, EControl, PControl, PrjControl, ItControl
+from core.event import EventControl, RaidControl
+from core.pathservice import PathService
+from core.profiler import Profiler
+from utils.input import control, SIM_EDGE_KEYS
+
+# Etapas de um tick, na ordem em que o jogo as executa. Os nomes são os
+# usados nos relatórios de tempo (core/headless.py).
+TICK_STEPS = ('BehaviorWake', 'EntityTick', 'PlayerTick', 'EventTick', 'RaidControl',
+              'PrjTick', 'AreaTick', 'BrControl', 'ItControl', 'PathService', 'PlayerControl')
+
+
+def _player_control(input, game_map):
+    main_player = PControl.get_main_player()
+    if main_player and input is not None:
+        control(input, main_player, game_map)
+        PControl.grid.update(main_player)
+        # Toques (tecla pressionada neste frame) valem só para o primeiro tick do frame
+        input.clear_edges(SIM_EDGE_KEYS)
+
+
+def tick(game_map, dt, input=None, timings=None):
+    """Executa um tick de simulação de duração fixa `dt` (segundos).
+
+    Usado tanto pelo loop do jogo (Game.tick) quanto pelo modo headless.
+    Se `timings` for um dicionário, soma nele o tempo (s) gasto em cada
+    etapa de TICK_STEPS; com o Profiler ligado, cada etapa vira um escopo.
+    """
+    steps = (
+        ('BehaviorWake', BehaviorScheduler.run, ()),
+        ('EntityTick', EControl.run, (game_map, dt)),
+        ('PlayerTick', PControl.run, (game_map, dt)),
+        ('EventTick', EventControl.run, (time.time(),)),
+        ('RaidControl', RaidControl.run, ()),
+        ('PrjTick', PrjControl.run, (game_map, dt)),
+        ('AreaTick', AreaControl.run, (game_map, dt)),
+        ('BrControl', BrControl.run, (game_map, dt)),
+        ('ItControl', ItControl.run, (game_map, dt)),
+        ('PathService', PathService.run, (game_map, dt)),
+        ('PlayerControl', _player_control, (input, game_map)),
+    )
+    if timings is None and not Profiler.enabled:
+        for name, fn, args in steps:
+            fn(*args)
+        return
+    clock = time.perf_counter
+    for name, fn, args in steps:
+        start = clock()
+        fn(*args)
+        end = clock()
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + end - start
+        Profiler.record(name, start, end)
+
+
+def reset_world():
+    """Esvazia todos os controladores (entidades, eventos, raids e pedidos de caminho)."""
+    for controller, registry in ((EControl, EControl.Entities),
+                                 (PControl, PControl.Players),
+                                 (BrControl, BrControl.Breakables),
+                                 (ItControl, ItControl.items)):
+        for obj in list(registry):
+            controller.rem(obj.id)
+        controller.grid.clear()
+    PrjControl.clear()
+    for area in list(AreaControl.Areas):
+        AreaControl.rem(area.id)
+    EventControl.clear()
+    RaidControl.Raids = []
+    RaidControl.current_raid_index = 0
+    RaidControl.active = False
+    RaidControl.has_been_activated = False
+    RaidControl.lock_breakables = []
+    PathService.reset()
+    BehaviorScheduler.reset()
@@ -0,0 +1,145 @@
+import math
+
+
+class SpatialHash:
+    """Índice espacial uniforme (broadphase) baseado em células quadradas.
+
+    Cada objeto (qualquer coisa com posx, posy, sizex, sizey) é registrado em
+    todas as células que sua hitbox cobre. As consultas devolvem apenas os
+    objetos das células tocadas pela região pedida; o teste exato (AABB,
+    proximidade etc.) fica a cargo de quem consulta.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}    # (cx, cy) -> {obj: None} (dict mantém ordem de inserção)
+        self._spans = {}   # obj -> (cx0, cy0, cx1, cy1)
+
+    def _span(self, x, y, w, h):
+        # Última célula tocada por [x, x+w): ceil((x + w) / cs) - 1 vale também para bordas fracionárias
+        cs = self.cell_size
+        cx0, cy0 = math.floor(x / cs), math.floor(y / cs)
+        cx1 = max(cx0, math.ceil((x + w) / cs) - 1)
+        cy1 = max(cy0, math.ceil((y + h) / cs) - 1)
+        return (cx0, cy0, cx1, cy1)
+
+    def _span_of(self, obj):
+        return self._span(obj.posx, obj.posy, getattr(obj, 'sizex', 0), getattr(obj, 'sizey', 0))
+
+    def _link(self, obj, span):
+        cx0, cy0, cx1, cy1 = span
+        cells = self.cells
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    bucket = cells[(cx, cy)] = {}
+                bucket[obj] = None
+
+    def _unlink(self, obj, span):
+        cx0, cy0, cx1, cy1 = span
+        cells = self.cells
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.pop(obj, None)
+                    if not bucket:
+                        del cells[(cx, cy)]
+
+    def insert(self, obj):
+        if obj in self._spans:
+            self.update(obj)
+            return
+        span = self._span_of(obj)
+        self._spans[obj] = span
+        self._link(obj, span)
+
+    def remove(self, obj):
+        span = self._spans.pop(obj, None)
+        if span is not None:
+            self._unlink(obj, span)
+
+    def update(self, obj):
+        """Reposiciona um objeto já indexado (não faz nada se ele foi removido)."""
+        old = self._spans.get(obj)
+        if old is None:
+            return
+        span = self._span_of(obj)
+        if span == old:
+            return
+        self._unlink(obj, old)
+        self._spans[obj] = span
+        self._link(obj, span)
+
+    def clear(self):
+        self.cells.clear()
+        self._spans.clear()
+
+    def __contains__(self, obj):
+        return obj in self._spans
+
+    def __len__(self):
+        return len(self._spans)
+
+    def query_rect(self, x, y, w, h):
+        """Candidatos cujas células tocam o retângulo [x, x+w) x [y, y+h)."""
+        cx0, cy0, cx1, cy1 = self._span(x, y, w, h)
+        cells = self.cells
+        if cx0 == cx1 and cy0 == cy1:
+            bucket = cells.get((cx0, cy0))
+            return list(bucket) if bucket else []
+        found = {}
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return list(found)
+
+    def query_radius(self, cx, cy, radius):
+        """Objetos cuja hitbox intersecta o círculo de centro (cx, cy) e raio `radius`."""
+        result = []
+        r2 = radius * radius
+        for obj in self.query_rect(cx - radius, cy - radius, radius * 2 + 1, radius * 2 + 1):
+            # Ponto da hitbox mais próximo do centro
+            nx = min(max(cx, obj.posx), obj.posx + getattr(obj, 'sizex', 0))
+            ny = min(max(cy, obj.posy), obj.posy + getattr(obj, 'sizey', 0))
+            if (nx - cx) ** 2 + (ny - cy) ** 2 <= r2:
+                result.append(obj)
+        return result
+
+
+def aabb_overlap(a, b):
+    """Sobreposição estrita entre as hitboxes de dois objetos (posx, posy, sizex, sizey)."""
+    return (a.posx < b.posx + b.sizex and a.posx + a.sizex > b.posx and
+            a.posy < b.posy + b.sizey and a.posy + a.sizey > b.posy)
+
+
+def rect_overlap(ax, ay, aw, ah, bx, by, bw, bh):
+    """Mesmo teste de aabb_overlap, recebendo os retângulos explicitamente."""
+    return ax < bx + bw and ax + aw > bx and ay < by + bh and ay + ah > by
+
+
+def swept_aabb(ax, ay, aw, ah, dx, dy, bx, by, bw, bh):
+    """Fração t em [0, 1] do movimento (dx, dy) da caixa A em que ela passa a sobrepor B.
+
+    Sobreposição estrita, como em aabb_overlap (encostar não conta). Se A já
+    sobrepõe B no início, t = 0. Retorna None se não há sobreposição no trajeto.
+    """
+    enter, leave = 0.0, 1.0
+    for a, size, d, b, other in ((ax, aw, dx, bx, bw), (ay, ah, dy, by, bh)):
+        # No eixo, A sobrepõe B quando lo < a < hi
+        lo, hi = b - size, b + other
+        if d == 0:
+            if not lo < a < hi:
+                return None
+            continue
+        t0, t1 = (lo - a) / d, (hi - a) / d
+        if t0 > t1:
+            t0, t1 = t1, t0
+        enter = max(enter, t0)
+        leave = min(leave, t1)
+        if enter >= leave:
+            return None
+    return enter
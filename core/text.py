@@ -0,0 +1,235 @@
+import pygame
+import numpy as np
+from collections import OrderedDict
+from OpenGL.GL import *
+
+# Tamanho (px) de cada página do atlas de glifos
+ATLAS_SIZE = 512
+# Espaço entre glifos no atlas (evita que o filtro pegue o vizinho)
+GLYPH_PADDING = 1
+# Quantidade máxima de textos com layout guardado
+LAYOUT_CACHE_SIZE = 4096
+
+
+class GlyphAtlas:
+    """Atlas de glifos de uma fonte (nome, tamanho).
+
+    Cada caractere é rasterizado em branco uma única vez, na primeira vez que
+    aparece, e copiado para uma página de textura compartilhada (empacotamento
+    em prateleiras). A cor do texto é aplicada por vértice na hora de desenhar.
+    """
+
+    def __init__(self, font, size=ATLAS_SIZE):
+        self.font = font
+        self.size = size
+        self.line_height = font.get_linesize()
+        self.pages = []      # ids de textura
+        self.glyphs = {}     # caractere -> (página, w, h, u1, v1, u2, v2)
+        self._x = self._y = self._row_h = 0
+
+    def _new_page(self):
+        tex_id = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, tex_id)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, self.size, self.size, 0, GL_RGBA, GL_UNSIGNED_BYTE,
+                     bytes(self.size * self.size * 4))
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        self.pages.append(tex_id)
+        self._x = self._y = self._row_h = 0
+
+    def glyph(self, ch):
+        g = self.glyphs.get(ch)
+        if g is not None:
+            return g
+        surface = self.font.render(ch, True, (255, 255, 255))
+        w, h = surface.get_size()
+        w = min(w, self.size)
+        h = min(h, self.size)
+        if not self.pages or self._x + w > self.size:
+            # Próxima prateleira
+            if self.pages:
+                self._x = 0
+                self._y += self._row_h + GLYPH_PADDING
+                self._row_h = 0
+        if not self.pages or self._y + h > self.size:
+            self._new_page()
+        page = len(self.pages) - 1
+        if w > 0 and h > 0:
+            data = pygame.image.tostring(surface.subsurface((0, 0, w, h)), "RGBA", False)
+            glBindTexture(GL_TEXTURE_2D, self.pages[page])
+            glTexSubImage2D(GL_TEXTURE_2D, 0, self._x, self._y, w, h, GL_RGBA, GL_UNSIGNED_BYTE, data)
+        s = float(self.size)
+        g = (page, w, h, self._x / s, self._y / s, (self._x + w) / s, (self._y + h) / s)
+        self.glyphs[ch] = g
+        self._x += w + GLYPH_PADDING
+        self._row_h = max(self._row_h, h)
+        return g
+
+    def close(self):
+        if self.pages:
+            glDeleteTextures(self.pages)
+        self.pages = []
+        self.glyphs = {}
+
+
+class TextRenderer:
+    """Texto com OpenGL usando cache de fontes, atlas de glifos e cache de layout.
+
+    - Fontes: pygame.font.SysFont é chamado uma vez por (nome, tamanho).
+    - Layout: para cada (texto, nome, tamanho, alinhamento) guarda os quads
+      relativos à origem e o tamanho do bloco, então um texto repetido
+      (ex.: "30/30hp") não percorre os glifos de novo.
+    - Lote: entre begin() e flush() os quads vão para um buffer e são
+      enviados de uma vez (um glDrawArrays por página de atlas). Fora de um
+      lote, cada draw é enviado na hora, já usando o atlas.
+    """
+    fonts = {}       # (nome, tamanho) -> pygame.font.Font
+    atlases = {}     # (nome, tamanho) -> GlyphAtlas
+    layouts = OrderedDict()
+    _batch = None    # página -> lista de vértices (u, v, r, g, b, a, x, y)
+    _depth = 0
+    # Estatísticas do último envio (usadas pelo benchmark)
+    draw_calls = 0
+    quads = 0
+
+    def get_font(name, size):
+        key = (name, size)
+        font = TextRenderer.fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = TextRenderer.fonts[key] = pygame.font.SysFont(name, size)
+        return font
+
+    def get_atlas(name, size):
+        key = (name, size)
+        atlas = TextRenderer.atlases.get(key)
+        if atlas is None:
+            atlas = TextRenderer.atlases[key] = GlyphAtlas(TextRenderer.get_font(name, size))
+        return atlas
+
+    def layout(text, name, size, align):
+        """Quads (página, x1, y1, x2, y2, u1, v1, u2, v2) relativos à origem e o tamanho do bloco."""
+        key = (text, name, size, align)
+        cache = TextRenderer.layouts
+        entry = cache.get(key)
+        if entry is not None:
+            cache.move_to_end(key)
+            return entry
+
+        atlas = TextRenderer.get_atlas(name, size)
+        quads = []
+        max_width = 0
+        total_height = 0
+        for line in text.splitlines() or [""]:
+            # Evita linha totalmente vazia ter altura zero visual
+            line = line if line != "" else " "
+            glyphs = [atlas.glyph(ch) for ch in line]
+            width = sum(g[1] for g in glyphs)
+            max_width = max(max_width, width)
+            # Alinhamento por linha
+            if align == 'center':
+                pen_x = -(width // 2)
+            elif align == 'right':
+                pen_x = -width
+            else:
+                pen_x = 0
+            for page, w, h, u1, v1, u2, v2 in glyphs:
+                if w and h:
+                    quads.append((page, pen_x, total_height, pen_x + w, total_height + h, u1, v1, u2, v2))
+                pen_x += w
+            total_height += atlas.line_height
+
+        entry = (atlas, quads, max_width, total_height if total_height > 0 else atlas.line_height)
+        cache[key] = entry
+        if len(cache) > LAYOUT_CACHE_SIZE:
+            cache.popitem(last=False)
+        return entry
+
+    def begin():
+        """Abre um lote: os textos seguintes só são enviados no flush()."""
+        if TextRenderer._depth == 0:
+            TextRenderer._batch = {}
+        TextRenderer._depth += 1
+
+    def flush():
+        """Fecha o lote aberto por begin() e envia todo o texto acumulado."""
+        if TextRenderer._depth == 0:
+            return
+        TextRenderer._depth -= 1
+        if TextRenderer._depth == 0:
+            batch = TextRenderer._batch
+            TextRenderer._batch = None
+            TextRenderer._submit(batch)
+
+    def draw(text, x, y, size=16, color=(255, 255, 255, 255), font_name=None, align='left'):
+        if text is None or text == "":
+            return 0, 0
+
+        # Normaliza a cor para RGBA (0-1)
+        if isinstance(color, (list, tuple)) and len(color) == 3:
+            r, g, b = color
+            a = 255
+        elif isinstance(color, (list, tuple)) and len(color) == 4:
+            r, g, b, a = color
+        else:
+            r, g, b, a = 255, 255, 255, 255
+        r, g, b, a = r / 255.0, g / 255.0, b / 255.0, a / 255.0
+
+        atlas, quads, width, height = TextRenderer.layout(str(text), font_name, size, align)
+        ox = int(x)
+        oy = int(y)
+        batch = TextRenderer._batch if TextRenderer._depth else {}
+        for page, x1, y1, x2, y2, u1, v1, u2, v2 in quads:
+            verts = batch.get((atlas, page))
+            if verts is None:
+                verts = batch[(atlas, page)] = []
+            x1 += ox; x2 += ox; y1 += oy; y2 += oy
+            verts.extend((
+                u1, v1, r, g, b, a, x1, y1,
+                u2, v1, r, g, b, a, x2, y1,
+                u2, v2, r, g, b, a, x2, y2,
+                u1, v2, r, g, b, a, x1, y2,
+            ))
+        if not TextRenderer._depth:
+            TextRenderer._submit(batch)
+        return width, height
+
+    def _submit(batch):
+        TextRenderer.draw_calls = 0
+        TextRenderer.quads = 0
+        if not batch:
+            return
+        glEnable(GL_TEXTURE_2D)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        try:
+            for (atlas, page), verts in batch.items():
+                data = np.asarray(verts, dtype=np.float32).reshape(-1, 8)
+                tex = np.ascontiguousarray(data[:, 0:2])
+                col = np.ascontiguousarray(data[:, 2:6])
+                pos = np.ascontiguousarray(data[:, 6:8])
+                glBindTexture(GL_TEXTURE_2D, atlas.pages[page])
+                glTexCoordPointer(2, GL_FLOAT, 0, tex)
+                glColorPointer(4, GL_FLOAT, 0, col)
+                glVertexPointer(2, GL_FLOAT, 0, pos)
+                glDrawArrays(GL_QUADS, 0, len(data))
+                TextRenderer.draw_calls += 1
+                TextRenderer.quads += len(data) // 4
+        finally:
+            glDisableClientState(GL_COLOR_ARRAY)
+            glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
+            glBindTexture(GL_TEXTURE_2D, 0)
+            glColor4f(1.0, 1.0, 1.0, 1.0)
+
+    def clear():
+        """Libera atlas e caches (ex.: ao recriar o contexto OpenGL)."""
+        for atlas in TextRenderer.atlases.values():
+            atlas.close()
+        TextRenderer.atlases = {}
+        TextRenderer.fonts = {}
+        TextRenderer.layouts = OrderedDict()
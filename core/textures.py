@@ -0,0 +1,128 @@
+import os
+from collections import OrderedDict
+
+# Orçamento padrão de memória de vídeo para texturas sem referência (MB)
+DEFAULT_VRAM_BUDGET_MB = 256
+
+
+class TextureEntry:
+    def __init__(self, path, texture_id, width, height):
+        self.path = path
+        self.texture_id = texture_id
+        self.width = width
+        self.height = height
+        self.bytes = width * height * 4  # RGBA8
+        self.refs = 0
+
+
+class TextureManager:
+    """Gerenciador central de texturas OpenGL.
+
+    - Uma textura por caminho normalizado: carregar o mesmo arquivo de novo
+      devolve o mesmo id de textura (sem novo upload).
+    - Contagem de referências: acquire() soma e release() subtrai.
+    - Quando a memória ocupada passa do orçamento (saves/config.yaml,
+      textures.vram_budget_mb), as texturas sem referência menos usadas
+      recentemente são liberadas da GPU.
+    """
+    entries = OrderedDict()   # caminho -> TextureEntry (mais antigas primeiro)
+    budget_bytes = DEFAULT_VRAM_BUDGET_MB * 1024 * 1024
+    bytes_resident = 0
+    uploads = 0
+    hits = 0
+    misses = 0
+    evictions = 0
+    # Sem contexto OpenGL (core/headless.py): só lê o tamanho das imagens
+    headless = False
+
+    def configure(config):
+        """Lê a seção `textures` do config.yaml."""
+        budget_mb = (config or {}).get('vram_budget_mb', DEFAULT_VRAM_BUDGET_MB)
+        TextureManager.budget_bytes = int(float(budget_mb) * 1024 * 1024)
+        TextureManager.evict()
+
+    def normalize(path):
+        """Caminho canônico usado como chave (inclui o fallback para 'assets/')."""
+        path = str(path).replace("\\", "/")
+        if not os.path.exists(path) and not path.startswith("assets/"):
+            alt_path = "assets/" + path
+            if os.path.exists(alt_path):
+                path = alt_path
+        return os.path.normpath(path).replace("\\", "/")
+
+    def acquire(path):
+        """Retorna (texture_id, largura, altura) e registra uma referência."""
+        key = TextureManager.normalize(path)
+        entry = TextureManager.entries.get(key)
+        if entry is not None:
+            TextureManager.hits += 1
+            TextureManager.entries.move_to_end(key)
+        else:
+            TextureManager.misses += 1
+            if TextureManager.headless:
+                width, height = TextureManager._probe_size(key)
+                entry = TextureEntry(key, 0, 0, 0)
+                entry.width, entry.height = width, height
+            else:
+                from core.resources import load_texture
+                texture_id, width, height = load_texture(key)
+                entry = TextureEntry(key, texture_id, width, height)
+            TextureManager.entries[key] = entry
+            TextureManager.uploads += 1
+            TextureManager.bytes_resident += entry.bytes
+        entry.refs += 1
+        TextureManager.evict()
+        return entry.texture_id, entry.width, entry.height
+
+    def release(path):
+        key = TextureManager.normalize(path)
+        entry = TextureManager.entries.get(key)
+        if entry is None or entry.refs <= 0:
+            return
+        entry.refs -= 1
+        if entry.refs == 0:
+            TextureManager.evict()
+
+    def _probe_size(path):
+        import pygame
+        try:
+            return pygame.image.load(path).get_size()
+        except Exception:
+            raise FileNotFoundError(f"Não foi possível carregar a textura: '{path}'")
+
+    def evict():
+        """Libera texturas sem referência (LRU) até caber no orçamento."""
+        if TextureManager.bytes_resident <= TextureManager.budget_bytes:
+            return
+        for key, entry in list(TextureManager.entries.items()):
+            if TextureManager.bytes_resident <= TextureManager.budget_bytes:
+                break
+            if entry.refs == 0:
+                TextureManager._delete(key)
+                TextureManager.evictions += 1
+
+    def _delete(key):
+        entry = TextureManager.entries.pop(key)
+        TextureManager.bytes_resident -= entry.bytes
+        if entry.texture_id:
+            try:
+                # Import tardio: o modo headless (ids 0) roda sem PyOpenGL
+                from OpenGL.GL import glDeleteTextures
+                glDeleteTextures([entry.texture_id])
+            except Exception:
+                pass
+
+    def stats():
+        lookups = TextureManager.hits + TextureManager.misses
+        return {
+            'textures': len(TextureManager.entries),
+            'uploads': TextureManager.uploads,
+            'bytes_resident': TextureManager.bytes_resident,
+            'hit_rate': TextureManager.hits / lookups if lookups else 0.0,
+            'evictions': TextureManager.evictions,
+        }
+
+    def clear():
+        """Libera todas as texturas (ex.: ao encerrar o contexto OpenGL)."""
+        for key in list(TextureManager.entries):
+            TextureManager._delete(key)
@@ -0,0 +1,111 @@
+"""
+Volumes de gatilho dos eventos (core/event.py): retângulos e círculos no mapa.
+
+Em vez de cada evento testar a distância até o player com uma lambda a
+cada tick, o evento guarda um volume declarativo, indexado num
+SpatialHash. A cada tick o TriggerIndex consulta só as células onde há
+players e devolve quais volumes ganharam, mantiveram ou perderam players
+(entrar / permanecer / sair). Só os eventos desses volumes são avaliados.
+
+No banco (tabela Events), o volume fica em condition_type/condition_data:
+- 'proximidade': {"posx", "posy", "raio"}, círculo;
+- 'area': {"posx", "posy", "sizex", "sizey"}, retângulo.
+A chave opcional "on" ('enter', 'stay' ou 'exit') escolhe quando o
+evento é avaliado. O padrão é 'stay': a cada tick com um player dentro,
+como as lambdas de proximidade antigas.
+"""
+from core.spatial import SpatialHash
+
+# Tamanho (px) das células do índice de volumes; volumes costumam ser salas/raios de ~100-300 px
+TRIGGER_CELL_SIZE = 256
+
+ENTER, STAY, EXIT = 'enter', 'stay', 'exit'
+TRIGGER_TYPES = ('proximidade', 'area')
+
+
+class TriggerVolume:
+    """Região do mapa (círculo ou retângulo). posx/posy/sizex/sizey é a caixa usada no índice."""
+
+    def __init__(self, kind, posx, posy, sizex, sizey, on=STAY):
+        if on not in (ENTER, STAY, EXIT):
+            raise ValueError(f"gatilho desconhecido: {on!r}")
+        self.kind = kind
+        self.posx, self.posy = posx, posy
+        self.sizex, self.sizey = sizex, sizey
+        self.on = on
+        self.event = None   # evento dono (preenchido pelo EventControl)
+
+    def to_data(self):
+        """(condition_type, condition_data) para gravar no banco."""
+        if self.kind == 'proximidade':
+            radius = self.sizex / 2
+            data = {"posx": self.posx + radius, "posy": self.posy + radius, "raio": radius}
+        else:
+            data = {"posx": self.posx, "posy": self.posy, "sizex": self.sizex, "sizey": self.sizey}
+        if self.on != STAY:
+            data["on"] = self.on
+        return self.kind, data
+
+    def contains(self, x, y):
+        if self.kind == 'proximidade':
+            radius = self.sizex / 2
+            dx = x - self.posx - radius
+            dy = y - self.posy - radius
+            return dx * dx + dy * dy <= radius * radius
+        return self.posx <= x < self.posx + self.sizex and self.posy <= y < self.posy + self.sizey
+
+    def __repr__(self):
+        return f"TriggerVolume({self.kind}, {self.posx}, {self.posy}, {self.sizex}x{self.sizey}, {self.on})"
+
+
+def circle_trigger(x, y, radius, on=STAY):
+    return TriggerVolume('proximidade', x - radius, y - radius, 2 * radius, 2 * radius, on)
+
+
+def rect_trigger(x, y, sizex, sizey, on=STAY):
+    return TriggerVolume('area', x, y, sizex, sizey, on)
+
+
+def trigger_from_data(condition_type, data):
+    """Volume a partir das colunas condition_type/condition_data, ou None se não há volume."""
+    if condition_type not in TRIGGER_TYPES or not data:
+        return None
+    on = data.get('on', STAY)
+    if condition_type == 'proximidade':
+        return circle_trigger(data['posx'], data['posy'], data['raio'], on)
+    return rect_trigger(data['posx'], data['posy'], data['sizex'], data['sizey'], on)
+
+
+class TriggerIndex:
+    """Volumes num SpatialHash e, entre ticks, quais deles têm players dentro."""
+
+    def __init__(self, cell_size=TRIGGER_CELL_SIZE):
+        self.grid = SpatialHash(cell_size)
+        self.inside = {}   # volume -> quantos pontos estavam dentro no último update
+
+    def add(self, volume):
+        self.grid.insert(volume)
+
+    def remove(self, volume):
+        self.grid.remove(volume)
+        self.inside.pop(volume, None)
+
+    def clear(self):
+        self.grid.clear()
+        self.inside = {}
+
+    def update(self, points):
+        """Testa os pontos (x, y) e retorna (entraram, dentro, saíram), listas de volumes."""
+        current = {}
+        for x, y in points:
+            for volume in self.grid.query_rect(x, y, 1, 1):
+                if volume.contains(x, y):
+                    current[volume] = current.get(volume, 0) + 1
+        previous = self.inside
+        entered = [volume for volume in current if volume not in previous]
+        exited = [volume for volume in previous if volume not in current]
+        self.inside = current
+        return entered, list(current), exited
+
+    def __len__(self):
+        return len(self.grid)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Teste dos feixes e anéis de dano (core/area.py)"""
+import math
+from types import SimpleNamespace
+
+import numpy as np
+
+from assets.behaviors.prj import WAVE_AMPLITUDE, WAVE_FREQUENCY, wave_motion
+from core.area import Beam, Ring, raycast, segment_hits_box
+from core.clock import SimClock
+from core.projectiles import ProjectileEngine
+
+
+def box(type, id, x, y, size=32):
+    return SimpleNamespace(type=type, id=id, posx=x, posy=y, sizex=size, sizey=size)
+
+
+def walls_grid():
+    walls = np.zeros((10, 10), dtype=bool)
+    walls[:, 6] = True   # parede vertical em x = 192..224 px
+    return walls
+
+
+def test_raycast_and_segment():
+    walls = walls_grid()
+    assert raycast(walls, 32, 32, 16, 16, 1.0, 0.0, 1000) == 192 - 16
+    assert raycast(walls, 32, 32, 16, 16, -1.0, 0.0, 300) == 300
+    assert raycast(None, 32, 32, 16, 16, 1.0, 0.0, 50) == 50
+    # Diagonal: cruza x = 192 em 176 * sqrt(2)
+    d = 1 / math.sqrt(2)
+    assert abs(raycast(walls, 32, 32, 16, 16, d, d, 1000) - 176 * math.sqrt(2)) < 1e-9
+    assert segment_hits_box(0, 0, 100, 100, 40, 40, 5, 5)
+    assert not segment_hits_box(0, 0, 100, 0, 40, 10, 5, 5)
+
+
+def test_beam_is_cut_by_walls_and_rate_limited():
+    saved = SimClock.time
+    try:
+        SimClock.time = 0.0
+        boss = box('mob', 1, 0, 0)
+        beam = Beam(boss, 16, 16, 1.0, 0.0, max_length=1000, width=16, damage=5,
+                    hit_interval=0.1, duration=2.0)
+        assert beam.update(walls_grid(), 32, 32, SimClock.dt) and beam.length == 176
+        near, behind = box('player', 1, 100, 4), box('player', 2, 260, 4)
+        assert beam.hit(near) == 5 and beam.hit(near) == 0
+        assert beam.hit(behind) == 0
+        SimClock.time = 0.1
+        assert beam.hit(near) == 5
+        # Giro limitado por tick
+        beam.aim(16, 16, 0.0, 1.0, max_turn=math.radians(10))
+        assert abs(math.atan2(beam.diry, beam.dirx) - math.radians(10)) < 1e-9
+        SimClock.time = 2.0
+        assert not beam.update(None, 32, 32, SimClock.dt)
+    finally:
+        SimClock.time = saved
+
+
+def test_ring_spokes_hit_once_and_stop_at_walls():
+    boss = box('mob', 1, 0, 0)
+    ring = Ring(boss, 96, 160, angles=[0.0, math.pi / 2, math.pi], start_radius=16,
+                speed=60.0, spoke_size=16, damage=20, max_radius=400)
+    player = box('player', 1, 96 - 8, 160 + 40)   # no caminho do raio para baixo
+    hits = 0
+    for _ in range(120):
+        if not ring.update(walls_grid(), 32, 32, 1 / 60):
+            break
+        hits += ring.hit(player)
+    assert hits == 20
+    # Raio para a direita para na parede (x = 192), os outros seguem até max_radius
+    assert ring.reach[0] == 192 - 96 and not ring.alive[0]
+    assert ring.alive == [False, False, True]
+    assert len(ring.polygons()) == 1
+
+
+def test_wave_beam_follows_wave_projectile_trail():
+    speed = 1.5
+    boss = box('mob', 1, 0, 0)
+    beam = Beam(boss, 0, 100, 1.0, 0.0, max_length=400, width=16, damage=5, hit_interval=0.1,
+                duration=2.0, wave_amplitude=WAVE_AMPLITUDE, wave_length=2 * math.pi * speed / WAVE_FREQUENCY)
+    # Disparos em onda, um por tick, da mesma origem: ficam todos sobre a curva do feixe
+    engine = ProjectileEngine()
+    for tick in range(120):
+        engine.spawn(tick, tick, 0.0, 100.0, 1.0, 0.0, speed, 1.0, 1, 1000, 16, 16, wave_motion)
+        engine.step()
+    for row in range(engine.count):
+        x, y = beam._curve(engine.x[row])
+        assert abs(x - engine.x[row]) < 1e-9 and abs(y - engine.y[row]) < 1e-9
+    assert beam.update(None, 32, 32, SimClock.dt) and beam.length == 400
+    # Um quarto de período: a onda está 40 px abaixo do eixo
+    quarter = beam.wave_length / 4
+    on_axis, on_crest = box('player', 1, quarter - 4, 100 - 4, 8), box('player', 2, quarter - 4, 140 - 4, 8)
+    assert beam.hit(on_axis) == 0 and beam.hit(on_crest) == 5
+    assert beam.bounds()[3] >= 100 + WAVE_AMPLITUDE
+    # A parede (x = 192) corta a curva onde ela a encontra
+    assert beam.update(walls_grid(), 32, 32, SimClock.dt)
+    assert abs(beam.points[-1][0] - 192) < 1e-9 and beam.length == 192
+    assert len(beam.polygons()) == len(beam.points) - 1
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Teste do behavior tree compilado (core/condition_nodes.CompiledTree)"""
+import random
+
+from core.clock import SimClock
+from core.condition_nodes import (ActionNode, BehaviorScheduler, CompiledTree, ConditionNode,
+                                  FAILURE, MemorySequenceNode, RUNNING, SUCCESS, SelectorNode,
+                                  SequenceNode, stable_condition, wake_hint)
+from core.profiler import Profiler
+
+
+class Mob:
+    def __init__(self, answers=None):
+        self.answers = answers or {}
+        self.blackboard = None
+
+
+def random_tree(rng, calls, depth=0):
+    """Árvore aleatória cujas folhas registram em `calls` a ordem de execução."""
+    kind = rng.random()
+    if depth >= 3 or kind < 0.35:
+        name = f"leaf{rng.randrange(1000)}"
+        if rng.random() < 0.5:
+            def action(entity, map_ref, name=name):
+                calls.append(name)
+                # Ações só falham com FAILURE explícito; outros retornos (fora RUNNING) são sucesso
+                answer = entity.answers[name]
+                if answer is RUNNING:
+                    return RUNNING
+                return FAILURE if not answer else rng.choice((None, 0, SUCCESS))
+            return ActionNode(action)
+
+        def condition(entity, map_ref, name=name):
+            calls.append(name)
+            return bool(entity.answers[name])
+        return ConditionNode(condition)
+    children = [random_tree(rng, calls, depth + 1) for _ in range(rng.randrange(0, 4))]
+    return (SequenceNode if kind < 0.7 else SelectorNode)(children)
+
+
+def run_ticks(tree, mob, ticks):
+    """Roda `ticks` ticks de simulação (roda de timers + árvore)."""
+    for _ in range(ticks):
+        BehaviorScheduler.run()
+        tree.run(mob, None)
+        SimClock.step()
+
+
+def test_compiled_matches_nodes():
+    for seed in range(200):
+        calls = []
+        root = random_tree(random.Random(seed), calls)
+        compiled = CompiledTree(root)
+        mob = Mob()
+        for tick in range(5):
+            # Mesmas respostas das folhas nas duas execuções; a mesma entidade entre ticks
+            # (uma ação em RUNNING não muda o tick seguinte: a árvore é reativa)
+            state = random.Random(seed * 31 + tick)
+            mob.answers = {f"leaf{i}": (False, True, RUNNING)[int(state.random() * 2.4)] for i in range(1000)}
+            BehaviorScheduler.wake(mob)   # árvore que só falhou dorme; aqui todo tick roda
+            calls.clear()
+            expected = root.run(mob, None)
+            expected_calls = list(calls)
+            calls.clear()
+            assert compiled.run(mob, None) == expected
+            assert calls == expected_calls
+
+
+def test_running_leaf_is_reactive():
+    calls = []
+
+    def leaf(name, result=True):
+        def function(entity, map_ref):
+            calls.append(name)
+            return entity.answers.get(name, result)
+        function.__name__ = name
+        return function
+
+    def channel(entity, map_ref):
+        calls.append('channel')
+        entity.answers['left'] = entity.answers.get('left', 3) - 1
+        return RUNNING if entity.answers['left'] > 0 else SUCCESS
+
+    tree = CompiledTree(SelectorNode([
+        SequenceNode([ConditionNode(leaf('alarm', False)), ActionNode(leaf('flee'))]),
+        SequenceNode([ActionNode(leaf('walk')), ConditionNode(leaf('ready')), ActionNode(channel),
+                      ActionNode(leaf('finish'))]),
+    ]))
+    mob = Mob()
+    assert tree.run(mob, None) is RUNNING
+    # Próximo tick desde a raiz: guardas reavaliados e a ação anterior (walk) roda de novo
+    assert tree.run(mob, None) is RUNNING
+    assert calls == ['alarm', 'walk', 'ready', 'channel'] * 2
+
+    # Guarda de maior prioridade vira no meio da ação: ela não é mais chamada
+    calls.clear()
+    mob.answers['alarm'] = True
+    assert tree.run(mob, None) is SUCCESS
+    assert calls == ['alarm', 'flee']
+    # Guarda do próprio caminho falha: idem
+    calls.clear()
+    mob.answers.update(alarm=False, ready=False)
+    assert tree.run(mob, None) is FAILURE
+    assert calls == ['alarm', 'walk', 'ready']
+    # De volta: a ação continua de onde o blackboard parou
+    calls.clear()
+    mob.answers['ready'] = True
+    assert tree.run(mob, None) is SUCCESS
+    assert calls == ['alarm', 'walk', 'ready', 'channel', 'finish']
+    assert not mob.blackboard
+
+
+def test_memory_sequence_skips_finished_actions():
+    calls = []
+
+    def prepare(entity, map_ref):
+        calls.append('prepare')
+
+    def ready(entity, map_ref):
+        calls.append('ready')
+        return entity.answers.get('ready', True)
+
+    def channel(entity, map_ref):
+        calls.append('channel')
+        entity.answers['left'] = entity.answers.get('left', 3) - 1
+        return RUNNING if entity.answers['left'] > 0 else SUCCESS
+
+    tree = CompiledTree(MemorySequenceNode([ActionNode(prepare), ConditionNode(ready), ActionNode(channel)]))
+    mob = Mob()
+    assert tree.run(mob, None) is RUNNING
+    assert tree.run(mob, None) is RUNNING
+    # prepare já deu certo e não roda de novo; a condição é reavaliada
+    assert calls == ['prepare', 'ready', 'channel', 'ready', 'channel']
+    # Guarda falha: a memória some e a sequência recomeça do início
+    calls.clear()
+    mob.answers['ready'] = False
+    assert tree.run(mob, None) is FAILURE
+    assert 'bt_skip' not in mob.blackboard
+    mob.answers['ready'] = True
+    assert tree.run(mob, None) is SUCCESS
+    assert calls == ['ready', 'prepare', 'ready', 'channel']
+
+
+def test_stable_conditions_sleep_on_timer_wheel():
+    saved = SimClock.time, SimClock.ticks
+    BehaviorScheduler.reset()
+    calls = []
+
+    @stable_condition
+    def every_second(entity, map_ref):
+        calls.append(SimClock.ticks)
+        last = entity.answers.get('last')
+        if last is None or SimClock.time - last >= 1.0 - 1e-9:
+            entity.answers['last'] = SimClock.time
+            return True
+        wake_hint(entity, last + 1.0)
+        return False
+
+    def act(entity, map_ref):
+        entity.answers['acts'] = entity.answers.get('acts', 0) + 1
+
+    try:
+        SimClock.time, SimClock.ticks = 0.0, 0
+        tree = CompiledTree(SequenceNode([ConditionNode(every_second), ActionNode(act)]))
+        mob = Mob()
+        run_ticks(tree, mob, 10 * SimClock.tick_rate)
+        # Ação uma vez por segundo e a condição só roda perto desses instantes
+        assert mob.answers['acts'] == 10
+        assert len(calls) <= 2 * 10 + 1
+
+        # wake() e eventos acordam antes do horário
+        run_ticks(tree, mob, SimClock.tick_rate // 2)
+        assert 'bt_asleep' in mob.blackboard
+        BehaviorScheduler.wake(mob)
+        before = len(calls)
+        tree.run(mob, None)
+        assert len(calls) == before + 1
+        BehaviorScheduler.wait_event(mob, 'boss_enraged')
+        tree.run(mob, None)
+        assert len(calls) == before + 1
+        BehaviorScheduler.notify('boss_enraged')
+        tree.run(mob, None)
+        assert len(calls) == before + 2
+
+        # Entidade removida enquanto espera: sai da lista do evento
+        dead = Mob()
+        tree.run(dead, None)
+        BehaviorScheduler.wait_event(dead, 'boss_enraged')
+        BehaviorScheduler.wait_event(mob, 'boss_enraged')
+        BehaviorScheduler.forget(dead)
+        assert BehaviorScheduler.waiting['boss_enraged'] == [mob.blackboard]
+        BehaviorScheduler.forget(mob)
+        assert BehaviorScheduler.waiting == {} and 'bt_asleep' not in mob.blackboard
+    finally:
+        SimClock.time, SimClock.ticks = saved
+        BehaviorScheduler.reset()
+
+
+def test_compiled_profiles_leaves():
+    def check_hp(entity, map_ref):
+        return True
+
+    def attack(entity, map_ref):
+        entity.answers['attacked'] = True
+
+    compiled = CompiledTree(SequenceNode([ConditionNode(check_hp), ActionNode(attack)]))
+    Profiler.reset()
+    Profiler.enabled = True
+    try:
+        mob = Mob()
+        assert compiled.run(mob, None) is SUCCESS and mob.answers['attacked']
+        Profiler.end_frame()
+        assert {'bt.check_hp', 'bt.attack'} <= {row[0] for row in Profiler.stats()}
+    finally:
+        Profiler.enabled = False
+        Profiler.reset()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Teste do blackboard por entidade dos behaviors (core/condition_nodes.Blackboard)"""
+import gc
+import sys
+from types import SimpleNamespace
+
+from assets.behaviors import actions, conditions
+from core.condition_nodes import Blackboard, blackboard_of
+
+
+class FakeMob:
+    """Entidade mínima para rodar ações e condições sem o banco/OpenGL."""
+
+    def __init__(self, x, y):
+        self.posx, self.posy = x, y
+        self.sizex = self.sizey = 32
+        self.facing = "left"
+        self.attacking = False
+        self.stats = SimpleNamespace(hp=10, maxHp=10, speed=1.0, ace=0.3)
+        self.blackboard = None
+
+    def move(self, x, y, game_map):
+        self.posx += x
+        self.posy += y
+
+    def kill(self):
+        # Mesmo contrato de Entity.kill
+        self.blackboard = None
+
+
+GAME_MAP = SimpleNamespace(has_col_in_rect=lambda *args: False)
+
+
+def spawn_run_despawn(i):
+    mob = FakeMob(i % 500, i % 300)
+    conditions.timer_2s(mob)
+    conditions.timer_30s(mob)
+    actions.a1fun(mob, GAME_MAP)
+    actions.moveRat(mob, GAME_MAP)
+    actions.move_bombastic(mob, GAME_MAP)
+    actions.animRat(mob, GAME_MAP)
+    mob.kill()
+
+
+def test_state_is_per_entity():
+    a, b = FakeMob(0, 0), FakeMob(0, 0)
+    assert conditions.timer_2s(a) and not conditions.timer_2s(a)
+    # Timer de outra entidade não é afetado (antes: colidia pelo id)
+    assert conditions.timer_2s(b)
+    assert isinstance(a.blackboard, Blackboard) and a.blackboard is not b.blackboard
+    assert blackboard_of(a).section('timers') is a.blackboard['timers']
+    a.kill()
+    assert a.blackboard is None
+    # Nenhum estado de behavior sobra em nível de módulo
+    for module in (actions, conditions):
+        assert not [name for name, value in vars(module).items()
+                    if isinstance(value, dict) and name.startswith('_') and name.endswith(('_states', '_map'))]
+
+
+def test_soak_spawn_despawn_memory_is_flat():
+    for i in range(10000):
+        spawn_run_despawn(i)
+    gc.collect()
+    baseline = sys.getallocatedblocks()
+    for i in range(100000):
+        spawn_run_despawn(i)
+    gc.collect()
+    # Com os dicionários globais antigos, cada mob deixava suas entradas para trás
+    assert sys.getallocatedblocks() - baseline < 500
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Teste dos campos de fluxo compartilhados (core/flowfield.py)"""
+from collections import deque
+
+import numpy as np
+import pytest
+
+from core.clock import SimClock
+from core.flowfield import FlowFields
+
+
+@pytest.fixture
+def walls():
+    walls = np.zeros((20, 30), dtype=bool)
+    walls[2:18, 10] = True      # parede vertical com passagem embaixo
+    walls[5, 12:28] = True      # parede horizontal com passagem à direita
+    return walls
+
+
+def bfs(walls, goal):
+    h, w = walls.shape
+    dist = {goal: 0}
+    queue = deque([goal])
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            n = (x + dx, y + dy)
+            if 0 <= n[0] < w and 0 <= n[1] < h and not walls[n[1], n[0]] and n not in dist:
+                dist[n] = dist[(x, y)] + 1
+                queue.append(n)
+    return dist
+
+
+def test_flowfield(make_map, walls):
+    nav = make_map(walls).nav
+    flow = FlowFields(nav, radius=40)
+    goal = (20, 2)
+    field = flow.field_for('p1', goal)
+    expected = bfs(walls, goal)
+    for y in range(20):
+        for x in range(30):
+            assert field.distance(x, y) == expected.get((x, y)), (x, y)
+
+    # Seguindo os passos, qualquer tile alcançável chega ao objetivo sem atravessar parede
+    for start in ((2, 2), (2, 17), (15, 10), (29, 19)):
+        tile, steps = start, 0
+        while tile != goal:
+            dx, dy = field.step(*tile)
+            assert not walls[tile[1], tile[0] + dx] and not walls[tile[1] + dy, tile[0]]
+            tile = (tile[0] + dx, tile[1] + dy)
+            steps += 1
+            assert steps <= expected[start]
+    assert field.step(*goal) is None
+    # De um tile bloqueado (entidade encostada na parede) o passo leva de volta à área livre
+    dx, dy = field.step(10, 10)
+    assert field.distance(10 + dx, 10 + dy) is not None
+
+    # Cache: mesmo objetivo não recalcula; objetivo novo respeita o intervalo mínimo
+    builds = flow.builds
+    assert flow.field_for('p1', goal) is field
+    assert flow.field_for('p1', (21, 2)) is field
+    SimClock.ticks += flow.min_interval
+    assert flow.field_for('p1', (21, 2)) is not field
+    assert flow.builds == builds + 1
+
+    # Mudança na grade invalida o campo na hora
+    walls[2:18, 10] = False
+    nav.invalidate_tiles(10, 2, 10, 17)
+    field = flow.field_for('p1', (21, 2))
+    assert field.distance(2, 2) == 19
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Teste do pathfinding hierárquico (core/hpa.py)"""
+import random
+
+import numpy as np
+
+from core.flowfield import UNREACHABLE, bfs_distances
+from core.hpa import HierarchicalPathfinder, label_components
+
+
+def random_walls(seed, w=70, h=50):
+    return np.random.default_rng(seed).random((h, w)) < 0.25
+
+
+def check_path(path, walkable, start, goal):
+    assert path[0] == start and path[-1] == goal
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        assert abs(x1 - x0) + abs(y1 - y0) == 1
+        assert walkable[y1, x1]
+
+
+def test_components():
+    walk = np.array([[1, 1, 0, 1],
+                     [0, 1, 0, 1],
+                     [1, 1, 0, 0],
+                     [0, 0, 1, 1]], dtype=bool)
+    labels = label_components(walk)
+    assert labels[0, 0] == labels[2, 0] == labels[1, 1]
+    assert labels[0, 3] == labels[1, 3] != labels[0, 0]
+    assert labels[3, 2] not in (0, labels[0, 0], labels[0, 3])
+    assert (labels[~walk] == 0).all()
+
+
+def test_hpa_paths(make_map):
+    walls = random_walls(5)
+    nav = make_map(walls).nav
+    hpa = HierarchicalPathfinder(nav, 1, cluster_size=8)
+    walkable = nav.walkable_mask(1)
+    rng = random.Random(2)
+    free = [(x, y) for y in range(nav.height) for x in range(nav.width) if walkable[y, x]]
+    found = 0
+    for _ in range(60):
+        start, goal = rng.choice(free), rng.choice(free)
+        dist = bfs_distances(walkable, goal[0], goal[1])[start[1], start[0]]
+        path = hpa.find_path(start, goal)
+        if dist == UNREACHABLE:
+            # Destinos inalcançáveis saem do índice de componentes, sem busca
+            assert path is None and not hpa.connected(start, goal)
+            continue
+        found += 1
+        check_path(path, walkable, start, goal)
+        # Próximo do ótimo (o refinamento é ótimo dentro de cada cluster)
+        assert len(path) - 1 <= dist * 1.5 + 8
+    assert found > 10
+
+
+def test_hpa_incremental_update(make_map):
+    walls = random_walls(9)
+    nav = make_map(walls).nav
+    hpa = HierarchicalPathfinder(nav, 1, cluster_size=8)
+    hpa.refresh()
+    rng = random.Random(4)
+    for _ in range(15):
+        x, y = rng.randrange(nav.width), rng.randrange(nav.height)
+        walls[y, x] = not walls[y, x]
+        nav.invalidate_tiles(x, y, x, y)
+        hpa.refresh()
+    full = HierarchicalPathfinder(nav, 1, cluster_size=8)
+    full.refresh()
+    assert hpa.edges == full.edges
+    assert {k: v for k, v in hpa.cluster_nodes.items() if v} == {k: v for k, v in full.cluster_nodes.items() if v}
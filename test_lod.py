@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Teste das faixas de atividade da simulação (core/lod.SimLOD)"""
+from types import SimpleNamespace
+
+from core.clock import SimClock
+from core.lod import ACTIVE, FROZEN, THROTTLED, SimLOD
+from core.profiler import Profiler
+
+
+def body(id, x, y):
+    return SimpleNamespace(id=id, posx=x, posy=y, sizex=32, sizey=32, lod_debt=0.0)
+
+
+def test_tiers_throttle_and_catch_up():
+    saved = SimClock.ticks
+    SimLOD.configure({'near_radius': 100, 'wake_radius': 300, 'throttle_interval': 4, 'max_catch_up': 0.5})
+    Profiler.configure({'enabled': True})
+    try:
+        anchors = SimLOD.anchors([body(0, 0, 0)])
+        near, middle, far = body(1, 50, 0), body(2, 200, 0), body(3, 1000, 0)
+        assert [SimLOD.tier_of(e, anchors) for e in (near, middle, far)] == [ACTIVE, THROTTLED, FROZEN]
+        # Sem jogadores, nada é rebaixado
+        assert SimLOD.tier_of(far, []) == ACTIVE
+
+        dt = SimClock.dt
+        full = {1: [], 2: [], 3: []}
+        for tick in range(8):
+            SimClock.ticks = tick
+            SimLOD.begin()
+            for entity in (near, middle, far):
+                tier, step = SimLOD.step(entity, anchors, dt)
+                if step is not None:
+                    full[entity.id].append(step)
+            SimLOD.report()
+            Profiler.end_frame()
+        assert full[1] == [dt] * 8
+        # Um tick completo a cada 4 (escalonado pelo id), recebendo o tempo dos ticks pulados
+        assert [round(step / dt) for step in full[2]] == [3, 4]
+        assert full[3] == [] and abs(far.lod_debt - 8 * dt) < 1e-9
+        assert Profiler.counts == {'lod.active': 1, 'lod.throttled': 1, 'lod.frozen': 1}
+        # Faixas são medidores: dois ticks no frame não dobram, um frame sem tick mantém os valores
+        for _ in range(2):
+            SimLOD.begin()
+            for entity in (near, middle, far):
+                SimLOD.step(entity, anchors, dt)
+            SimLOD.report()
+        Profiler.end_frame()
+        Profiler.end_frame()
+        assert Profiler.counts == {'lod.active': 1, 'lod.throttled': 1, 'lod.frozen': 1}
+
+        # Ao acordar, o atraso acumulado é entregue com teto de max_catch_up
+        far.lod_debt = 30.0
+        far.posx = 0
+        tier, step = SimLOD.step(far, anchors, dt)
+        assert tier == ACTIVE and step == 0.5 and far.lod_debt == 0.0
+    finally:
+        SimClock.ticks = saved
+        SimLOD.configure({})
+        Profiler.enabled = False
+        Profiler.reset()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Teste da grade de clearance/walkability (core/navigation.py)"""
+import random
+from types import SimpleNamespace
+
+import numpy as np
+
+
+def brute_walkable(game_map, blocked, tx, ty, size):
+    # Mesma regra do _is_walkable antigo: tiles fora do mapa não bloqueiam
+    for y in range(ty, min(ty + size, game_map.map_height)):
+        for x in range(tx, min(tx + size, game_map.map_width)):
+            if blocked[y, x]:
+                return False
+    return True
+
+
+def check(nav, game_map, extra=None):
+    blocked = game_map.col_classes[1].copy()
+    if extra is not None:
+        blocked |= extra
+    for size in (1, 2, 3, 5):
+        for ty in range(game_map.map_height):
+            for tx in range(game_map.map_width):
+                assert nav.is_walkable(tx, ty, size) == brute_walkable(game_map, blocked, tx, ty, size), (tx, ty, size)
+
+
+def test_navigation(make_map):
+    rng = random.Random(3)
+    walls = np.zeros((20, 24), dtype=bool)
+    for _ in range(40):
+        walls[rng.randrange(20), rng.randrange(24)] = True
+    game_map = make_map(walls)
+    nav = game_map.nav
+    assert nav.size_class(32, 32) == 1 and nav.size_class(33, 20) == 2
+    assert not nav.is_walkable(-1, 0) and not nav.is_walkable(24, 0)
+    check(nav, game_map)
+
+    # Mudança de tile: recálculo incremental
+    version = nav.version
+    game_map.col_classes[1][5, 5] = True
+    nav.invalidate_tiles(5, 5, 5, 5)
+    assert nav.version > version
+    check(nav, game_map)
+
+    # Breakables entram, andam e saem
+    box = SimpleNamespace(id=7, posx=10 * 32 + 4, posy=8 * 32, sizex=40, sizey=20)
+    nav.sync_blockers([box])
+    extra = np.zeros_like(nav.blockers, dtype=bool)
+    extra[8, 10:12] = True
+    check(nav, game_map, extra)
+    box.posy += 64
+    nav.sync_blockers([box])
+    extra[:] = False
+    extra[10, 10:12] = True
+    check(nav, game_map, extra)
+    nav.sync_blockers([])
+    assert not nav.blockers.any()
+    check(nav, game_map)
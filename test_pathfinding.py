@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Teste do A*/JPS em tiles (core/pathfinding.py)"""
+import heapq
+import math
+import random
+
+import numpy as np
+
+from core.flowfield import UNREACHABLE, bfs_distances
+from core.pathfinding import astar, jps, line_of_sight, smooth_path, find_path, DIAGONALS
+
+
+def make_grid(seed, w=40, h=30, ratio=0.25):
+    rng = np.random.default_rng(seed)
+    return rng.random((h, w)) >= ratio
+
+
+def octile_distances(walkable, start):
+    """Dijkstra 8 direções, sem cortar quina (referência)."""
+    h, w = walkable.shape
+    dist = {start: 0.0}
+    heap = [(0.0, start)]
+    while heap:
+        d, (x, y) = heapq.heappop(heap)
+        if d > dist[(x, y)]:
+            continue
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)) + DIAGONALS:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < w and 0 <= ny < h) or not walkable[ny, nx]:
+                continue
+            if dx and dy and not (walkable[y, nx] and walkable[ny, x]):
+                continue
+            nd = d + (math.sqrt(2) if dx and dy else 1.0)
+            if nd < dist.get((nx, ny), float('inf')):
+                dist[(nx, ny)] = nd
+                heapq.heappush(heap, (nd, (nx, ny)))
+    return dist
+
+
+def path_cost(path, walkable):
+    cost = 0.0
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        dx, dy = x1 - x0, y1 - y0
+        assert max(abs(dx), abs(dy)) == 1 and walkable[y1, x1]
+        if dx and dy:
+            assert walkable[y0, x1] and walkable[y1, x0], "cortou quina"
+        cost += math.sqrt(2) if dx and dy else 1.0
+    return cost
+
+
+def random_pairs(walkable, count, seed):
+    rng = random.Random(seed)
+    free = [(x, y) for y in range(walkable.shape[0]) for x in range(walkable.shape[1]) if walkable[y, x]]
+    return [(rng.choice(free), rng.choice(free)) for _ in range(count)]
+
+
+def test_astar_4way_is_optimal():
+    walkable = make_grid(1)
+    for start, goal in random_pairs(walkable, 40, 1):
+        dist = bfs_distances(walkable, goal[0], goal[1])[start[1], start[0]]
+        path = astar(walkable, start, goal, max_iterations=10 ** 6)
+        if dist == UNREACHABLE:
+            assert path is None
+            continue
+        assert path[0] == start and path[-1] == goal
+        assert len(path) - 1 == dist
+        assert all(abs(x1 - x0) + abs(y1 - y0) == 1 for (x0, y0), (x1, y1) in zip(path, path[1:]))
+
+
+def test_diagonal_and_jps_match_reference():
+    walkable = make_grid(3)
+    checked = 0
+    for start, goal in random_pairs(walkable, 40, 2):
+        best = octile_distances(walkable, start).get(goal)
+        a = astar(walkable, start, goal, max_iterations=10 ** 6, diagonal=True)
+        j = jps(walkable, start, goal, max_iterations=10 ** 6)
+        if best is None:
+            assert a is None and j is None
+            continue
+        checked += 1
+        for path in (a, j):
+            assert path[0] == start and path[-1] == goal
+            assert abs(path_cost(path, walkable) - best) < 1e-6
+    assert checked > 10
+
+
+def test_cut_corners():
+    walkable = np.array([[1, 0],
+                         [1, 1]], dtype=bool)
+    assert astar(walkable, (0, 0), (1, 1), diagonal=True) == [(0, 0), (0, 1), (1, 1)]
+    assert astar(walkable, (0, 0), (1, 1), diagonal=True, cut_corners=True) == [(0, 0), (1, 1)]
+    # Nunca passa espremido entre duas paredes na diagonal
+    walkable[1, 0] = False
+    assert astar(walkable, (0, 0), (1, 1), diagonal=True, cut_corners=True) is None
+
+
+def test_line_of_sight_and_smoothing():
+    walkable = np.ones((8, 8), dtype=bool)
+    walkable[3, 3] = False
+    assert line_of_sight(walkable, (0, 0), (7, 0))
+    assert not line_of_sight(walkable, (0, 0), (6, 6))
+    # A hitbox entre duas âncoras cobre as duas: passar rente à quina bloqueia
+    assert not line_of_sight(walkable, (0, 2), (7, 4))
+    assert line_of_sight(walkable, (0, 1), (7, 1))
+
+    walkable = make_grid(7, ratio=0.15)
+    for start, goal in random_pairs(walkable, 30, 3):
+        path = astar(walkable, start, goal, max_iterations=10 ** 6, diagonal=True)
+        smooth = smooth_path(walkable, path)
+        if path is None:
+            assert smooth is None
+            continue
+        assert smooth[0] == start and smooth[-1] == goal
+        assert len(smooth) <= len(path)
+        assert all(line_of_sight(walkable, a, b) for a, b in zip(smooth, smooth[1:]))
+        assert smooth == find_path(walkable, start, goal, 10 ** 6, diagonal=True, smooth=True)
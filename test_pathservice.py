@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Teste do serviço de pathfinding assíncrono (core/pathservice.py)"""
+import time
+
+import numpy as np
+import pytest
+
+from core.pathservice import PathService
+
+
+@pytest.fixture
+def game_map(make_map):
+    walls = np.zeros((12, 12), dtype=bool)
+    walls[1:11, 5] = True  # parede com passagens nas pontas
+    return make_map(walls)
+
+
+def check_path(path, start, goal):
+    assert path[0] == start and path[-1] == goal
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        assert abs(x1 - x0) + abs(y1 - y0) == 1
+        assert not (x1 == 5 and 1 <= y1 <= 10)
+
+
+def test_pathservice_budget_and_coalescing(game_map):
+    PathService.configure({'budget_ms': 0, 'workers': 0})
+    PathService.reset()
+
+    # Dois mobs no mesmo tile pedindo o mesmo destino: um pedido só
+    a = PathService.request(game_map, (2 * 32 + 5, 5 * 32), (9 * 32, 5 * 32), 32, 32)
+    b = PathService.request(game_map, (2 * 32 + 20, 5 * 32 + 9), (9 * 32 + 3, 5 * 32), 30, 30)
+    c = PathService.request(game_map, (2 * 32, 2 * 32), (9 * 32, 9 * 32), 32, 32)
+    assert a is b and a is not c
+    assert not a.done and not c.done
+
+    # Orçamento zero: uma busca por tick, na ordem dos pedidos
+    PathService.run(game_map)
+    assert a.done and not c.done
+    check_path(a.path, (2, 5), (9, 5))
+    PathService.run(game_map)
+    assert c.done
+    check_path(c.path, (2, 2), (9, 9))
+
+    # Resultado pronto é reaproveitado até a grade mudar
+    assert PathService.request(game_map, (2 * 32, 5 * 32), (9 * 32, 5 * 32), 32, 32) is a
+    game_map.col_classes[1][0, 5] = True
+    game_map.nav.invalidate_tiles(5, 0, 5, 0)
+    d = PathService.request(game_map, (2 * 32, 5 * 32), (9 * 32, 5 * 32), 32, 32)
+    assert d is not a and not d.done
+    PathService.run(game_map)
+    check_path(d.path, (2, 5), (9, 5))
+    assert all(y == 11 for x, y in d.path if x == 5)
+
+    # Destino fechado
+    e = PathService.request(game_map, (0, 0), (5 * 32, 3 * 32), 32, 32)
+    PathService.run(game_map)
+    assert e.done and e.path is None
+
+    # A* esgotando o limite de iterações: o HPA* completa o caminho
+    PathService.max_iterations = 3
+    f = PathService.request(game_map, (0, 11 * 32), (11 * 32, 0), 32, 32)
+    PathService.run(game_map)
+    check_path(f.path, (0, 11), (11, 0))
+    PathService.configure({})
+    PathService.reset()
+
+
+def test_pathservice_pool(game_map):
+    PathService.configure({'workers': 1})
+    PathService.reset()
+    try:
+        req = PathService.request(game_map, (0, 0), (11 * 32, 0), 32, 32)
+        deadline = time.time() + 30
+        while not req.done and time.time() < deadline:
+            PathService.run(game_map)
+            time.sleep(0.01)
+        assert req.done
+        check_path(req.path, (0, 0), (11, 0))
+    finally:
+        PathService.shutdown()
+        PathService.workers = 0
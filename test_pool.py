@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Teste das listas livres (core/pool.py) e do layout com __slots__ de Status/Effect"""
+import pytest
+
+from assets.classes.status import Effect, Status
+from core.pool import Pool
+
+
+class Shot:
+    __slots__ = ('id', 'x', 'texture', 'hits', 'in_pool')
+
+    def __init__(self, id, x, texture):
+        self.reset(id, x, texture)
+
+    def reset(self, id, x, texture):
+        self.id, self.x, self.texture = id, x, texture
+        hits = getattr(self, 'hits', None)
+        if hits is None:
+            self.hits = set()
+        else:
+            hits.clear()
+
+    def clear(self):
+        self.texture = None
+
+
+def test_pool_reuses_and_resets():
+    saved = Pool.enabled, Pool.limit
+    try:
+        Pool.configure({'enabled': True, 'limit': 1})
+        pool = Pool(Shot)
+        a = pool.acquire(1, 10.0, 'tex')
+        b = pool.acquire(2, 20.0, 'tex')
+        a.hits.add(('mob', 3))
+        pool.release(a)
+        pool.release(a)   # devolver duas vezes não duplica
+        pool.release(b)   # acima do limite: descartado
+        assert len(pool) == 1 and a.texture is None
+        c = pool.acquire(3, 30.0, 'other')
+        assert c is a and not c.in_pool and (c.id, c.x, c.texture) == (3, 30.0, 'other')
+        assert c.hits == set()
+        assert (pool.created, pool.reused) == (2, 1)
+        # Desligado: release só limpa as referências
+        Pool.configure({'enabled': False})
+        pool.release(c)
+        assert len(pool) == 0 and c.texture is None
+    finally:
+        Pool.enabled, Pool.limit = saved
+
+
+def test_status_and_effect_have_no_dict():
+    stats = Status(*range(14))
+    effect = Effect('speed', 2, 0.5)
+    stats.add_effect(effect)
+    assert stats.speed == 12 + 2
+    stats.update_effects(1.0)
+    assert stats.speed == 12 and stats.active_effects == []
+    for obj in (stats, effect):
+        assert not hasattr(obj, '__dict__')
+        with pytest.raises(AttributeError):
+            obj.typo = 1
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Teste do profiler de frame (core/profiler.py)"""
+import json
+
+from core.profiler import Profiler, profiled
+
+
+def test_profiler(tmp_path):
+    Profiler.configure({'enabled': True, 'history_frames': 4})
+
+    @profiled('work')
+    def work(n):
+        return n * 2
+
+    for frame in range(6):
+        # Chamadas no mesmo frame somam no total do escopo
+        Profiler.record('step', 0.0, 0.001)
+        Profiler.record('step', 0.0, 0.001 * frame)
+        assert work(frame) == frame * 2
+        Profiler.end_frame()
+
+    rows = {name: (p50, p95, worst) for name, p50, p95, worst in Profiler.stats()}
+    assert set(rows) == {'step', 'work'}
+    # Ring buffer guarda só os últimos 4 frames: 3, 4, 5 e 6 ms
+    assert len(Profiler.samples['step']) == 4
+    p50, p95, worst = rows['step']
+    assert abs(worst - 0.006) < 1e-9 and abs(p50 - 0.004) < 1e-9
+
+    # Trace: eventos "X" dos próximos 2 frames, exportados ao fim da captura
+    Profiler.start_trace(2)
+    with Profiler.scope('map.render'):
+        pass
+    Profiler.end_frame()
+    assert Profiler.recording()
+    Profiler.trace_dir = str(tmp_path)
+    with Profiler.scope('map.render'):
+        pass
+    Profiler.end_frame()
+    assert not Profiler.recording()
+    events = json.load(open(Profiler.last_trace_path))['traceEvents']
+    assert [e['name'] for e in events] == ['map.render', 'map.render']
+    assert all(e['ph'] == 'X' and e['dur'] >= 0 for e in events)
+    assert Profiler.enabled   # já estava ligado antes da captura
+
+    # Captura com o profiler desligado: liga só durante o trace
+    Profiler.enabled = False
+    Profiler.start_trace(1)
+    assert Profiler.enabled
+    Profiler.end_frame()
+    assert not Profiler.enabled and not Profiler.recording()
+    Profiler.enabled = True
+
+    # Desligado: nada é medido
+    Profiler.toggle()
+    Profiler.reset()
+    with Profiler.scope('map.render'):
+        pass
+    work(1)
+    Profiler.end_frame()
+    assert Profiler.stats() == []
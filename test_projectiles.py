@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Teste do motor de projéteis em colunas (core/projectiles.ProjectileEngine)"""
+import math
+
+import numpy as np
+
+from assets.behaviors.prj import (SPIRAL_ADVANCE, WAVE_AMPLITUDE, WAVE_FREQUENCY, fun1,
+                                  spiral_motion, wave_motion)
+from core.projectiles import ProjectileEngine
+from core.spatial import swept_aabb
+
+
+def spawn(engine, uid, kernel, x=0.0, y=0.0, dirx=3.0, diry=4.0, time=100, penetration=1,
+          owner=None, owner_type=None):
+    return engine.spawn(f"p{uid}", uid, x, y, dirx, diry, 2.0, 5.0, penetration, time, 16, 16,
+                        kernel, owner, owner_type)
+
+
+def test_kernels_follow_motion_formulas():
+    engine = ProjectileEngine(capacity=2)
+    for uid, kernel in enumerate((fun1, wave_motion, spiral_motion, None)):
+        spawn(engine, uid, kernel, x=100.0, y=50.0)
+    ticks = 30
+    for _ in range(ticks):
+        engine.step()
+    # Direção (3, 4): linha reta usa o vetor do disparo, onda e espiral o normalizado
+    nx, ny = 0.6, 0.8
+    positions = {engine.objects[i]: (engine.x[i], engine.y[i]) for i in range(engine.count)}
+    expected = {
+        'p0': (100.0 + ticks * 3.0 * 2.0, 50.0 + ticks * 4.0 * 2.0),
+        'p1': (100.0 + ticks * nx * 2.0 - ny * math.sin(ticks * WAVE_FREQUENCY) * WAVE_AMPLITUDE,
+               50.0 + ticks * ny * 2.0 + nx * math.sin(ticks * WAVE_FREQUENCY) * WAVE_AMPLITUDE),
+        'p2': (100.0 + ticks * nx * 2.0 * SPIRAL_ADVANCE + math.cos(1.0 + ticks * 0.05) * (5.0 + ticks * 0.4),
+               50.0 + ticks * ny * 2.0 * SPIRAL_ADVANCE + math.sin(1.0 + ticks * 0.05) * (5.0 + ticks * 0.4)),
+        'p3': (100.0, 50.0),
+    }
+    for name, (x, y) in expected.items():
+        assert abs(positions[name][0] - x) < 1e-6 and abs(positions[name][1] - y) < 1e-6, name
+
+
+def test_expiry_hits_and_compaction():
+    engine = ProjectileEngine()
+    spawn(engine, 0, fun1, time=2)
+    spawn(engine, 1, fun1, x=500.0, dirx=0.0, diry=0.0, penetration=2, owner=7, owner_type='mob')
+    spawn(engine, 2, fun1, x=900.0, dirx=0.0, diry=0.0)
+    engine.step()
+    # Dono não é atingido pelo próprio projétil; outro tipo com o mesmo id é
+    assert list(engine.query(490, 0, 32, 32, 7, 'mob')) == []
+    assert list(engine.query(490, 0, 32, 32, 7, 'player')) == [1]
+    # Penetração 2: o primeiro acerto mantém, o segundo mata
+    assert engine.hit(1) and not engine.hit(1)
+    assert list(engine.query(490, 0, 32, 32)) == []
+    # Criado no meio do tick (fora da ordenação) também é encontrado
+    spawn(engine, 3, fun1, x=2000.0, dirx=0.0, diry=0.0)
+    assert list(engine.query(1990, 0, 32, 32)) == [3]
+
+    removed = engine.step()
+    assert removed == ['p1']
+    engine.kill_uid(2)
+    removed = engine.step()
+    # p0 viveu 2 ticks; a compactação preserva a ordem dos sobreviventes
+    assert sorted(removed) == ['p0', 'p2'] and engine.objects == ['p3']
+    assert engine.count == 1 and engine.uid[0] == 3
+
+
+def test_swept_aabb():
+    # Caixa 16x16 andando 100 px para a direita contra um tile em x = 64
+    assert swept_aabb(0, 0, 16, 16, 100, 0, 64, 0, 32, 32) == 0.48
+    assert swept_aabb(0, 0, 16, 16, 100, 0, 64, 40, 32, 32) is None
+    assert swept_aabb(0, 0, 16, 16, 40, 0, 64, 0, 32, 32) is None
+    assert swept_aabb(70, 0, 16, 16, 100, 0, 64, 0, 32, 32) == 0.0
+
+
+def test_fast_projectile_stops_at_wall():
+    walls = np.zeros((10, 10), dtype=bool)
+    walls[:, 5] = True   # parede em x = 160..192 px
+    engine = ProjectileEngine()
+    # 120 px por tick: sem colisão contínua pularia de x = 140 para 260
+    spawn(engine, 0, fun1, x=20.0, y=40.0, dirx=60.0, diry=0.0)
+    engine.step(walls, 32, 32, walls_version=0)
+    assert engine.x[0] == 140.0 and engine.alive[0]
+    engine.step(walls, 32, 32, walls_version=0)
+    assert engine.x[0] == 160.0 - 16 and engine.time[0] == 0
+    # Ainda vivo neste tick (pode acertar o que estava antes da parede); expira no próximo
+    assert engine.step(walls, 32, 32, walls_version=0) == ['p0'] and engine.count == 0
+
+
+def test_sweep_hits_thin_target_in_order():
+    engine = ProjectileEngine()
+    spawn(engine, 0, fun1, x=0.0, y=0.0, dirx=100.0, diry=0.0)
+    engine.step()
+    # Alvo de 4 px inteiro entre o começo e o fim do movimento (0 -> 200)
+    rows, t = engine.sweep(100, 0, 4, 16)
+    assert list(rows) == [0] and abs(t[0] - 84 / 200) < 1e-12
+    near_rows, near_t = engine.sweep(40, 0, 4, 16)
+    assert near_t[0] < t[0]
+    assert not len(engine.sweep(100, 40, 4, 16)[0])
+    # Acerto com penetração 1: recua para o ponto de entrada
+    engine.hit(0)
+    engine.clip(0, near_t[0])
+    assert engine.x[0] == 24.0
+
+
+def test_sweep_boxes_matches_sweep_per_target():
+    rng = np.random.default_rng(3)
+    engine = ProjectileEngine()
+    for uid in range(300):
+        angle = rng.uniform(0, 2 * math.pi)
+        spawn(engine, uid, fun1, x=rng.uniform(0, 800), y=rng.uniform(0, 800),
+              dirx=math.cos(angle) * 20, diry=math.sin(angle) * 20, owner=uid % 7, owner_type='mob')
+    engine.step()
+    targets = [(rng.uniform(0, 800), rng.uniform(0, 800), rng.uniform(4, 48), rng.uniform(4, 48), i,
+                'mob' if i % 2 else 'player') for i in range(60)]
+    columns = [np.array([target[k] for target in targets]) for k in range(4)]
+    rows, indices, t = engine.sweep_boxes(*columns, [target[4] for target in targets],
+                                          [target[5] for target in targets])
+    expected = []
+    for i, (x, y, w, h, owner, owner_type) in enumerate(targets):
+        found, times = engine.sweep(x, y, w, h, owner, owner_type)
+        expected += zip(times.tolist(), found.tolist(), [i] * len(found))
+    expected.sort()
+    assert expected and list(zip(t.tolist(), rows.tolist(), indices.tolist())) == expected
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Teste do registro de entidades com ids estáveis (core/registry.py)"""
+from core.registry import Registry
+
+
+class Obj:
+    id = 0
+
+
+def test_registry():
+    reg = Registry()
+    a, b, c = Obj(), Obj(), Obj()
+    for o in (a, b, c):
+        reg.add(o)
+    assert [o.id for o in reg] == [1, 2, 3]
+
+    # Remoção não renumera e ids não são reaproveitados
+    reg.remove(b.id)
+    d = Obj()
+    reg.add(d)
+    assert (a.id, c.id, d.id) == (1, 3, 4)
+    assert reg.get(3) is c and not reg.has(2)
+
+    # Remoção e inserção durante a iteração são adiadas
+    visited = []
+    e = Obj()
+    for o in reg:
+        visited.append(o.id)
+        if o is a:
+            reg.remove(c.id)
+            reg.add(e)
+            assert not reg.has(c.id) and reg.has(e.id)
+    assert visited == [1, 4]
+    assert [o.id for o in reg] == [1, 4, 5]
+    assert len(reg) == 3 and reg.first() is a and reg.last() is e
+
+
+if __name__ == "__main__":
+    test_registry()
+    print("OK")
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""Teste do índice espacial (core/spatial.SpatialHash)"""
+import random
+
+from core.spatial import SpatialHash, aabb_overlap
+
+
+class Box:
+    def __init__(self, x, y, size):
+        self.posx, self.posy, self.sizex, self.sizey = x, y, size, size
+
+
+
+def test_query_finds_overlaps_at_fractional_edges():
+    grid = SpatialHash(64)
+    mob = Box(32.5, 0.0, 32)          # vai até x = 64.5: toca a célula 1
+    grid.insert(mob)
+    projectile = Box(64.2, 10.0, 16)
+    assert aabb_overlap(projectile, mob)
+    assert mob in grid.query_rect(projectile.posx, projectile.posy, projectile.sizex, projectile.sizey)
+    # Borda exata continua exclusiva: [32, 64) não toca a célula 1
+    assert grid._span(32, 0, 32, 32) == (0, 0, 0, 0)
+    assert grid._span(64, 0, 0, 0) == (1, 0, 1, 0)
+
+
+def test_query_matches_full_scan():
+    rng = random.Random(3)
+    grid = SpatialHash(64)
+    mobs = [Box(rng.uniform(0, 1000), rng.uniform(0, 1000), 32) for _ in range(200)]
+    for mob in mobs:
+        grid.insert(mob)
+    for _ in range(500):
+        p = Box(rng.uniform(0, 1000), rng.uniform(0, 1000), 16)
+        expected = {id(m) for m in mobs if aabb_overlap(p, m)}
+        found = {id(m) for m in grid.query_rect(p.posx, p.posy, p.sizex, p.sizey) if aabb_overlap(p, m)}
+        assert found == expected
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""Teste dos volumes de gatilho dos eventos (core/trigger.py)"""
+import pytest
+
+from core.trigger import TriggerIndex, TriggerVolume, circle_trigger, rect_trigger, trigger_from_data
+
+
+def test_volumes_and_stored_format():
+    circle = trigger_from_data('proximidade', {"posx": 1600, "posy": 468, "raio": 100})
+    assert circle.contains(1600, 568) and circle.contains(1670, 538)
+    assert not circle.contains(1680, 540)   # dentro da caixa, fora do círculo
+    assert circle.to_data() == ('proximidade', {"posx": 1600, "posy": 468, "raio": 100})
+    room = rect_trigger(0, 0, 64, 32, on='enter')
+    assert room.contains(0, 0) and not room.contains(64, 10)
+    assert trigger_from_data(*room.to_data()).on == 'enter'
+    assert trigger_from_data('proximidade', {}) is None
+    assert trigger_from_data('codigo', {"posx": 1}) is None
+    with pytest.raises(ValueError):
+        TriggerVolume('area', 0, 0, 1, 1, on='always')
+
+
+def test_enter_stay_exit():
+    index = TriggerIndex(cell_size=64)
+    room = rect_trigger(100, 100, 200, 200)
+    index.add(room)
+    far = circle_trigger(5000, 5000, 50)
+    index.add(far)
+    assert index.update([(0, 0)]) == ([], [], [])
+    # Dois players entram no mesmo tick: um único "entrou"
+    assert index.update([(150, 150), (250, 250)]) == ([room], [room], [])
+    assert index.update([(150, 150)]) == ([], [room], [])
+    assert index.update([(50, 50)]) == ([], [], [room])
+    # Removido enquanto ocupado: não gera "saiu" depois
+    index.update([(150, 150)])
+    index.remove(room)
+    assert index.update([(150, 150)]) == ([], [], [])
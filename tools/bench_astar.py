@@ -0,0 +1,110 @@
+"""
+Benchmark do A* em tiles: implementação antiga x core/pathfinding.
+
+A implementação antiga (caminho inteiro copiado em cada entrada do heap,
+4 direções) é reproduzida aqui como referência. Os modos novos são A* 4
+direções, A* 8 direções, A* 8 direções com suavização e JPS, todos sobre a
+máscara de walkability do mapa (entidade de 1 tile), com os mesmos pares
+início/fim sorteados entre tiles livres e alcançáveis. Não abre janela.
+
+Uso:
+    python tools/bench_astar.py [--map caminho.json] [--pairs 200] [--min-dist 10]
+"""
+import argparse
+import heapq
+import random
+import time
+
+from bench_common import DEFAULT_TILESET, resolve_map
+
+from core.textures import TextureManager
+from core.map import Map
+from core.pathfinding import astar, jps, smooth_path
+
+UNLIMITED = 10 ** 7
+
+
+def legacy_astar(walkable, start, goal, max_iterations=UNLIMITED):
+    """A* anterior: guarda a lista do caminho em cada nó do heap."""
+    height, width = walkable.shape
+    if not walkable[goal[1], goal[0]]:
+        return None
+    closed_set = set()
+    counter = 0
+    open_heap = [(0, counter, start, [start])]
+    g_score = {start: 0}
+    iterations = 0
+    while open_heap and iterations < max_iterations:
+        iterations += 1
+        _, _, current, path = heapq.heappop(open_heap)
+        if current == goal:
+            return path
+        if current in closed_set:
+            continue
+        closed_set.add(current)
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            nx, ny = current[0] + dx, current[1] + dy
+            if not (0 <= nx < width and 0 <= ny < height) or not walkable[ny, nx]:
+                continue
+            neighbor = (nx, ny)
+            tentative = g_score[current] + 1
+            if neighbor not in g_score or tentative < g_score[neighbor]:
+                g_score[neighbor] = tentative
+                counter += 1
+                heapq.heappush(open_heap, (tentative + abs(nx - goal[0]) + abs(ny - goal[1]),
+                                           counter, neighbor, path + [neighbor]))
+    return None
+
+
+MODES = (
+    ('antigo (4 dir.)', lambda w, s, g: legacy_astar(w, s, g)),
+    ('A* 4 dir.', lambda w, s, g: astar(w, s, g, UNLIMITED)),
+    ('A* 8 dir.', lambda w, s, g: astar(w, s, g, UNLIMITED, diagonal=True)),
+    ('A* 8 + suaviz.', lambda w, s, g: smooth_path(w, astar(w, s, g, UNLIMITED, diagonal=True))),
+    ('JPS', lambda w, s, g: jps(w, s, g, UNLIMITED)),
+)
+
+
+def sample_pairs(game_map, walkable, count, min_dist, rng):
+    hpa = game_map.nav.hierarchy(1)
+    free = [(x, y) for y in range(walkable.shape[0]) for x in range(walkable.shape[1]) if walkable[y, x]]
+    pairs = []
+    for _ in range(count * 50):
+        if len(pairs) == count:
+            break
+        a, b = rng.choice(free), rng.choice(free)
+        if abs(a[0] - b[0]) + abs(a[1] - b[1]) >= min_dist and hpa.connected(a, b):
+            pairs.append((a, b))
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--map', default=None)
+    parser.add_argument('--pairs', type=int, default=200)
+    parser.add_argument('--min-dist', type=int, default=10)
+    args = parser.parse_args()
+
+    TextureManager.headless = True
+    game_map = Map(resolve_map(args.map), DEFAULT_TILESET)
+    walkable = game_map.nav.walkable_mask(1)
+    pairs = sample_pairs(game_map, walkable, args.pairs, args.min_dist, random.Random(1))
+
+    print(f"mapa {game_map.map_width}x{game_map.map_height}, {len(pairs)} pares (distância >= {args.min_dist})")
+    print(f"{'modo':<18}{'média':>10}{'p95':>10}{'máx':>10}{'waypoints':>11}  (ms/busca)")
+    for name, search in MODES:
+        times = []
+        waypoints = 0
+        for start, goal in pairs:
+            t0 = time.perf_counter()
+            path = search(walkable, start, goal)
+            times.append(time.perf_counter() - t0)
+            waypoints += len(path) if path else 0
+        ordered = sorted(times)
+        print(f"{name:<18}{sum(times) * 1000.0 / len(times):10.3f}"
+              f"{ordered[int((len(ordered) - 1) * 0.95)] * 1000.0:10.3f}{ordered[-1] * 1000.0:10.3f}"
+              f"{waypoints / len(pairs):11.1f}")
+
+
+if __name__ == '__main__':
+    main()
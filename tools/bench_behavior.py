@@ -0,0 +1,84 @@
+"""
+Benchmark do tick de behavior tree: árvore de nós x árvore compilada.
+
+Monta uma árvore no formato das árvores dos mobs (Selector de Sequences com
+condições de alcance/timer e ações de movimento/animação), com folhas
+baratas para medir só o custo de percorrer a árvore, e roda N mobs por
+alguns ticks pelos nós (node.run) e pela função compilada (CompiledTree).
+Não abre janela.
+
+Uso:
+    python tools/bench_behavior.py [--mobs 1000] [--ticks 200]
+"""
+import argparse
+import random
+import time
+
+import bench_common  # noqa: F401  (ajusta sys.path)
+
+from core.condition_nodes import (ActionNode, CompiledTree, ConditionNode, SelectorNode,
+                                  SequenceNode)
+
+
+class Mob:
+    __slots__ = ('near', 'timer', 'hp', 'anim', 'blackboard')
+
+    def __init__(self, rng):
+        self.near = rng.random() < 0.3
+        self.timer = rng.random() < 0.1
+        self.hp = rng.random()
+        self.anim = 0
+        self.blackboard = None
+
+
+def player_near(entity, map_ref):
+    return entity.near
+
+def hp_low(entity, map_ref):
+    return entity.hp < 0.3
+
+def timer(entity, map_ref):
+    return entity.timer
+
+def act(entity, map_ref):
+    entity.anim += 1
+
+
+def mob_tree():
+    return SelectorNode([
+        SequenceNode([ConditionNode(hp_low), ConditionNode(player_near), ActionNode(act), ActionNode(act)]),
+        SequenceNode([ConditionNode(player_near), ConditionNode(timer), ActionNode(act)]),
+        SequenceNode([ConditionNode(player_near), ActionNode(act), ActionNode(act)]),
+        SequenceNode([ConditionNode(timer), ActionNode(act)]),
+        ActionNode(act),
+    ])
+
+
+def bench(run, mobs, ticks):
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for mob in mobs:
+            run(mob, None)
+    return (time.perf_counter() - start) * 1000.0 / ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--mobs', type=int, default=1000)
+    parser.add_argument('--ticks', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    mobs = [Mob(rng) for _ in range(args.mobs)]
+    root = mob_tree()
+    compiled = CompiledTree(root)
+
+    nodes_ms = bench(root.run, mobs, args.ticks)
+    compiled_ms = bench(compiled.run, mobs, args.ticks)
+    print(f"{args.mobs} mobs, {args.ticks} ticks (ms/tick)")
+    print(f"{'nós':<12}{nodes_ms:10.3f}")
+    print(f"{'compilada':<12}{compiled_ms:10.3f}  ({nodes_ms / compiled_ms:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
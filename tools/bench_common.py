@@ -0,0 +1,105 @@
+"""
+Funções auxiliares compartilhadas pelos scripts de benchmark em tools/.
+
+Os benchmarks devem ser executados a partir da raiz do projeto (os caminhos do
+banco e das imagens são relativos), por exemplo:
+
+    python tools/bench_map_render.py
+"""
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+DEFAULT_MAP = 'assets/data/map.json'
+DEFAULT_TILESET = 'assets/images/layers/basic.png'
+
+
+def make_synthetic_map(width=160, height=160, layers=2, wall_ratio=0.08, seed=1):
+    """Gera um mapa no formato Tiled (JSON) com tiles aleatórios do tileset.
+
+    A camada 0 é chão (tiles livres) e as demais recebem paredes esparsas.
+    Usado quando assets/data/map.json não está disponível.
+    Retorna o caminho de um arquivo temporário.
+    """
+    rng = random.Random(seed)
+    conn = sqlite3.connect('assets/data/data.db')
+    rows = conn.execute('SELECT id, col FROM tile').fetchall()
+    conn.close()
+    free = [tid for tid, col in rows if tid > 0 and not col]
+    walls = [tid for tid, col in rows if col == 1]
+
+    data_layers = []
+    for li in range(layers):
+        if li == 0:
+            data = [rng.choice(free) for _ in range(width * height)]
+        else:
+            data = [rng.choice(walls) if rng.random() < wall_ratio else 0
+                    for _ in range(width * height)]
+        data_layers.append({
+            "id": li + 1,
+            "name": f"layer{li}",
+            "type": "tilelayer",
+            "visible": True,
+            "width": width,
+            "height": height,
+            "data": data,
+        })
+
+    map_data = {
+        "tilewidth": 32,
+        "tileheight": 32,
+        "width": width,
+        "height": height,
+        "layers": data_layers,
+    }
+    fd, path = tempfile.mkstemp(suffix='.json', prefix='bench_map_')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(map_data, f)
+    return path
+
+
+def resolve_map(path=None):
+    """Retorna o caminho do mapa a usar: o informado, o padrão do jogo ou um sintético."""
+    if path and os.path.exists(path):
+        return path
+    if os.path.exists(DEFAULT_MAP):
+        return DEFAULT_MAP
+    print(f"[bench] {DEFAULT_MAP} não encontrado; usando mapa sintético.")
+    return make_synthetic_map()
+
+
+def make_nav_map(width=160, height=160, wall_ratio=0.08, seed=1):
+    """Mapa só com grade de colisão, navegação e campos de fluxo, sem pygame nem OpenGL.
+
+    Paredes (classe 1) esparsas como em make_synthetic_map. Serve aos
+    benchmarks de busca de caminho quando core.map não pode ser importado.
+    """
+    from types import SimpleNamespace
+
+    import numpy as np
+
+    from core.flowfield import FlowFields
+    from core.navigation import NavGrid
+
+    walls = np.random.default_rng(seed).random((height, width)) < wall_ratio
+    game_map = SimpleNamespace(map_width=width, map_height=height, tilewidth=32, tileheight=32,
+                               col_classes={1: walls})
+    game_map.nav = NavGrid(game_map)
+    game_map.flow = FlowFields(game_map.nav)
+    return game_map
+
+
+def timeit(fn, repeat=1):
+    """Executa fn `repeat` vezes e retorna o tempo médio em milissegundos."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000.0 / max(1, repeat)
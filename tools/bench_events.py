@@ -0,0 +1,85 @@
+"""
+Benchmark dos eventos: condições de proximidade avaliadas todo tick x volumes indexados.
+
+O caminho antigo compila (eval) uma lambda de distância por evento, no
+formato gravado na tabela Events, e avalia todas a cada tick (Condition.check,
+como Event.run). O novo registra um círculo por evento num TriggerIndex
+(core/trigger.py) e só testa os volumes das células onde há players.
+Os eventos ficam espalhados por um mapa de 160x160 tiles e os players
+andam em círculos. Não abre janela.
+
+Uso:
+    python tools/bench_events.py [--events 1000] [--players 4] [--ticks 600]
+"""
+import argparse
+import math
+import random
+import time
+from types import SimpleNamespace
+
+import bench_common  # noqa: F401  (ajusta sys.path)
+
+from core.condition_nodes import Condition
+from core.trigger import TriggerIndex, circle_trigger
+
+WORLD = 160 * 32
+LAMBDA = "lambda: any((( (p.posx - {x})**2 + (p.posy - {y})**2 )**0.5) <= {r} for p in players)"
+
+
+def make_events(count, rng):
+    return [(rng.uniform(0, WORLD), rng.uniform(0, WORLD), rng.choice((100, 150, 300))) for _ in range(count)]
+
+
+def walk(players, tick):
+    for i, p in enumerate(players):
+        angle = tick * 0.01 + i
+        p.posx = WORLD / 2 + math.cos(angle) * (600 + 300 * i)
+        p.posy = WORLD / 2 + math.sin(angle) * (600 + 300 * i)
+
+
+def bench_legacy(events, players, ticks):
+    scope = {'players': players}
+    conditions = [Condition(f"event{i}", eval(LAMBDA.format(x=x, y=y, r=r), scope))
+                  for i, (x, y, r) in enumerate(events)]
+    fired = 0
+    start = time.perf_counter()
+    for tick in range(ticks):
+        walk(players, tick)
+        for condition in conditions:
+            if condition.check():
+                fired += 1
+    return (time.perf_counter() - start) * 1000.0 / ticks, fired
+
+
+def bench_index(events, players, ticks):
+    index = TriggerIndex()
+    for x, y, r in events:
+        index.add(circle_trigger(x, y, r))
+    fired = 0
+    start = time.perf_counter()
+    for tick in range(ticks):
+        walk(players, tick)
+        _, inside, _ = index.update([(p.posx, p.posy) for p in players])
+        fired += len(inside)
+    return (time.perf_counter() - start) * 1000.0 / ticks, fired
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=1000)
+    parser.add_argument('--players', type=int, default=4)
+    parser.add_argument('--ticks', type=int, default=600)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    events = make_events(args.events, rng)
+    players = [SimpleNamespace(posx=0.0, posy=0.0) for _ in range(args.players)]
+    legacy_ms, legacy_fired = bench_legacy(events, players, args.ticks)
+    index_ms, index_fired = bench_index(events, players, args.ticks)
+    print(f"{args.events} eventos, {args.players} players, {args.ticks} ticks (ms/tick)")
+    print(f"{'lambdas':<10}{legacy_ms:10.3f}  ({legacy_fired} avaliações verdadeiras)")
+    print(f"{'volumes':<10}{index_ms:10.3f}  ({index_fired} avaliações verdadeiras)  {legacy_ms / index_ms:.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark de perseguição: A* por mob x campo de fluxo compartilhado.
+
+N mobs espalhados em volta do player o perseguem enquanto ele anda em
+círculo. No modo A*, cada mob recalcula o caminho quando o player se afasta
+mais de 64px do alvo do último cálculo (regra antiga do aggroPlayer). No
+modo campo de fluxo, um único campo por player é mantido (FlowFields) e
+cada mob só lê o próximo passo. Não abre janela. Sem pygame (ou com
+--synthetic), usa um mapa sintético de 160x160 tiles só com paredes
+(bench_common.make_nav_map).
+
+Uso:
+    python tools/bench_flowfield.py [--map caminho.json] [--synthetic] [--mobs 10 100 1000] [--ticks 240]
+"""
+import argparse
+import math
+import random
+import time
+from types import SimpleNamespace
+
+from bench_common import DEFAULT_TILESET, make_nav_map, resolve_map
+
+from core.textures import TextureManager
+from core.clock import SimClock
+from core.pathfinding import astar
+from assets.behaviors.actions import _is_walkable, _tiles_to_pixels
+
+TILE = 32
+
+
+def astar_path(entity, start_pos, goal_pos, game_map):
+    """Referência do modo A*: caminho (pixels) de um mob até o player, um A* por chamada."""
+    nav = game_map.nav
+    walkable = nav.walkable_mask(nav.size_class(entity.sizex, entity.sizey))
+    start_tile = (int(start_pos[0] // game_map.tilewidth), int(start_pos[1] // game_map.tileheight))
+    goal_tile = (int(goal_pos[0] // game_map.tilewidth), int(goal_pos[1] // game_map.tileheight))
+    return _tiles_to_pixels(entity, astar(walkable, start_tile, goal_tile), game_map)
+
+
+def free_tiles_around(game_map, cx, cy, radius, count, rng):
+    """Tiles livres (para um mob 32x32) num raio em volta de (cx, cy)."""
+    tiles = []
+    probe = SimpleNamespace(sizex=32, sizey=32)
+    for _ in range(count * 50):
+        if len(tiles) == count:
+            break
+        tx = cx + rng.randint(-radius, radius)
+        ty = cy + rng.randint(-radius, radius)
+        if _is_walkable(probe, tx, ty, game_map):
+            tiles.append((tx, ty))
+    return tiles
+
+
+def player_path(game_map, ticks):
+    """Player andando em círculo (raio 4 tiles) em volta do centro do mapa."""
+    cx = game_map.map_width * TILE / 2
+    cy = game_map.map_height * TILE / 2
+    return [(cx + math.cos(i / 40.0) * 4 * TILE, cy + math.sin(i / 40.0) * 4 * TILE) for i in range(ticks)]
+
+
+def run_astar(game_map, mobs, path):
+    times = []
+    last_target = [None] * len(mobs)
+    for px, py in path:
+        start = time.perf_counter()
+        for i, mob in enumerate(mobs):
+            target = last_target[i]
+            if target is None or abs(px - target[0]) > 64 or abs(py - target[1]) > 64:
+                astar_path(mob, (mob.posx, mob.posy), (px, py), game_map)
+                last_target[i] = (px, py)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run_flow(game_map, mobs, path):
+    times = []
+    flow = game_map.flow
+    flow.clear()
+    player = SimpleNamespace(id=1, sizex=32, sizey=32, posx=0, posy=0)
+    for px, py in path:
+        player.posx, player.posy = px, py
+        start = time.perf_counter()
+        field = flow.field_to(player, 1)
+        for mob in mobs:
+            field.step(*flow.goal_tile(mob))
+        times.append(time.perf_counter() - start)
+        SimClock.ticks += 1
+    return times
+
+
+def summary(times):
+    ordered = sorted(times)
+    return (sum(times) * 1000.0 / len(times), ordered[int((len(ordered) - 1) * 0.95)] * 1000.0,
+            ordered[-1] * 1000.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--map', default=None)
+    parser.add_argument('--mobs', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--ticks', type=int, default=240)
+    parser.add_argument('--synthetic', action='store_true', help='mapa sintético, sem carregar core.map')
+    args = parser.parse_args()
+
+    game_map = None
+    if not args.synthetic:
+        try:
+            from core.map import Map
+        except ImportError as error:
+            print(f"[bench] core.map indisponível ({error}); usando mapa sintético.")
+        else:
+            TextureManager.headless = True
+            game_map = Map(resolve_map(args.map), DEFAULT_TILESET)
+    if game_map is None:
+        game_map = make_nav_map()
+    path = player_path(game_map, args.ticks)
+    rng = random.Random(1)
+    cx, cy = game_map.map_width // 2, game_map.map_height // 2
+
+    print(f"mapa {game_map.map_width}x{game_map.map_height}, {args.ticks} ticks")
+    print(f"{'mobs':>6} {'modo':<14}{'média':>10}{'p95':>10}{'máx':>10}  (ms/tick)")
+    for count in args.mobs:
+        mobs = [SimpleNamespace(sizex=32, sizey=32, posx=tx * TILE, posy=ty * TILE)
+                for tx, ty in free_tiles_around(game_map, cx, cy, 12, count, rng)]
+        for name, run in (('A* por mob', run_astar), ('campo de fluxo', run_flow)):
+            avg, p95, worst = summary(run(game_map, mobs, path))
+            print(f"{len(mobs):>6} {name:<14}{avg:10.3f}{p95:10.3f}{worst:10.3f}")
+    print(f"campos calculados: {game_map.flow.builds}")
+
+
+if __name__ == '__main__':
+    main()
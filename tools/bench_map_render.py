@@ -0,0 +1,86 @@
+"""
+Benchmark de renderização do mapa: ChunkRenderer (VBO por bloco) x modo imediato.
+
+Abre uma janela OpenGL (oculta quando suportado), percorre o mapa com a câmera
+para cada nível de zoom e mede o tempo médio de frame de cada caminho.
+
+Uso:
+    python tools/bench_map_render.py [--map caminho.json] [--frames 120]
+"""
+import argparse
+import time
+
+from bench_common import DEFAULT_TILESET, resolve_map
+
+import pygame
+from pygame.locals import DOUBLEBUF, OPENGL
+from OpenGL.GL import *
+
+from core.map import Map
+
+ZOOMS = [0.5, 1.0, 1.5, 2.0, 3.0]
+
+
+def setup_gl(width, height):
+    pygame.init()
+    flags = DOUBLEBUF | OPENGL | getattr(pygame, 'HIDDEN', 0)
+    pygame.display.set_mode((width, height), flags)
+    glMatrixMode(GL_PROJECTION)
+    glLoadIdentity()
+    glOrtho(0, width, height, 0, -1, 1)
+    glMatrixMode(GL_MODELVIEW)
+    glLoadIdentity()
+    glEnable(GL_TEXTURE_2D)
+    glEnable(GL_BLEND)
+    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+
+def measure(render, game_map, zoom, frames, width, height):
+    """Tempo médio (ms) de um frame percorrendo o mapa na diagonal."""
+    span_x = max(1, game_map.map_width * game_map.tilewidth - width / zoom)
+    span_y = max(1, game_map.map_height * game_map.tileheight - height / zoom)
+    # Aquece (o ChunkRenderer constrói os blocos sob demanda)
+    for i in range(frames):
+        render(span_x * i / frames, span_y * i / frames, zoom, None, width, height)
+    glFinish()
+    start = time.perf_counter()
+    for i in range(frames):
+        glClear(GL_COLOR_BUFFER_BIT)
+        render(span_x * i / frames, span_y * i / frames, zoom, None, width, height)
+        glFinish()
+    return (time.perf_counter() - start) * 1000.0 / frames
+
+
+def visible_tiles(game_map, zoom, width, height):
+    tx = min(game_map.map_width, int((width / zoom) // game_map.tilewidth) + 2)
+    ty = min(game_map.map_height, int((height / zoom) // game_map.tileheight) + 2)
+    return tx * ty * len(game_map.layers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--map', default=None)
+    parser.add_argument('--frames', type=int, default=120)
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    args = parser.parse_args()
+
+    setup_gl(args.width, args.height)
+    game_map = Map(resolve_map(args.map), DEFAULT_TILESET)
+
+    print(f"Mapa {game_map.map_width}x{game_map.map_height} tiles, {len(game_map.layers)} camadas, "
+          f"tela {args.width}x{args.height}")
+    print(f"{'zoom':>5} {'tiles':>7} {'imediato(ms)':>13} {'chunks(ms)':>11} {'draw calls':>11} {'ganho':>7}")
+    for zoom in ZOOMS:
+        t_old = measure(game_map.render_immediate, game_map, zoom, args.frames, args.width, args.height)
+        t_new = measure(game_map.render, game_map, zoom, args.frames, args.width, args.height)
+        calls = game_map.chunk_renderer.draw_calls
+        tiles = visible_tiles(game_map, zoom, args.width, args.height)
+        print(f"{zoom:>5.1f} {tiles:>7} {t_old:>13.2f} {t_new:>11.2f} {calls:>11} {t_old / max(t_new, 1e-6):>6.1f}x")
+
+    game_map.close()
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark de memória e alocação: layout dos objetos de alta rotatividade e pools.
+
+Duas medidas:
+- bytes por objeto de Projectile, ItemEntity, Status e Effect com
+  __slots__ contra o layout antigo (os mesmos atributos num __dict__);
+- pressão no coletor de lixo ao rodar cenários headless de luta
+  (core/headless.py) com os pools (core/pool.py) desligados e ligados:
+  coletas por geração, objetos criados e pico de memória (tracemalloc).
+
+Usa o banco e a mesma pilha de imports do modo headless.
+
+Uso:
+    python tools/bench_memory.py [--scenarios boss_laser bullets] [--ticks 600]
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+import bench_common  # noqa: F401  (ajusta o sys.path)
+
+from assets.classes.entities import ItemEntity, Projectile
+from assets.classes.itens import get_item_from_db
+from assets.classes.status import Effect, Status
+from core import headless, simulation
+from core.pathservice import PathService
+from core.pool import Pool
+
+
+class Legacy:
+    """Objeto com __dict__, como as classes eram antes dos __slots__."""
+
+
+def slot_names(cls):
+    names = []
+    for klass in cls.__mro__:
+        names += getattr(klass, '__slots__', ())
+    return names
+
+
+def sizes(obj):
+    """(bytes com __slots__, bytes com os mesmos atributos num __dict__)."""
+    legacy = Legacy()
+    for name in slot_names(type(obj)):
+        if hasattr(obj, name):
+            setattr(legacy, name, getattr(obj, name))
+    return sys.getsizeof(obj), sys.getsizeof(legacy) + sys.getsizeof(legacy.__dict__)
+
+
+def layout_report():
+    samples = {
+        'Projectile': Projectile(0, 0.0, 0.0, 1, 1.0, 0.0, 'player', 1),
+        'ItemEntity': ItemEntity(0, 0.0, 0.0, get_item_from_db(1)),
+        'Status': Status(*range(14)),
+        'Effect': Effect('speed', 1.0, 0.5),
+    }
+    print(f"{'classe':<12}{'slots':>8}{'dict':>8}  (bytes por objeto, sem os valores)")
+    for name, obj in samples.items():
+        slots, legacy = sizes(obj)
+        print(f"{name:<12}{slots:8d}{legacy:8d}  {legacy / slots:.1f}x")
+
+
+def gc_run(name, ticks, game_map, pooled, trace):
+    Pool.enabled = pooled
+    Projectile.pool.drain()
+    ItemEntity.pool.drain()
+    counts = [0, 0, 0]
+
+    def on_gc(phase, info):
+        if phase == 'start':
+            counts[info['generation']] += 1
+
+    gc.collect()
+    before = sum(stat['collected'] for stat in gc.get_stats())
+    pool = Projectile.pool
+    created, reused = pool.created, pool.reused
+    if trace:
+        tracemalloc.start()
+    gc.callbacks.append(on_gc)
+    start = time.perf_counter()
+    try:
+        headless.run_scenario(name, ticks, game_map)
+    finally:
+        gc.callbacks.remove(on_gc)
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    collected = sum(stat['collected'] for stat in gc.get_stats()) - before
+    return elapsed, counts, collected, pool.created - created, pool.reused - reused, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scenarios', nargs='+', default=['boss_laser', 'bullets'])
+    parser.add_argument('--ticks', type=int, default=600)
+    parser.add_argument('--no-trace', action='store_true', help="sem tracemalloc (tempos mais fiéis)")
+    args = parser.parse_args()
+
+    headless.setup()
+    game_map = headless.load_map()
+    layout_report()
+    for name in args.scenarios:
+        print(f"\n== {name}: {args.ticks} ticks ==")
+        print(f"{'pools':<8}{'ms/tick':>9}{'gc0':>6}{'gc1':>6}{'gc2':>6}{'coletados':>11}"
+              f"{'criados':>9}{'reusados':>10}{'pico KiB':>10}")
+        for pooled in (False, True):
+            elapsed, counts, collected, created, reused, peak = gc_run(
+                name, args.ticks, game_map, pooled, not args.no_trace)
+            print(f"{'sim' if pooled else 'não':<8}{elapsed * 1000.0 / args.ticks:9.3f}"
+                  f"{counts[0]:6d}{counts[1]:6d}{counts[2]:6d}{collected:11d}"
+                  f"{created:9d}{reused:10d}{peak / 1024:10.0f}")
+    simulation.reset_world()
+    PathService.shutdown()
+
+
+if __name__ == '__main__':
+    main()
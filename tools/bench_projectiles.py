@@ -0,0 +1,145 @@
+"""
+Benchmark dos projéteis: um objeto por projétil x ProjectileEngine (colunas NumPy).
+
+O caminho antigo (cada projétil roda sua função de behavior em Python,
+com atributos criados via hasattr, e é reindexado no SpatialHash) é
+reproduzido aqui como referência. Os dois caminhos movem a mesma mistura
+de projéteis em linha reta, onda e espiral e testam colisão contra um
+grupo de mobs: o antigo por sobreposição no fim do tick, o motor pelo
+trajeto do tick inteiro (engine.sweep_boxes, sem atravessar alvos). Não abre
+janela.
+
+Uso:
+    python tools/bench_projectiles.py [--projectiles 10000] [--mobs 50] [--ticks 120]
+"""
+import argparse
+import math
+import random
+import time
+
+import numpy as np
+
+import bench_common  # noqa: F401  (ajusta sys.path)
+
+from assets.behaviors.prj import fun1, spiral_motion, wave_motion
+from core.projectiles import ProjectileEngine
+from core.spatial import SpatialHash, aabb_overlap
+
+WORLD = 160 * 32
+KERNELS = (fun1, wave_motion, spiral_motion)
+
+
+class LegacyProjectile:
+    def __init__(self, x, y, dirx, diry, kind):
+        self.posx, self.posy = x, y
+        self.sizex = self.sizey = 16
+        self.dirx, self.diry = dirx, diry
+        self.speed = 1.0
+        self.time = 10 ** 6
+        self.kind = kind
+
+
+def legacy_linear(e):
+    e.posx += e.dirx * e.speed
+    e.posy += e.diry * e.speed
+
+
+def legacy_wave(e):
+    if not hasattr(e, "wave_initialized"):
+        e.wave_initialized = True
+        e.wave_phase = 0.0
+        magnitude = math.sqrt(e.dirx ** 2 + e.diry ** 2)
+        e.main_dirx, e.main_diry = e.dirx / magnitude, e.diry / magnitude
+        e.perp_dirx, e.perp_diry = -e.main_diry, e.main_dirx
+        e.base_posx, e.base_posy = e.posx, e.posy
+    e.wave_phase += 0.07
+    offset = math.sin(e.wave_phase) * 40.0
+    e.base_posx += e.main_dirx * e.speed
+    e.base_posy += e.main_diry * e.speed
+    e.posx = e.base_posx + e.perp_dirx * offset
+    e.posy = e.base_posy + e.perp_diry * offset
+
+
+def legacy_spiral(e):
+    if not hasattr(e, "spiral_initialized"):
+        e.spiral_initialized = True
+        e.spiral_angle, e.spiral_radius = 1.0, 5.0
+        magnitude = math.sqrt(e.dirx ** 2 + e.diry ** 2)
+        e.main_dirx, e.main_diry = e.dirx / magnitude, e.diry / magnitude
+        e.center_posx, e.center_posy = e.posx, e.posy
+    e.center_posx += e.main_dirx * e.speed * 0.7
+    e.center_posy += e.main_diry * e.speed * 0.7
+    e.spiral_angle += 0.05
+    e.spiral_radius += 0.4
+    e.posx = e.center_posx + math.cos(e.spiral_angle) * e.spiral_radius
+    e.posy = e.center_posy + math.sin(e.spiral_angle) * e.spiral_radius
+
+
+LEGACY = (legacy_linear, legacy_wave, legacy_spiral)
+
+
+def spawns(count, rng):
+    for _ in range(count):
+        angle = rng.uniform(0, 2 * math.pi)
+        yield rng.uniform(0, WORLD), rng.uniform(0, WORLD), math.cos(angle), math.sin(angle), rng.randrange(3)
+
+
+def bench_legacy(shots, mobs, ticks):
+    grid = SpatialHash(64)
+    prjs = [LegacyProjectile(*shot) for shot in shots]
+    for p in prjs:
+        grid.insert(p)
+    hits = 0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for p in prjs:
+            if p.time > 0:
+                LEGACY[p.kind](p)
+                p.time -= 1
+            grid.update(p)
+        for m in mobs:
+            for p in grid.query_rect(m.posx, m.posy, m.sizex, m.sizey):
+                if aabb_overlap(p, m):
+                    hits += 1
+    return (time.perf_counter() - start) * 1000.0 / ticks, hits
+
+
+def bench_engine(shots, mobs, ticks):
+    engine = ProjectileEngine()
+    for uid, (x, y, dirx, diry, kind) in enumerate(shots):
+        engine.spawn(None, uid, x, y, dirx, diry, 1.0, 1.0, 1, 10 ** 6, 16, 16, KERNELS[kind])
+    boxes = [np.array([getattr(m, name) for m in mobs], dtype=float) for name in ('posx', 'posy', 'sizex', 'sizey')]
+    owners, owner_types = [-1] * len(mobs), ['mob'] * len(mobs)
+    hits = 0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        engine.step()
+        hits += len(engine.sweep_boxes(*boxes, owners, owner_types)[0])
+    return (time.perf_counter() - start) * 1000.0 / ticks, hits
+
+
+class Mob:
+    def __init__(self, rng):
+        self.posx, self.posy = rng.uniform(0, WORLD), rng.uniform(0, WORLD)
+        self.sizex = self.sizey = 32
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--projectiles', type=int, default=10000)
+    parser.add_argument('--mobs', type=int, default=50)
+    parser.add_argument('--ticks', type=int, default=120)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    shots = list(spawns(args.projectiles, rng))
+    mobs = [Mob(rng) for _ in range(args.mobs)]
+    legacy_ms, legacy_hits = bench_legacy(shots, mobs, args.ticks)
+    engine_ms, engine_hits = bench_engine(shots, mobs, args.ticks)
+    print(f"{args.projectiles} projéteis, {args.mobs} mobs, {args.ticks} ticks (ms/tick)")
+    print(f"{'objetos':<10}{legacy_ms:10.3f}  ({legacy_hits} colisões)")
+    print(f"{'colunas':<10}{engine_ms:10.3f}  ({engine_hits} colisões)  {legacy_ms / engine_ms:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Micro-benchmark de spawn/despawn: Registry (ids estáveis) x lista com renumeração.
+
+Mantém N entidades vivas e, a cada tick, remove e cria uma fração delas
+(parte das remoções acontece durante a iteração, como quando um mob morre
+no próprio run). O caminho antigo reproduz o rem() das classes *Control:
+busca linear, list.remove e renumeração de todos os ids.
+
+Uso:
+    python tools/bench_registry.py [--entities 10000] [--churn 0.05] [--ticks 50]
+"""
+import argparse
+import random
+
+from bench_common import timeit
+
+from core.registry import Registry
+
+
+class Obj:
+    def __init__(self):
+        self.id = 0
+        self.hp = 1
+
+
+class ListControl:
+    """Cópia do comportamento antigo dos controladores."""
+
+    def __init__(self):
+        self.items = []
+
+    def add(self, e):
+        e.id = len(self.items) + 1
+        self.items.append(e)
+
+    def rem(self, id):
+        remover = None
+        for e in self.items:
+            if e.id == id:
+                remover = e
+                break
+        if remover:
+            self.items.remove(remover)
+            for i, e in enumerate(self.items):
+                e.id = i + 1
+
+
+def run_list(n, churn, ticks, rng):
+    ctl = ListControl()
+    for _ in range(n):
+        ctl.add(Obj())
+    k = max(1, int(n * churn))
+
+    def tick():
+        # Iteração sobre uma cópia: remover da lista durante o for pularia itens
+        dying = set(rng.sample(range(len(ctl.items)), k))
+        for i, e in enumerate(list(ctl.items)):
+            if i in dying:
+                ctl.rem(e.id)
+        for _ in range(k):
+            ctl.add(Obj())
+
+    return timeit(tick, ticks)
+
+
+def run_registry(n, churn, ticks, rng):
+    reg = Registry()
+    for _ in range(n):
+        reg.add(Obj())
+    k = max(1, int(n * churn))
+
+    def tick():
+        dying = set(rng.sample(range(len(reg)), k))
+        for i, e in enumerate(reg):
+            if i in dying:
+                reg.remove(e.id)
+        for _ in range(k):
+            reg.add(Obj())
+
+    return timeit(tick, ticks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--entities', type=int, default=10000)
+    parser.add_argument('--churn', type=float, default=0.05)
+    parser.add_argument('--ticks', type=int, default=50)
+    args = parser.parse_args()
+
+    k = max(1, int(args.entities * args.churn))
+    print(f"{args.entities} entidades, {k} removidas e {k} criadas por tick, {args.ticks} ticks")
+    t_list = run_list(args.entities, args.churn, args.ticks, random.Random(1))
+    print(f"lista + renumeração: {t_list:9.2f} ms/tick")
+    t_reg = run_registry(args.entities, args.churn, args.ticks, random.Random(1))
+    print(f"Registry:            {t_reg:9.2f} ms/tick")
+    print(f"ganho: {t_list / max(t_reg, 1e-6):.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark do SpriteBatch: quads desenhados um a um (glBegin/glEnd) x em lote.
+
+Simula uma fase de bullet hell: N projéteis (sprites do banco, como os do
+expanding_ring_attack/laserAttack) espalhados pela tela, mais mobs com
+filtro de cor. Abre uma janela OpenGL (oculta quando suportado).
+
+Uso:
+    python tools/bench_sprite_batch.py [--projectiles 3000] [--mobs 300] [--frames 120]
+"""
+import argparse
+import random
+import time
+
+import bench_common  # noqa: F401  (ajusta o sys.path)
+
+import pygame
+from pygame.locals import DOUBLEBUF, OPENGL
+from OpenGL.GL import *
+
+from core.batch import LAYER_ENTITIES, LAYER_PROJECTILES, SpriteBatch
+from core.prototypes import Prototypes
+from core.resources import load_sprite_from_db
+
+
+def setup_gl(width, height):
+    pygame.init()
+    flags = DOUBLEBUF | OPENGL | getattr(pygame, 'HIDDEN', 0)
+    pygame.display.set_mode((width, height), flags)
+    glMatrixMode(GL_PROJECTION)
+    glLoadIdentity()
+    glOrtho(0, width, height, 0, -1, 1)
+    glMatrixMode(GL_MODELVIEW)
+    glLoadIdentity()
+    glEnable(GL_TEXTURE_2D)
+    glEnable(GL_BLEND)
+    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+
+def measure(frame, frames):
+    frame()
+    glFinish()
+    start = time.perf_counter()
+    for _ in range(frames):
+        glClear(GL_COLOR_BUFFER_BIT)
+        frame()
+        glFinish()
+    return (time.perf_counter() - start) * 1000.0 / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--projectiles', type=int, default=3000)
+    parser.add_argument('--mobs', type=int, default=300)
+    parser.add_argument('--frames', type=int, default=120)
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    args = parser.parse_args()
+
+    setup_gl(args.width, args.height)
+    rng = random.Random(1)
+    prj_tex = [load_sprite_from_db(r['idTextura']) for r in Prototypes.table('Projectile').values()]
+    mob_tex = [load_sprite_from_db(r['idTextura']) for r in Prototypes.table('Creature').values()]
+    prj_tex = [t for t in prj_tex if t is not None]
+    mob_tex = [t for t in mob_tex if t is not None]
+
+    def spawn(n, textures):
+        return [(rng.choice(textures).clone(), rng.uniform(0, args.width), rng.uniform(0, args.height))
+                for _ in range(n)]
+
+    prjs = spawn(args.projectiles, prj_tex)
+    mobs = spawn(args.mobs, mob_tex)
+    red = (1.0, 0.3, 0.3, 1.0)
+
+    def frame():
+        for i, (tex, x, y) in enumerate(mobs):
+            tex.draw(x, y, 0, 2, red if i % 4 == 0 else None, LAYER_ENTITIES)
+        for tex, x, y in prjs:
+            tex.draw(x, y, 0, 2, None, LAYER_PROJECTILES)
+
+    def frame_batch():
+        SpriteBatch.begin()
+        frame()
+        SpriteBatch.flush()
+
+    t_old = measure(frame, args.frames)
+    t_new = measure(frame_batch, args.frames)
+    print(f"{args.projectiles} projéteis + {args.mobs} mobs, {args.frames} frames")
+    print(f"imediato: {t_old:8.2f} ms/frame  ({args.projectiles + args.mobs} draw calls)")
+    print(f"lote:     {t_new:8.2f} ms/frame  ({SpriteBatch.draw_calls} draw calls)")
+    print(f"ganho: {t_old / max(t_new, 1e-6):.1f}x")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark de texto: 300 mobs com rótulo de vida na tela.
+
+Compara o draw_text antigo (SysFont + textura nova por linha a cada chamada)
+com o TextRenderer (cache de fontes, atlas de glifos, cache de layout e
+envio em lote). Abre uma janela OpenGL (oculta quando suportado).
+
+Uso:
+    python tools/bench_text.py [--labels 300] [--frames 120]
+"""
+import argparse
+import random
+import time
+
+import bench_common  # noqa: F401  (ajusta o sys.path)
+
+import pygame
+from pygame.locals import DOUBLEBUF, OPENGL
+from OpenGL.GL import *
+
+from core.text import TextRenderer
+
+
+def legacy_draw_text(text, x, y, size=16, color=(255, 255, 255, 255), font_name=None, align='left'):
+    """Cópia do draw_text anterior ao atlas (referência do benchmark)."""
+    r, g, b, a = color
+    font = pygame.font.SysFont(font_name, size)
+    total_height = 0
+    for line in str(text).splitlines():
+        surface = font.render(line or " ", True, (r, g, b, a))
+        width, height = surface.get_size()
+        if align == 'center':
+            draw_x = int(x - width // 2)
+        elif align == 'right':
+            draw_x = int(x - width)
+        else:
+            draw_x = int(x)
+        draw_y = int(y) + total_height
+        surface = pygame.transform.flip(surface, False, True)
+        image_data = pygame.image.tostring(surface, "RGBA", True)
+        tex_id = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, tex_id)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, image_data)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glBegin(GL_QUADS)
+        glTexCoord2f(0.0, 0.0); glVertex2f(draw_x, draw_y)
+        glTexCoord2f(1.0, 0.0); glVertex2f(draw_x + width, draw_y)
+        glTexCoord2f(1.0, 1.0); glVertex2f(draw_x + width, draw_y + height)
+        glTexCoord2f(0.0, 1.0); glVertex2f(draw_x, draw_y + height)
+        glEnd()
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glDeleteTextures(int(tex_id))
+        total_height += font.get_linesize()
+
+
+def setup_gl(width, height):
+    pygame.init()
+    flags = DOUBLEBUF | OPENGL | getattr(pygame, 'HIDDEN', 0)
+    pygame.display.set_mode((width, height), flags)
+    glMatrixMode(GL_PROJECTION)
+    glLoadIdentity()
+    glOrtho(0, width, height, 0, -1, 1)
+    glMatrixMode(GL_MODELVIEW)
+    glLoadIdentity()
+    glEnable(GL_TEXTURE_2D)
+    glEnable(GL_BLEND)
+    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+
+def measure(frame, frames):
+    frame(0)  # aquecimento (fontes, glifos e layouts)
+    glFinish()
+    start = time.perf_counter()
+    for i in range(frames):
+        glClear(GL_COLOR_BUFFER_BIT)
+        frame(i)
+        glFinish()
+    return (time.perf_counter() - start) * 1000.0 / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--labels', type=int, default=300)
+    parser.add_argument('--frames', type=int, default=120)
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    args = parser.parse_args()
+
+    setup_gl(args.width, args.height)
+    rng = random.Random(1)
+    mobs = [(rng.uniform(0, args.width), rng.uniform(20, args.height), rng.randint(1, 30))
+            for _ in range(args.labels)]
+
+    def frame_legacy(i):
+        for x, y, max_hp in mobs:
+            hp = max_hp - (i // 10) % max_hp
+            legacy_draw_text(f"{hp}/{max_hp}hp", x, y - 20, 10, (255, 0, 0, 255), "Arial", 'center')
+
+    def frame_atlas(i):
+        TextRenderer.begin()
+        for x, y, max_hp in mobs:
+            hp = max_hp - (i // 10) % max_hp
+            TextRenderer.draw(f"{hp}/{max_hp}hp", x, y - 20, 10, (255, 0, 0, 255), "Arial", 'center')
+        TextRenderer.flush()
+
+    t_old = measure(frame_legacy, args.frames)
+    t_new = measure(frame_atlas, args.frames)
+    print(f"{args.labels} rótulos, {args.frames} frames")
+    print(f"draw_text antigo: {t_old:8.2f} ms/frame")
+    print(f"atlas + lote:     {t_new:8.2f} ms/frame  ({TextRenderer.draw_calls} draw calls, {TextRenderer.quads} glifos)")
+    print(f"ganho: {t_old / max(t_new, 1e-6):.1f}x")
+    TextRenderer.clear()
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Converte as condições de proximidade da tabela Events em volumes de gatilho.
+
+Eventos antigos guardam em condition_code uma lambda que testa a distância
+de cada player até um ponto (ver tools/register_events.py). Este script
+reconhece esse formato e grava o círculo em condition_type/condition_data
+('proximidade', {"posx", "posy", "raio"}), limpando condition_code; o
+EventControl passa a indexar o evento no TriggerIndex (core/trigger.py).
+Condições em outro formato ficam como estão.
+
+Uso:
+    python tools/migrate_event_triggers.py [--db assets/data/data.db] [--dry-run]
+"""
+import argparse
+import json
+import re
+import sqlite3
+
+PROXIMITY = re.compile(
+    r"^lambda:\s*any\(\(\(\s*\(p\.posx\s*-\s*(-?[\d.]+)\s*\)\*\*2\s*\+\s*\(p\.posy\s*-\s*(-?[\d.]+)\s*\)\*\*2\s*\)"
+    r"\*\*0\.5\)\s*<=?\s*([\d.]+)\s+for p in .*PControl\.Players\)\s*$")
+
+
+def number(text):
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--db', default='assets/data/data.db')
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    cur = conn.cursor()
+    converted = kept = 0
+    for id, name, code in cur.execute('SELECT id, name, condition_code FROM Events').fetchall():
+        match = PROXIMITY.match((code or '').strip())
+        if not match:
+            kept += 1
+            continue
+        x, y, radius = (number(group) for group in match.groups())
+        data = json.dumps({"posx": x, "posy": y, "raio": radius})
+        print(f"{name}: proximidade {data}")
+        if not args.dry_run:
+            cur.execute("UPDATE Events SET condition_code = '', condition_type = 'proximidade', "
+                        "condition_data = ? WHERE id = ?", (data, id))
+        converted += 1
+    conn.commit()
+    conn.close()
+    print(f"{converted} convertidos, {kept} mantidos" + (" (dry run)" if args.dry_run else ""))
+
+
+if __name__ == '__main__':
+    main()
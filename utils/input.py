@@ -1,6 +1,10 @@
 import pygame
 import time
 
+# Teclas cujos toques (pressed/double pressed) são lidos por control() dentro
+# do tick de simulação, e não uma vez por frame
+SIM_EDGE_KEYS = ("dash", "key_1", "key_2")
+
 class Input:
     def __init__(self):
         self.keys = {
@@ -15,11 +19,16 @@ class Input:
             "key_2": False,
             "inventory": False,
             "dash": False,
+            "profiler": False,
+            "profiler_trace": False,
         }
 
         self.key_pressed = {k: False for k in self.keys}
         self.key_double_pressed = {k: False for k in self.keys}
         self.key_last_pressed_time = {k: 0.0 for k in self.keys}
+        # Toques guardados de um frame sem tick de simulação (ver defer_edges)
+        self._deferred_pressed = set()
+        self._deferred_double = set()
 
         self.double_click_threshold = 0.3  # segundos
 
@@ -81,6 +90,7 @@ class Input:
             pygame.K_1: "key_1", pygame.K_2: "key_2",
             pygame.K_e: "inventory",
             pygame.K_SPACE: "dash",
+            pygame.K_F3: "profiler", pygame.K_F4: "profiler_trace",
     }
 
         # Mapeamento de botões do gamepad (padrão Xbox-like). Pode ser sobrescrito.
@@ -146,6 +156,12 @@ class Input:
         for k in self.key_pressed:
             self.key_pressed[k] = False
             self.key_double_pressed[k] = False
+        for k in self._deferred_pressed:
+            self.key_pressed[k] = True
+        for k in self._deferred_double:
+            self.key_double_pressed[k] = True
+        self._deferred_pressed.clear()
+        self._deferred_double.clear()
         # Reset per-frame 'just pressed' helper for buttons (ex.: A)
         self._a_just_pressed = False
 
@@ -383,6 +399,25 @@ class Input:
             self.key_double_pressed[action_name] = False
             self.key_last_pressed_time[action_name] = 0.0
 
+    def defer_edges(self, names):
+        """Mantém os toques de `names` deste frame para o próximo update().
+
+        Usado quando o frame não executou nenhum tick de simulação, para que
+        um toque rápido (ex.: duplo toque de dash) não se perca.
+        """
+        for k in names:
+            if self.key_pressed.get(k):
+                self._deferred_pressed.add(k)
+            if self.key_double_pressed.get(k):
+                self._deferred_double.add(k)
+
+    def clear_edges(self, names):
+        """Consome os toques de `names` (para não repetirem nos demais ticks do frame)."""
+        for k in names:
+            if k in self.key_pressed:
+                self.key_pressed[k] = False
+                self.key_double_pressed[k] = False
+
     def should_quit(self) -> bool:
         return self.quit_requested or self.keys["quit"]
 